@@ -6,7 +6,7 @@ Coordinates the entire hunter-drone system using LangGraph state management
 import asyncio
 import json
 import time
-from typing import Dict, List, TypedDict, Annotated
+from typing import Dict, List, Optional, TypedDict, Annotated
 from datetime import datetime
 import logging
 
@@ -35,14 +35,18 @@ class AgentState(TypedDict):
     memory_context: Dict
     emergency_mode: bool
     last_update_time: float
+    decision_deadline: Optional[float]
 
 class HunterDroneAgent:
     """Main LangGraph agent for coordinating drone hunting behavior"""
     
-    def __init__(self, grid_size: int = 10):
+    def __init__(self, grid_size: int = 10, anytime_planning: bool = False,
+                 mcts_budget: Optional[float] = None, decision_budget: Optional[float] = None):
         self.grid_size = grid_size
         self.memory_store = MemoryStore()
-        self.planner = DronePlanner(grid_size)
+        # anytime_planning bounds decision latency by the algorithmic fast path;
+        # mcts_budget (seconds) swaps the LLM for tree search
+        self.planner = DronePlanner(grid_size, anytime=anytime_planning, mcts_budget=mcts_budget)
         self.evaluator = PerformanceEvaluator()
         
         # Initialize LangGraph
@@ -54,6 +58,9 @@ class HunterDroneAgent:
         self.running = True
         self.last_decision_time = 0
         self.decision_interval = 0.5  # 500ms between decisions
+        # Max seconds the planner may wait on the LLM per decision (e.g. 0.4 to
+        # stay inside decision_interval); None waits for it
+        self.decision_budget = decision_budget
         
     def _create_graph(self) -> StateGraph:
         """Create the LangGraph state machine"""
@@ -121,7 +128,8 @@ class HunterDroneAgent:
                 target_pos=state["target_position"],
                 obstacles=state["obstacles"],
                 memory_context=state["memory_context"],
-                emergency_mode=state.get("emergency_mode", False)
+                emergency_mode=state.get("emergency_mode", False),
+                deadline=state.get("decision_deadline")
             )
             
             state["current_plan"] = plan
@@ -185,10 +193,16 @@ class HunterDroneAgent:
         return state
     
     async def process_update(self, drone_pos: List[float], target_pos: List[float], 
-                           obstacles: List[List[float]]) -> Dict:
-        """Process a single update from Godot"""
+                           obstacles: List[List[float]], latency_budget: Optional[float] = None) -> Dict:
+        """Process a single update from Godot
+        
+        latency_budget (seconds, default decision_budget) bounds how long the
+        planner may wait on the LLM before falling back; None leaves the
+        decision unbounded.
+        """
         # Check if enough time has passed for a new decision
         current_time = time.time()
+        budget = self.decision_budget if latency_budget is None else latency_budget
         if current_time - self.last_decision_time < self.decision_interval:
             return {"type": "no_action", "reasoning": "Too soon for new decision"}
         
@@ -204,7 +218,8 @@ class HunterDroneAgent:
             "performance_metrics": {},
             "memory_context": {},
             "emergency_mode": False,
-            "last_update_time": current_time
+            "last_update_time": current_time,
+            "decision_deadline": None if budget is None else time.monotonic() + budget
         }
         
         # Run the graph
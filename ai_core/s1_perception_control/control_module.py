@@ -8,7 +8,11 @@ import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from shared.intercept import InterceptSolution, solve_intercepts
 from .perception_module import PerceptionState
+from .trajectory import MinimumJerkTrajectory
+from .mpc_controller import LinearMPCController
+from .velocity_obstacles import ORCAAvoidance
 
 
 class ControlMode(Enum):
@@ -18,6 +22,7 @@ class ControlMode(Enum):
     AVOID = "avoid"
     EMERGENCY = "emergency"
     HOVER = "hover"
+    MPC = "mpc"
 
 
 @dataclass
@@ -44,6 +49,20 @@ class DroneCommand:
     mode_flags: Dict[str, bool]
 
 
+# Shared mode flag dicts for the fast path - treat as read-only
+_FAST_MODE_FLAGS = {
+    ControlMode.HOVER: {"hover": True},
+    ControlMode.WAYPOINT: {"waypoint": True},
+    ControlMode.INTERCEPT: {"intercept": True, "aggressive": True},
+    ControlMode.EMERGENCY: {"emergency": True, "landing": True},
+}
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    """Scalar clip without going through NumPy"""
+    return low if value < low else high if value > high else value
+
+
 class ControlModule:
     """Real-time control execution for drone AI"""
     
@@ -70,11 +89,38 @@ class ControlModule:
             kd=[0.8, 0.8, 0.3]
         )
         
+        # Model-predictive controller for MPC mode
+        self.mpc_controller = LinearMPCController()
+        
+        # Velocity-obstacle avoidance for AVOID mode
+        self.orca = ORCAAvoidance()
+        self.use_orca_avoidance = True
+        # Position setpoint that moves at the ORCA velocity (None until avoidance starts)
+        self._avoid_setpoint: Optional[np.ndarray] = None
+        
         # Safety limits
         self.max_tilt_angle = 45.0  # degrees
         self.max_thrust = 0.8  # Maximum thrust (0.0-1.0)
         self.min_altitude = 1.0  # meters
         self.max_altitude = 100.0  # meters
+        self.intercept_speed = 10.0  # Assumed drone speed in m/s for intercepts
+        
+        # Time source for command/trajectory timing (swappable for simulation)
+        self.clock = time.time
+        
+        # Reference trajectory for the active command (built once per command);
+        # without it waypoint/intercept steer the PID straight at the goal
+        self.use_trajectory_reference = True
+        self.active_trajectory: Optional[MinimumJerkTrajectory] = None
+        self.trajectory_start_time = 0.0
+        self.waypoint_cruise_speed = 6.0   # m/s average along the reference
+        self.intercept_cruise_speed = 10.0  # m/s average along the reference
+        self.trajectory_feedforward_gain = 0.1
+        self.trajectory_replan_distance = 2.0  # m of intercept point drift before re-planning
+        self.trajectory_replan_interval = 0.25  # s between re-plans toward a moving goal
+        self.trajectory_reset_distance = 5.0  # m of tracking error before re-planning from the drone
+        self._ref_position = np.zeros(3)
+        self._ref_velocity = np.zeros(3)
         
         # Emergency state
         self.emergency_mode = False
@@ -83,6 +129,20 @@ class ControlModule:
         # Control history for analysis
         self.control_history: List[Dict[str, Any]] = []
         
+        # Preallocated state for the allocation-free fast path
+        self._fast_command = DroneCommand(
+            timestamp=0.0, thrust=0.0, pitch=0.0, roll=0.0, yaw=0.0,
+            mode_flags=_FAST_MODE_FLAGS[ControlMode.HOVER]
+        )
+        self._fast_output = np.zeros(3)
+        self._fast_hover_target = np.zeros(3)
+        self._fast_hover_set = False
+        self._max_tilt_rad = float(np.radians(self.max_tilt_angle))
+        
+        # Ring buffer of [timestamp, thrust, pitch, roll, yaw, target_distance]
+        self.fast_history = np.zeros((1000, 6))
+        self.fast_history_index = 0
+        
     def execute_command(self, 
                        command: ControlCommand, 
                        perception: PerceptionState) -> DroneCommand:
@@ -91,9 +151,7 @@ class ControlModule:
         # Update current command if new one received
         if (self.current_command is None or 
             command.command_id != self.current_command.command_id):
-            self.current_command = command
-            self.command_start_time = time.time()
-            self.current_mode = command.mode
+            self._start_command(command)
             
         # Check for emergency conditions
         self._check_emergency_conditions(perception)
@@ -109,6 +167,8 @@ class ControlModule:
             drone_cmd = self._execute_intercept_control(command, perception)
         elif self.current_mode == ControlMode.AVOID:
             drone_cmd = self._execute_avoidance_control(command, perception)
+        elif self.current_mode == ControlMode.MPC:
+            drone_cmd = self._execute_mpc_control(command, perception)
         else:
             drone_cmd = self._execute_hover_control(perception)
         
@@ -120,6 +180,123 @@ class ControlModule:
         
         return drone_cmd
     
+    def execute_command_fast(self, 
+                            command: ControlCommand, 
+                            perception: PerceptionState) -> DroneCommand:
+        """Allocation-free variant of execute_command for the 200Hz loop
+        
+        Uses scalar math on preallocated buffers and returns the same
+        DroneCommand instance on every call, so callers must copy any values
+        they want to keep past the next tick. Avoidance and MPC modes still
+        go through the regular path.
+        """
+        
+        if (self.current_command is None or 
+            command.command_id != self.current_command.command_id):
+            self._start_command(command)
+        
+        self._check_emergency_conditions(perception)
+        
+        mode = self.current_mode
+        if not self.emergency_mode and mode in (ControlMode.AVOID, ControlMode.MPC):
+            return self.execute_command(command, perception)
+        
+        px, py, pz = perception.drone_position
+        out = self._fast_output
+        dt = self.update_interval
+        
+        if self.emergency_mode:
+            # Descend 1m but not below 0.5m, no lateral error
+            target_y = py - 1.0 if py - 1.0 > 0.5 else 0.5
+            self.position_controller.update_into(0.0, target_y - py, 0.0, dt, out)
+            thrust = _clamp(0.5 + out[1], 0.3, 0.6)
+            pitch = _clamp(out[0] * 0.1, -0.3, 0.3)
+            roll = _clamp(out[2] * 0.1, -0.3, 0.3)
+            mode = ControlMode.EMERGENCY
+        elif mode == ControlMode.WAYPOINT and command.target_position is not None:
+            ref_pos, ref_vel = self._sample_trajectory(
+                command.target_position, None, perception, self.waypoint_cruise_speed
+            )
+            ff = self.trajectory_feedforward_gain
+            self.position_controller.update_into(
+                ref_pos[0] - px, ref_pos[1] - py, ref_pos[2] - pz, dt, out
+            )
+            thrust = _clamp(0.5 + out[1] + ff * ref_vel[1], 0.0, 1.0)
+            pitch = _clamp(out[0] + ff * ref_vel[0], -0.7, 0.7)
+            roll = _clamp(out[2] + ff * ref_vel[2], -0.7, 0.7)
+        elif mode == ControlMode.INTERCEPT and perception.target_position is not None:
+            tx, ty, tz = perception.target_position
+            target_vel = perception.target_velocity
+            if target_vel is not None:
+                vx, vy, vz = target_vel
+                t = self._intercept_time_scalar(tx - px, ty - py, tz - pz, vx, vy, vz)
+                tx += vx * t
+                ty += vy * t
+                tz += vz * t
+            ref_pos, ref_vel = self._sample_trajectory(
+                (tx, ty, tz), target_vel, perception, self.intercept_cruise_speed
+            )
+            ff = self.trajectory_feedforward_gain
+            self.position_controller.update_into(
+                ref_pos[0] - px, ref_pos[1] - py, ref_pos[2] - pz, dt, out
+            )
+            thrust = _clamp(0.5 + out[1] + ff * ref_vel[1], 0.0, self.max_thrust)
+            pitch = _clamp(out[0] + ff * ref_vel[0], -0.8, 0.8)
+            roll = _clamp(out[2] + ff * ref_vel[2], -0.8, 0.8)
+        else:
+            # Hover (also used when waypoint/intercept have no target)
+            hover = self._fast_hover_target
+            if not self._fast_hover_set:
+                hover[0] = px
+                hover[1] = py
+                hover[2] = pz
+                self._fast_hover_set = True
+            self.position_controller.update_into(
+                hover[0] - px, hover[1] - py, hover[2] - pz, dt, out
+            )
+            thrust = _clamp(0.5 + out[1], 0.0, 1.0)
+            pitch = _clamp(out[0], -0.5, 0.5)
+            roll = _clamp(out[2], -0.5, 0.5)
+            mode = ControlMode.HOVER
+        
+        # Safety limits (same rules as _apply_safety_limits)
+        max_tilt = self._max_tilt_rad
+        thrust = _clamp(thrust, 0.0, self.max_thrust)
+        pitch = _clamp(pitch, -max_tilt, max_tilt)
+        roll = _clamp(roll, -max_tilt, max_tilt)
+        if py < self.min_altitude and thrust < 0.6:
+            thrust = 0.6
+            pitch = max(pitch, 0.0)
+        
+        drone_cmd = self._fast_command
+        drone_cmd.timestamp = time.time()
+        drone_cmd.thrust = thrust
+        drone_cmd.pitch = pitch
+        drone_cmd.roll = roll
+        drone_cmd.yaw = 0.0
+        drone_cmd.mode_flags = _FAST_MODE_FLAGS[mode]
+        
+        # Log into the preallocated ring buffer
+        row = self.fast_history[self.fast_history_index]
+        row[0] = drone_cmd.timestamp
+        row[1] = thrust
+        row[2] = pitch
+        row[3] = roll
+        row[4] = 0.0
+        row[5] = perception.target_distance
+        self.fast_history_index = (self.fast_history_index + 1) % len(self.fast_history)
+        
+        return drone_cmd
+    
+    def _start_command(self, command: ControlCommand):
+        """Switch to a new command; references planned for the old one are dropped"""
+        self.current_command = command
+        self.command_start_time = self.clock()
+        self.current_mode = command.mode
+        self.active_trajectory = None
+        self._avoid_setpoint = None
+        self.mpc_controller.reset()
+    
     def _check_emergency_conditions(self, perception: PerceptionState):
         """Check for conditions requiring emergency response"""
         
@@ -208,17 +385,15 @@ class ControlModule:
             return self._execute_hover_control(perception)
         
         current_pos = np.array(perception.drone_position)
-        target_pos = np.array(command.target_position)
-        
-        # Calculate position error
-        position_error = target_pos - current_pos
-        distance = np.linalg.norm(position_error)
         
-        # Slow down as we approach target
-        speed_factor = min(1.0, distance / 5.0)  # Slow down within 5m
+        # Track the minimum-jerk reference (it slows down into the waypoint)
+        ref_pos, ref_vel = self._sample_trajectory(
+            command.target_position, None, perception, self.waypoint_cruise_speed
+        )
+        position_error = ref_pos - current_pos
         
         control_output = self.position_controller.update(position_error, self.update_interval)
-        control_output *= speed_factor
+        control_output += self.trajectory_feedforward_gain * ref_vel
         
         return DroneCommand(
             timestamp=time.time(),
@@ -248,15 +423,15 @@ class ControlModule:
         else:
             predicted_target_pos = target_pos
         
-        # Calculate intercept vector
-        intercept_vector = predicted_target_pos - current_pos
-        distance = np.linalg.norm(intercept_vector)
-        
-        # Aggressive pursuit mode
-        pursuit_factor = min(2.0, distance / 10.0)  # More aggressive at distance
+        # Track a reference that arrives at the intercept point matching target velocity
+        ref_pos, ref_vel = self._sample_trajectory(
+            predicted_target_pos, perception.target_velocity, perception,
+            self.intercept_cruise_speed
+        )
+        position_error = ref_pos - current_pos
         
-        control_output = self.position_controller.update(intercept_vector, self.update_interval)
-        control_output *= pursuit_factor
+        control_output = self.position_controller.update(position_error, self.update_interval)
+        control_output += self.trajectory_feedforward_gain * ref_vel
         
         return DroneCommand(
             timestamp=time.time(),
@@ -267,6 +442,106 @@ class ControlModule:
             mode_flags={"intercept": True, "aggressive": True}
         )
     
+    def _execute_mpc_control(self, 
+                             command: ControlCommand, 
+                             perception: PerceptionState) -> DroneCommand:
+        """Execute model-predictive pursuit (target if visible, else commanded waypoint)"""
+        
+        if perception.target_position is not None:
+            goal_pos = perception.target_position
+            goal_vel = perception.target_velocity
+            if goal_vel is None:
+                goal_vel = (0.0, 0.0, 0.0)
+            flags = {"mpc": True, "intercept": True}
+        elif command.target_position is not None:
+            goal_pos = command.target_position
+            goal_vel = command.target_velocity
+            if goal_vel is None:
+                goal_vel = (0.0, 0.0, 0.0)
+            flags = {"mpc": True, "waypoint": True}
+        else:
+            return self._execute_hover_control(perception)
+        
+        ref_pos, ref_vel = self.mpc_controller.constant_velocity_reference(goal_pos, goal_vel)
+        accel = self.mpc_controller.compute(
+            perception.drone_position, perception.drone_velocity, ref_pos, ref_vel,
+            timestamp=self.clock()
+        )
+        
+        # Small-angle mapping from acceleration to attitude/thrust (0.5 thrust = hover)
+        gravity = 9.81
+        return DroneCommand(
+            timestamp=time.time(),
+            thrust=np.clip(0.5 * (1.0 + accel[1] / gravity), 0.0, self.max_thrust),
+            pitch=np.clip(accel[0] / gravity, -0.8, 0.8),
+            roll=np.clip(accel[2] / gravity, -0.8, 0.8),
+            yaw=0.0,
+            mode_flags=flags
+        )
+    
+    def _sample_trajectory(self, 
+                           goal_position: Tuple[float, float, float],
+                           goal_velocity: Optional[Tuple[float, float, float]],
+                           perception: PerceptionState,
+                           cruise_speed: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Sample the reference trajectory, building it when the command or goal changes
+        
+        The trajectory is only rebuilt on a new command, when the goal drifts
+        more than trajectory_replan_distance from its end point, or every
+        trajectory_replan_interval while the goal keeps moving, so normal
+        ticks just evaluate the precomputed polynomial into reused buffers.
+        
+        A re-plan continues from the current reference state rather than the
+        drone's, so the reference does not restart at zero tracking error
+        each time the intercept point moves (which left the PID with almost
+        nothing to act on). It falls back to the drone's state once tracking
+        error exceeds trajectory_reset_distance.
+        """
+        if not self.use_trajectory_reference:
+            for axis in range(3):
+                self._ref_position[axis] = goal_position[axis]
+            self._ref_velocity.fill(0.0)
+            return self._ref_position, self._ref_velocity
+        
+        now = self.clock()
+        trajectory = self.active_trajectory
+        
+        if trajectory is not None:
+            end = trajectory.end_position
+            dx = goal_position[0] - end[0]
+            dy = goal_position[1] - end[1]
+            dz = goal_position[2] - end[2]
+            drift_sq = dx * dx + dy * dy + dz * dz
+            if (drift_sq > self.trajectory_replan_distance ** 2 or
+                    (drift_sq > 1e-6 and now - self.trajectory_start_time > self.trajectory_replan_interval)):
+                trajectory = None
+        
+        if trajectory is None:
+            start_position = perception.drone_position
+            start_velocity = perception.drone_velocity
+            start_acceleration = None
+            if self.active_trajectory is not None:
+                ref_pos, ref_vel, ref_acc = self.active_trajectory.sample(now - self.trajectory_start_time)
+                px, py, pz = perception.drone_position
+                ex = ref_pos[0] - px
+                ey = ref_pos[1] - py
+                ez = ref_pos[2] - pz
+                if ex * ex + ey * ey + ez * ez <= self.trajectory_reset_distance ** 2:
+                    start_position, start_velocity, start_acceleration = ref_pos, ref_vel, ref_acc
+            
+            trajectory = MinimumJerkTrajectory.from_distance(
+                start_position, goal_position, cruise_speed,
+                start_velocity=start_velocity,
+                end_velocity=goal_velocity,
+                start_acceleration=start_acceleration
+            )
+            self.active_trajectory = trajectory
+            self.trajectory_start_time = now
+        
+        trajectory.sample_into(now - self.trajectory_start_time,
+                               self._ref_position, self._ref_velocity)
+        return self._ref_position, self._ref_velocity
+    
     def _execute_avoidance_control(self, 
                                  command: ControlCommand, 
                                  perception: PerceptionState) -> DroneCommand:
@@ -274,21 +549,50 @@ class ControlModule:
         
         current_pos = np.array(perception.drone_position)
         
-        # Calculate avoidance vector from immediate threats
-        avoidance_vector = np.zeros(3)
-        total_weight = 0.0
-        
-        for threat in perception.immediate_threats:
-            threat_weight = 1.0 / max(0.1, threat["time_to_collision"])
-            avoidance_dir = np.array(threat["avoidance_vector"])
-            avoidance_vector += avoidance_dir * threat_weight
-            total_weight += threat_weight
-        
-        if total_weight > 0:
-            avoidance_vector /= total_weight
+        # Preferred: ORCA velocity over all nearby obstacles and moving agents
+        if self.use_orca_avoidance and perception.obstacles:
+            obs_pos, obs_radii, obs_vel = self.orca.obstacles_from_perception(perception.obstacles)
+            if command.target_position is not None:
+                to_goal = np.array(command.target_position) - current_pos
+                preferred = to_goal * min(1.0, self.intercept_speed / max(np.linalg.norm(to_goal), 1e-6))
+            else:
+                preferred = np.array(perception.drone_velocity, dtype=float)
+            
+            result = self.orca.compute_velocity(
+                current_pos, perception.drone_velocity, preferred, obs_pos, obs_radii, obs_vel
+            )
+            if result.feasible[0]:
+                # Track a setpoint that moves at the ORCA velocity, like a trajectory reference
+                orca_velocity = result.velocities[0]
+                if (self._avoid_setpoint is None or
+                        np.linalg.norm(self._avoid_setpoint - current_pos) > self.trajectory_reset_distance):
+                    self._avoid_setpoint = current_pos.copy()
+                self._avoid_setpoint += orca_velocity * self.update_interval
+                position_error = self._avoid_setpoint - current_pos
+                control_output = self.position_controller.update(position_error, self.update_interval)
+                control_output += self.trajectory_feedforward_gain * orca_velocity
+                return DroneCommand(
+                    timestamp=time.time(),
+                    thrust=np.clip(0.5 + control_output[1], 0.3, 1.0),
+                    pitch=np.clip(control_output[0], -1.0, 1.0),
+                    roll=np.clip(control_output[2], -1.0, 1.0),
+                    yaw=0.0,
+                    mode_flags={"avoid": True, "emergency_maneuver": True, "orca": True}
+                )
+        
+        # Fallback when ORCA is infeasible: threat-weighted avoidance
+        self._avoid_setpoint = None
+        threats = perception.immediate_threats
+        if threats:
+            times_to_collision = np.array([threat["time_to_collision"] for threat in threats])
+            avoidance_dirs = np.array([threat["avoidance_vector"] for threat in threats], dtype=float)
+            weights = 1.0 / np.maximum(0.1, times_to_collision)
+            avoidance_vector = weights @ avoidance_dirs / weights.sum()
+        else:
+            avoidance_vector = np.zeros(3)
         
         # If we have a safe direction from perception, use it
-        if perception.safe_directions:
+        if len(perception.safe_directions) > 0:
             # Choose the safe direction closest to our avoidance vector
             best_direction = self._choose_best_safe_direction(
                 avoidance_vector, perception.safe_directions
@@ -325,33 +629,55 @@ class ControlModule:
                                 target_vel: np.ndarray) -> float:
         """Calculate optimal intercept time"""
         
-        relative_pos = target_pos - drone_pos
-        drone_speed = 10.0  # Assumed drone speed in m/s
-        
-        # Solve intercept triangle
-        a = np.dot(target_vel, target_vel) - drone_speed**2
-        b = 2 * np.dot(relative_pos, target_vel)
-        c = np.dot(relative_pos, relative_pos)
-        
-        discriminant = b**2 - 4*a*c
-        
+        solution = solve_intercepts(drone_pos, target_pos[np.newaxis], target_vel[np.newaxis],
+                                    self.intercept_speed)
+        return float(solution.times[0])
+    
+    def calculate_intercepts(self, 
+                             drone_pos: np.ndarray, 
+                             target_positions: np.ndarray, 
+                             target_velocities: np.ndarray,
+                             drone_speeds: Optional[np.ndarray] = None) -> InterceptSolution:
+        """Intercept times/points for many candidate targets in one call
+        
+        drone_speeds may be an (S, 1) array to evaluate several pursuit speeds
+        against all N targets at once, giving (S, N) results.
+        """
+        speeds = self.intercept_speed if drone_speeds is None else drone_speeds
+        return solve_intercepts(drone_pos, target_positions, target_velocities, speeds)
+    
+    def _intercept_time_scalar(self, 
+                               rx: float, ry: float, rz: float,
+                               vx: float, vy: float, vz: float) -> float:
+        """Scalar version of _calculate_intercept_time for the fast path"""
+        drone_speed = self.intercept_speed
+        a = vx * vx + vy * vy + vz * vz - drone_speed * drone_speed
+        b = 2.0 * (rx * vx + ry * vy + rz * vz)
+        c = rx * rx + ry * ry + rz * rz
+        
+        discriminant = b * b - 4.0 * a * c
         if discriminant < 0 or abs(a) < 0.001:
-            # No intercept possible or target stationary
-            return np.linalg.norm(relative_pos) / drone_speed
-        
-        # Choose the positive root
-        t1 = (-b + np.sqrt(discriminant)) / (2*a)
-        t2 = (-b - np.sqrt(discriminant)) / (2*a)
+            return c ** 0.5 / drone_speed
         
+        root = discriminant ** 0.5
+        t1 = (-b + root) / (2.0 * a)
+        t2 = (-b - root) / (2.0 * a)
         intercept_time = t1 if t1 > 0 else t2
-        return max(0.1, intercept_time)  # Minimum 0.1s
+        if intercept_time <= 0:
+            # Both intercepts lie in the past: the target outruns the drone
+            return c ** 0.5 / drone_speed
+        return max(0.1, intercept_time)
     
     def _choose_best_safe_direction(self, 
                                   desired_vector: np.ndarray, 
-                                  safe_directions: List[Tuple[float, float]]) -> Tuple[float, float]:
-        """Choose the safe direction closest to desired avoidance vector"""
+                                  safe_directions: np.ndarray) -> Tuple[float, float]:
+        """Choose the safe direction closest to desired avoidance vector
+        
+        safe_directions is a (K, 2) array (or list) of (azimuth, elevation).
+        """
         
-        if not safe_directions:
+        directions = np.asarray(safe_directions, dtype=float).reshape(-1, 2)
+        if len(directions) == 0:
             return (0.0, 0.0)  # Default direction
         
         # Convert desired vector to spherical
@@ -359,27 +685,12 @@ class ControlModule:
         desired_elevation = np.arctan2(desired_vector[1], 
                                      np.sqrt(desired_vector[0]**2 + desired_vector[2]**2))
         
-        # Find closest safe direction
-        best_direction = safe_directions[0]
-        best_distance = float('inf')
-        
-        for direction in safe_directions:
-            azimuth, elevation = direction
-            
-            # Calculate angular distance
-            azimuth_diff = abs(azimuth - desired_azimuth)
-            elevation_diff = abs(elevation - desired_elevation)
-            
-            # Wrap azimuth difference
-            azimuth_diff = min(azimuth_diff, 2*np.pi - azimuth_diff)
-            
-            angular_distance = np.sqrt(azimuth_diff**2 + elevation_diff**2)
-            
-            if angular_distance < best_distance:
-                best_distance = angular_distance
-                best_direction = direction
+        # Angular distance to every candidate, azimuth wrapped to [-pi, pi]
+        azimuth_diff = (directions[:, 0] - desired_azimuth + np.pi) % (2*np.pi) - np.pi
+        elevation_diff = directions[:, 1] - desired_elevation
+        best = np.argmin(azimuth_diff**2 + elevation_diff**2)
         
-        return best_direction
+        return (float(directions[best, 0]), float(directions[best, 1]))
     
     def _apply_safety_limits(self, 
                            command: DroneCommand, 
@@ -470,6 +781,28 @@ class PIDController3D:
         
         return output
     
+    def update_into(self, ex: float, ey: float, ez: float, 
+                    dt: float, out: np.ndarray) -> np.ndarray:
+        """Allocation-free update: scalar error components, result written to out"""
+        integral = self.integral
+        prev_error = self.prev_error
+        kp, ki, kd = self.kp, self.ki, self.kd
+        inv_dt = 1.0 / max(dt, 0.001)
+        
+        integral[0] += ex * dt
+        integral[1] += ey * dt
+        integral[2] += ez * dt
+        
+        out[0] = kp[0] * ex + ki[0] * integral[0] + kd[0] * (ex - prev_error[0]) * inv_dt
+        out[1] = kp[1] * ey + ki[1] * integral[1] + kd[1] * (ey - prev_error[1]) * inv_dt
+        out[2] = kp[2] * ez + ki[2] * integral[2] + kd[2] * (ez - prev_error[2]) * inv_dt
+        
+        prev_error[0] = ex
+        prev_error[1] = ey
+        prev_error[2] = ez
+        
+        return out
+    
     def reset(self):
         """Reset controller state"""
         self.prev_error = np.zeros(3)
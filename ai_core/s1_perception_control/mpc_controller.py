@@ -0,0 +1,233 @@
+"""
+Model-Predictive Controller for System 1 (S1)
+Condensed linear MPC over a point-mass drone model, solved in pure NumPy
+"""
+
+import numpy as np
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class LinearMPCController:
+    """Linear MPC with precomputed condensed QP matrices
+
+    Each axis is modelled as a double integrator (position, velocity) driven
+    by an acceleration command. The axes share the same dynamics, so the
+    condensed Hessian is a single horizon x horizon matrix and all three axes
+    are solved together as the columns of one input matrix. Box constraints on
+    acceleration are handled by accelerated projected gradient with a fixed
+    iteration budget, warm-started from the previous solution shifted by the
+    time elapsed since it was computed (usually a fraction of a step, since
+    the controller runs faster than the horizon's dt).
+    """
+
+    def __init__(self,
+                 horizon: int = 20,
+                 dt: float = 0.05,
+                 position_weight: float = 1.0,
+                 velocity_weight: float = 0.1,
+                 terminal_weight: float = 10.0,
+                 input_weight: float = 0.01,
+                 max_acceleration: float = 8.0,
+                 iterations: int = 30):
+        self.horizon = horizon
+        self.dt = dt
+        self.max_acceleration = max_acceleration
+        self.iterations = iterations
+
+        A = np.array([[1.0, dt], [0.0, 1.0]])
+        B = np.array([[0.5 * dt * dt], [dt]])
+
+        # Stacked predictions X = Sx x0 + Su U for k = 1..N
+        Sx = np.zeros((2 * horizon, 2))
+        Su = np.zeros((2 * horizon, horizon))
+        A_power = np.eye(2)
+        A_powers = []
+        for k in range(horizon):
+            A_powers.append(A_power)
+            A_power = A @ A_power
+            Sx[2 * k:2 * k + 2] = A_power
+        for k in range(horizon):
+            for j in range(k + 1):
+                Su[2 * k:2 * k + 2, j:j + 1] = A_powers[k - j] @ B
+
+        weights = np.tile([position_weight, velocity_weight], horizon)
+        weights[-2:] *= terminal_weight
+
+        # Condensed QP: 0.5 U'HU + (G (Sx x0 - Xref))'U
+        self.Sx = Sx
+        self.G = Su.T * weights
+        self.H = self.G @ Su + input_weight * np.eye(horizon)
+        self.step_size = 1.0 / np.linalg.eigvalsh(self.H)[-1]
+
+        # Time offsets of the prediction steps, for building references
+        self.step_times = dt * np.arange(1, horizon + 1)
+
+        # Warm start (horizon x axes) and the time it was solved at
+        self.solution = np.zeros((horizon, 3))
+        self.solved_at: Optional[float] = None
+        self.last_solve_time = 0.0
+        self._steps = np.arange(horizon)
+
+    def reset(self):
+        """Discard the warm start"""
+        self.solution[:] = 0.0
+        self.solved_at = None
+
+    def _warm_start(self, now: float) -> np.ndarray:
+        """Previous solution advanced by the elapsed time, interpolating between steps"""
+        if self.solved_at is None:
+            return self.solution.copy()
+        shift = max(0.0, (now - self.solved_at) / self.dt)
+        last = self.horizon - 1
+        index = np.minimum(self._steps + int(shift), last)
+        blend = shift - int(shift)
+        return ((1.0 - blend) * self.solution[index]
+                + blend * self.solution[np.minimum(index + 1, last)])
+
+    def constant_velocity_reference(self,
+                                    goal_position: Sequence[float],
+                                    goal_velocity: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Reference positions/velocities over the horizon for a goal moving at constant velocity"""
+        goal_position = np.asarray(goal_position, dtype=float)
+        goal_velocity = np.asarray(goal_velocity, dtype=float)
+        positions = goal_position + np.outer(self.step_times, goal_velocity)
+        velocities = np.broadcast_to(goal_velocity, positions.shape)
+        return positions, velocities
+
+    def compute(self,
+                position: Sequence[float],
+                velocity: Sequence[float],
+                reference_positions: np.ndarray,
+                reference_velocities: np.ndarray,
+                timestamp: Optional[float] = None) -> np.ndarray:
+        """Solve the QP and return the first acceleration command (x, y, z)
+
+        timestamp (default time.monotonic()) is the state's time, used to
+        advance the warm start by however long ago the last solve was.
+        """
+        start = time.perf_counter()
+        now = time.monotonic() if timestamp is None else timestamp
+
+        x0 = np.array([position, velocity], dtype=float)  # (2, 3)
+        x_ref = np.empty((2 * self.horizon, 3))
+        x_ref[0::2] = reference_positions
+        x_ref[1::2] = reference_velocities
+
+        f = self.G @ (self.Sx @ x0 - x_ref)
+
+        U = self._warm_start(now)
+
+        # FISTA on the box-constrained QP
+        Y = U.copy()
+        momentum = 1.0
+        H = self.H
+        step = self.step_size
+        limit = self.max_acceleration
+        for _ in range(self.iterations):
+            U_next = np.clip(Y - step * (H @ Y + f), -limit, limit)
+            momentum_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum * momentum))
+            Y = U_next + ((momentum - 1.0) / momentum_next) * (U_next - U)
+            U = U_next
+            momentum = momentum_next
+
+        self.solution = U
+        self.solved_at = now
+        self.last_solve_time = time.perf_counter() - start
+        return U[0].copy()
+
+
+def benchmark_mpc_against_pid(duration_s: float = 10.0,
+                              target_speed: float = 6.0) -> Dict[str, Dict[str, float]]:
+    """Closed-loop comparison of the MPC and PID intercept paths
+
+    Runs ControlModule at its own update rate against a point-mass drone
+    chasing a target moving in a circle, on a simulated clock, and reports
+    per-tick compute time and tracking distance for each mode.
+    "intercept_direct" is the intercept mode without its reference
+    trajectory (the PID steered straight at the intercept point), as a
+    baseline for the trajectory tracking.
+    """
+    from .control_module import ControlModule, ControlCommand, ControlMode
+    from .perception_module import PerceptionState
+
+    gravity = 9.81
+    results = {}
+
+    runs = (("intercept_direct", ControlMode.INTERCEPT, False),
+            ("intercept", ControlMode.INTERCEPT, True),
+            ("mpc", ControlMode.MPC, True))
+    for label, mode, use_trajectory_reference in runs:
+        control = ControlModule()
+        control.use_trajectory_reference = use_trajectory_reference
+        sim_time = [0.0]
+        control.clock = lambda: sim_time[0]
+        dt = control.update_interval
+
+        drone_pos = np.array([0.0, 10.0, 0.0])
+        drone_vel = np.zeros(3)
+        command = ControlCommand(
+            command_id="benchmark", timestamp=0.0, mode=mode,
+            target_position=None, target_velocity=None,
+            duration_ms=int(duration_s * 1000), urgency="high", parameters={}
+        )
+
+        tick_times = []
+        distances = []
+        radius = 30.0
+        for step in range(int(duration_s / dt)):
+            t = step * dt
+            sim_time[0] = t
+            angle = target_speed * t / radius
+            target_pos = np.array([radius * np.cos(angle), 10.0, radius * np.sin(angle)])
+            target_vel = target_speed * np.array([-np.sin(angle), 0.0, np.cos(angle)])
+            distance = float(np.linalg.norm(target_pos - drone_pos))
+
+            perception = PerceptionState(
+                timestamp=t,
+                drone_position=tuple(drone_pos),
+                drone_velocity=tuple(drone_vel),
+                drone_orientation=(0.0, 0.0, 0.0),
+                target_position=tuple(target_pos),
+                target_velocity=tuple(target_vel),
+                target_visible=True,
+                target_distance=distance,
+                target_bearing=(0.0, 0.0),
+                obstacles=[],
+                immediate_threats=[],
+                safe_directions=[],
+                battery_level=100.0,
+                flight_envelope={}
+            )
+
+            tick_start = time.perf_counter()
+            drone_cmd = control.execute_command(command, perception)
+            tick_times.append(time.perf_counter() - tick_start)
+            distances.append(distance)
+
+            # Point-mass response using the same command mapping as the MPC path
+            accel = np.array([
+                drone_cmd.pitch * gravity,
+                (drone_cmd.thrust / 0.5 - 1.0) * gravity,
+                drone_cmd.roll * gravity
+            ])
+            drone_vel += accel * dt
+            drone_pos += drone_vel * dt
+
+        tick_ms = np.array(tick_times) * 1000.0
+        distances = np.array(distances)
+        half = len(distances) // 2
+        results[label] = {
+            "mean_tick_ms": float(tick_ms.mean()),
+            "p99_tick_ms": float(np.percentile(tick_ms, 99)),
+            "mean_distance": float(distances.mean()),
+            "steady_state_distance": float(distances[half:].mean()),
+            "final_distance": float(distances[-1])
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    for mode, stats in benchmark_mpc_against_pid().items():
+        print(f"{mode}: " + ", ".join(f"{key}={value:.3f}" for key, value in stats.items()))
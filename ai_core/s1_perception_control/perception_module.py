@@ -8,6 +8,7 @@ import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from ai_core.interface.sim_interface import SimulationState, DroneState, TargetState
+from .state_estimator import ErrorStateEKF
 
 
 @dataclass
@@ -24,7 +25,7 @@ class PerceptionState:
     target_bearing: Tuple[float, float]  # azimuth, elevation in radians
     obstacles: List[Dict[str, Any]]
     immediate_threats: List[Dict[str, Any]]
-    safe_directions: List[Tuple[float, float]]  # Available flight directions
+    safe_directions: np.ndarray  # (K, 2) available flight directions as (azimuth, elevation)
     battery_level: float
     flight_envelope: Dict[str, Any]  # Current flight constraints
 
@@ -32,7 +33,10 @@ class PerceptionState:
 class PerceptionModule:
     """Real-time perception processing for drone AI"""
     
-    def __init__(self, update_rate_hz: float = 200.0):
+    def __init__(self,
+                 update_rate_hz: float = 200.0,
+                 state_estimator: Optional[ErrorStateEKF] = None,
+                 terrain: Any = None):
         self.update_rate = update_rate_hz
         self.update_interval = 1.0 / update_rate_hz
         self.last_update = 0.0
@@ -46,17 +50,32 @@ class PerceptionModule:
         self.position_filter = SimpleKalmanFilter()
         self.target_filter = SimpleKalmanFilter()
         
+        # Optional sensor-fusion estimator; once initialized it replaces the raw sim drone state
+        self.state_estimator = state_estimator
+        
+        # Optional terrain heightfield (shared.terrain.Heightfield) for ground clearance
+        self.terrain = terrain
+        
         # Threat detection parameters
         self.collision_lookahead_time = 2.0  # seconds
         self.min_safe_distance = 3.0  # meters
         self.critical_distance = 1.5  # meters
         
+        # Direction sampling for safe-direction search
+        self.safe_direction_check_distance = 10.0  # meters
+        self.set_direction_sampling(azimuth_samples=16, elevation_samples=5)
+        
     def process_state(self, sim_state: SimulationState) -> PerceptionState:
         """Process raw simulation state into actionable perception data"""
         current_time = time.time()
         
-        # Apply filters for noise reduction
-        filtered_position = self.position_filter.update(sim_state.drone.position)
+        # Fused drone state if available, otherwise smooth the raw position
+        drone = sim_state.drone
+        if self.state_estimator is not None and self.state_estimator.initialized:
+            drone = self.state_estimator.drone_state(sim_state.drone)
+            filtered_position = drone.position
+        else:
+            filtered_position = self.position_filter.update(drone.position)
         filtered_target_pos = None
         
         if sim_state.target.is_visible:
@@ -69,7 +88,7 @@ class PerceptionModule:
         
         # Detect immediate threats
         immediate_threats = self._detect_immediate_threats(
-            filtered_position, sim_state.drone.velocity, sim_state.obstacles
+            filtered_position, drone.velocity, sim_state.obstacles
         )
         
         # Calculate safe flight directions
@@ -79,7 +98,7 @@ class PerceptionModule:
         
         # Determine current flight envelope
         flight_envelope = self._calculate_flight_envelope(
-            sim_state.drone, sim_state.obstacles
+            drone, sim_state.obstacles
         )
         
         # Update history
@@ -88,8 +107,8 @@ class PerceptionModule:
         return PerceptionState(
             timestamp=current_time,
             drone_position=filtered_position,
-            drone_velocity=sim_state.drone.velocity,
-            drone_orientation=sim_state.drone.orientation,
+            drone_velocity=drone.velocity,
+            drone_orientation=drone.orientation,
             target_position=filtered_target_pos,
             target_velocity=sim_state.target.velocity if sim_state.target.is_visible else None,
             target_visible=sim_state.target.is_visible,
@@ -98,7 +117,7 @@ class PerceptionModule:
             obstacles=sim_state.obstacles,
             immediate_threats=immediate_threats,
             safe_directions=safe_directions,
-            battery_level=sim_state.drone.battery_level,
+            battery_level=drone.battery_level,
             flight_envelope=flight_envelope
         )
     
@@ -198,60 +217,57 @@ class PerceptionModule:
         
         return tuple(avoidance_vector)
     
+    def set_direction_sampling(self, azimuth_samples: int, elevation_samples: int):
+        """Precompute the spherical direction grid used for safe-direction search"""
+        azimuths, elevations = np.meshgrid(
+            np.linspace(0, 2*np.pi, azimuth_samples),
+            np.linspace(-np.pi/4, np.pi/4, elevation_samples),
+            indexing="ij"
+        )
+        self.direction_samples = np.column_stack([azimuths.ravel(), elevations.ravel()])
+        
+        # Matching unit vectors (x, y-up, z)
+        azimuths = self.direction_samples[:, 0]
+        elevations = self.direction_samples[:, 1]
+        self.direction_vectors = np.column_stack([
+            np.cos(elevations) * np.cos(azimuths),
+            np.sin(elevations),
+            np.cos(elevations) * np.sin(azimuths)
+        ])
+    
     def _calculate_safe_directions(self, 
                                  drone_pos: Tuple[float, float, float],
                                  obstacles: List[Dict[str, Any]],
-                                 threats: List[Dict[str, Any]]) -> List[Tuple[float, float]]:
-        """Calculate available safe flight directions"""
-        safe_directions = []
-        
-        # Sample directions in spherical coordinates
-        azimuth_samples = np.linspace(0, 2*np.pi, 16)  # 16 directions horizontally
-        elevation_samples = np.linspace(-np.pi/4, np.pi/4, 5)  # 5 elevations
-        
-        for azimuth in azimuth_samples:
-            for elevation in elevation_samples:
-                direction = (azimuth, elevation)
-                if self._is_direction_safe(drone_pos, direction, obstacles, threats):
-                    safe_directions.append(direction)
-        
-        return safe_directions
-    
-    def _is_direction_safe(self, 
-                         drone_pos: Tuple[float, float, float],
-                         direction: Tuple[float, float],
-                         obstacles: List[Dict[str, Any]],
-                         threats: List[Dict[str, Any]]) -> bool:
-        """Check if a flight direction is safe"""
-        azimuth, elevation = direction
-        
-        # Convert to unit vector
-        dir_vector = np.array([
-            np.cos(elevation) * np.cos(azimuth),
-            np.sin(elevation),
-            np.cos(elevation) * np.sin(azimuth)
-        ])
-        
-        # Check for obstacles in this direction within safety distance
-        check_distance = 10.0  # meters
-        check_pos = np.array(drone_pos) + dir_vector * check_distance
-        
-        for obstacle in obstacles:
-            obs_pos = np.array(obstacle.get("position", [0, 0, 0]))
-            obs_size = max(obstacle.get("size", [1, 1, 1]))
-            
-            # Distance from check position to obstacle
-            distance = np.linalg.norm(check_pos - obs_pos)
-            if distance < obs_size + self.min_safe_distance:
-                return False
-        
-        return True
+                                 threats: List[Dict[str, Any]]) -> np.ndarray:
+        """Calculate available safe flight directions as a (K, 2) array"""
+        if not obstacles and self.terrain is None:
+            return self.direction_samples.copy()
+        
+        # Probe point along each direction vs every obstacle in one pass
+        check_points = np.asarray(drone_pos, dtype=float) + \
+            self.direction_vectors * self.safe_direction_check_distance
+        safe = np.ones(len(check_points), dtype=bool)
+        
+        if obstacles:
+            obs_positions = np.array([obstacle.get("position", [0, 0, 0]) for obstacle in obstacles],
+                                     dtype=float)
+            clearances = np.array([max(obstacle.get("size", [1, 1, 1])) for obstacle in obstacles],
+                                  dtype=float) + self.min_safe_distance
+            offsets = check_points[:, np.newaxis, :] - obs_positions[np.newaxis, :, :]
+            distances_sq = np.einsum('kmi,kmi->km', offsets, offsets)
+            safe &= np.all(distances_sq >= clearances ** 2, axis=1)
+        
+        # Probe points must also stay clear of the ground
+        if self.terrain is not None:
+            safe &= check_points[:, 1] >= self.terrain.heights_at(check_points) + self.min_safe_distance
+        
+        return self.direction_samples[safe]
     
     def _calculate_flight_envelope(self, 
                                  drone_state: DroneState,
                                  obstacles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate current flight performance envelope"""
-        return {
+        envelope = {
             "max_speed": 15.0,  # m/s
             "max_acceleration": 8.0,  # m/s²
             "max_climb_rate": 5.0,  # m/s
@@ -261,6 +277,13 @@ class PerceptionModule:
             "altitude_limits": [1.0, 100.0],  # min/max altitude
             "emergency_reserves": drone_state.battery_level > 20.0
         }
+        
+        if self.terrain is not None:
+            ground_height = self.terrain.height_at(drone_state.position[0], drone_state.position[2])
+            envelope["ground_height"] = ground_height
+            envelope["altitude_above_ground"] = drone_state.position[1] - ground_height
+        
+        return envelope
     
     def _update_history(self, timestamp: float, sim_state: SimulationState):
         """Update perception history for filtering and prediction"""
@@ -6,41 +6,71 @@ Simulates basic drone sensors with realistic noise and limitations
 import numpy as np
 import time
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
 
+from .camera import PinholeCamera
+from .lidar_3d import MultiBeamLidar
+from .noise import NoiseStream
+from .raycast import obstacle_arrays, ray_sphere_ranges
+from .readings import DETECTION_DTYPE, CameraDetections, LidarScan, SensorReading, detection_type_codes
+from .scheduler import SensorScheduler
 
-@dataclass
-class SensorReading:
-    """Single sensor reading with metadata"""
-    timestamp: float
-    sensor_type: str
-    value: Any
-    confidence: float  # 0.0 to 1.0
-    noise_level: float
-    valid: bool
+
+def sensor_enabled(config: Dict[str, Any], sensor: str) -> bool:
+    """A sensor runs if its config has a section for it that does not disable it"""
+    return sensor in config and config[sensor].get("enabled", True)
 
 
 class BasicSensorModel:
     """Basic sensor model with configurable noise and failures"""
     
-    def __init__(self, sensor_config: Dict[str, Any] = None):
+    # Chance per reading that a working sensor fails
+    FAILURE_PROBABILITIES: Dict[str, float] = {
+        "gps": 0.001,      # 0.1% chance per reading
+        "imu": 0.0005,     # 0.05% chance
+        "altimeter": 0.002, # 0.2% chance
+        "camera": 0.01,    # 1% chance
+        "lidar": 0.005,    # 0.5% chance
+        "lidar_3d": 0.005  # 0.5% chance
+    }
+    
+    def __init__(self,
+                 sensor_config: Dict[str, Any] = None,
+                 seed: Optional[int] = None,
+                 terrain: Any = None):
         if sensor_config is None:
             sensor_config = self._default_config()
         
         self.config = sensor_config
+        
+        # Independent noise stream per sensor (a sensor's "seed" overrides the model seed)
+        self.reseed(seed)
         self.last_readings: Dict[str, SensorReading] = {}
         
         # Sensor failure simulation
         self.sensor_failures: Dict[str, bool] = {}
-        self.failure_probabilities: Dict[str, float] = {
-            "gps": 0.001,      # 0.1% chance per reading
-            "imu": 0.0005,     # 0.05% chance
-            "altimeter": 0.002, # 0.2% chance
-            "camera": 0.01,    # 1% chance
-            "lidar": 0.005     # 0.5% chance
-        }
+        self.failure_probabilities: Dict[str, float] = dict(self.FAILURE_PROBABILITIES)
+        
+        # Ray directions per angular resolution, built on first use
+        self._lidar_rays: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+        
+        # Multi-rate scheduling from each sensor's update_rate
+        self.scheduler = SensorScheduler({
+            sensor: sensor_cfg.get("update_rate", 0.0)
+            for sensor, sensor_cfg in self.config.items()
+        })
+        self.last_updated: List[str] = []
+        
+        # Multi-beam LiDAR with precomputed beam pattern
+        self.lidar_3d = MultiBeamLidar.from_config(self.config["lidar_3d"]) if "lidar_3d" in self.config else None
         
-    def _default_config(self) -> Dict[str, Any]:
+        # Pinhole camera with frustum culling and occlusion
+        self.camera = PinholeCamera.from_config(self.config["camera"]) if "camera" in self.config else None
+        
+        # Optional terrain heightfield (shared.terrain.Heightfield) for ground returns
+        self.terrain = terrain
+        
+    @staticmethod
+    def _default_config() -> Dict[str, Any]:
         """Default sensor configuration"""
         return {
             "gps": {
@@ -75,6 +105,15 @@ class BasicSensorModel:
                 "angular_resolution": 1.0, # degrees
                 "update_rate": 20.0,   # Hz
                 "enabled": True
+            },
+            "lidar_3d": {
+                "channels": 16,
+                "vertical_fov": [-15.0, 15.0],  # degrees
+                "horizontal_resolution": 1.0,   # degrees
+                "range": 100.0,        # meters
+                "accuracy": 0.03,      # meters
+                "update_rate": 10.0,   # Hz
+                "enabled": False
             }
         }
     
@@ -95,7 +134,7 @@ class BasicSensorModel:
         noise_std = config["noise_std"]
         
         # Add Gaussian noise to each coordinate
-        noise = np.random.normal(0, noise_std, 3)
+        noise = self.noise_streams["gps"].normal(noise_std, 3)
         noisy_position = np.array(true_position) + noise
         
         # Calculate confidence based on noise level
@@ -121,7 +160,8 @@ class BasicSensorModel:
         # Accelerometer
         if not self._check_sensor_failure("imu"):
             config = self.config["imu"]
-            accel_noise = np.random.normal(0, config["accel_noise_std"], 3)
+            imu_noise = self.noise_streams["imu"]
+            accel_noise = imu_noise.normal(config["accel_noise_std"], 3)
             noisy_accel = np.array(true_acceleration) + accel_noise
             
             readings["accelerometer"] = SensorReading(
@@ -134,8 +174,8 @@ class BasicSensorModel:
             )
             
             # Gyroscope with drift
-            gyro_noise = np.random.normal(0, config["gyro_noise_std"], 3)
-            drift = np.random.normal(0, config["drift_rate"], 3)
+            gyro_noise = imu_noise.normal(config["gyro_noise_std"], 3)
+            drift = imu_noise.normal(config["drift_rate"], 3)
             noisy_gyro = np.array(true_angular_velocity) + gyro_noise + drift
             
             readings["gyroscope"] = SensorReading(
@@ -168,8 +208,16 @@ class BasicSensorModel:
         
         return readings
     
-    def read_altimeter(self, true_altitude: float) -> SensorReading:
-        """Simulate barometric altimeter reading"""
+    def read_altimeter(self,
+                      true_altitude: Optional[float] = None,
+                      position: Optional[Tuple[float, float, float]] = None) -> SensorReading:
+        """Simulate altimeter reading
+        
+        With a terrain model and a position the true value is the height
+        above the ground below the drone; otherwise true_altitude is used.
+        """
+        if self.terrain is not None and position is not None:
+            true_altitude = self.terrain.altitude_above_ground(position)
         
         if self._check_sensor_failure("altimeter"):
             return SensorReading(
@@ -182,7 +230,7 @@ class BasicSensorModel:
             )
         
         config = self.config["altimeter"]
-        noise = np.random.normal(0, config["noise_std"])
+        noise = self.noise_streams["altimeter"].normal(config["noise_std"])
         noisy_altitude = true_altitude + noise
         
         # Check if altitude is within sensor range
@@ -204,8 +252,14 @@ class BasicSensorModel:
     def read_camera(self, 
                    target_position: Optional[Tuple[float, float, float]],
                    drone_position: Tuple[float, float, float],
-                   obstacles: List[Dict[str, Any]]) -> SensorReading:
-        """Simulate camera-based target detection"""
+                   obstacles: List[Dict[str, Any]],
+                   orientation: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> SensorReading:
+        """Simulate camera-based target detection
+        
+        Only objects inside the camera frustum (fov_degrees, detection_range)
+        and not hidden behind other obstacles are detected; each detection
+        carries its (u, v) pixel position. orientation is (pitch, roll, yaw).
+        """
         
         if self._check_sensor_failure("camera"):
             return SensorReading(
@@ -218,55 +272,42 @@ class BasicSensorModel:
             )
         
         config = self.config["camera"]
-        detection_data = {
-            "targets_detected": [],
-            "obstacles_detected": [],
-            "image_quality": 1.0
-        }
+        detection_range = config["detection_range"]
+        view = self.camera.observe(drone_position, orientation, obstacles, target_position)
         
         # Check if target is visible
-        if target_position is not None:
-            distance = np.linalg.norm(np.array(target_position) - np.array(drone_position))
+        targets = np.zeros(1 if view.target_visible else 0, dtype=DETECTION_DTYPE)
+        if view.target_visible:
+            distance = view.target_distance
             
-            if distance <= config["detection_range"]:
-                # Simulate detection with distance-based confidence
-                confidence = max(0.3, 1.0 - distance / config["detection_range"])
-                
-                # Add noise to detected position
-                noise_std = 0.1 * distance  # Noise increases with distance
-                noise = np.random.normal(0, noise_std, 3)
-                detected_position = np.array(target_position) + noise
-                
-                detection_data["targets_detected"].append({
-                    "position": tuple(detected_position),
-                    "confidence": confidence,
-                    "distance": distance,
-                    "type": "target"
-                })
-        
-        # Detect obstacles in range
-        for obstacle in obstacles:
-            obs_pos = obstacle.get("position", [0, 0, 0])
-            distance = np.linalg.norm(np.array(obs_pos) - np.array(drone_position))
+            # Add noise to detected position; noise increases with distance
+            noise = self.noise_streams["camera"].normal(0.1 * distance, 3)
             
-            if distance <= config["detection_range"]:
-                confidence = max(0.5, 1.0 - distance / config["detection_range"])
-                
-                detection_data["obstacles_detected"].append({
-                    "position": obs_pos,
-                    "size": obstacle.get("size", [1, 1, 1]),
-                    "confidence": confidence,
-                    "distance": distance,
-                    "type": obstacle.get("type", "unknown")
-                })
+            targets["position"] = np.asarray(target_position, dtype=float) + noise
+            targets["pixel"] = view.target_pixel
+            # Distance-based confidence
+            targets["confidence"] = max(0.3, 1.0 - distance / detection_range)
+            targets["distance"] = distance
+            targets["type"] = detection_type_codes(["target"])
+        
+        # Visible obstacles
+        visible = [obstacles[index] for index in view.indices]
+        detected_obstacles = np.zeros(len(visible), dtype=DETECTION_DTYPE)
+        if visible:
+            detected_obstacles["position"] = view.positions
+            detected_obstacles["size"] = [obstacle.get("size", [1, 1, 1]) for obstacle in visible]
+            detected_obstacles["pixel"] = view.pixels
+            detected_obstacles["confidence"] = np.maximum(0.5, 1.0 - view.distances / detection_range)
+            detected_obstacles["distance"] = view.distances
+            detected_obstacles["type"] = detection_type_codes([obstacle.get("type", "unknown") for obstacle in visible])
         
         # Overall confidence based on detections
-        overall_confidence = 0.8 if detection_data["targets_detected"] or detection_data["obstacles_detected"] else 0.3
+        overall_confidence = 0.8 if len(targets) or len(detected_obstacles) else 0.3
         
         return SensorReading(
             timestamp=time.time(),
             sensor_type="camera",
-            value=detection_data,
+            value=CameraDetections(targets, detected_obstacles),
             confidence=overall_confidence,
             noise_level=0.1,
             valid=True
@@ -291,45 +332,21 @@ class BasicSensorModel:
         max_range = config["range"]
         accuracy = config["accuracy"]
         
-        # Simulate 360-degree scan
-        scan_points = []
-        angular_resolution = config["angular_resolution"]
+        # Simulate 360-degree horizontal scan
+        angles, ray_directions = self._get_lidar_rays(config["angular_resolution"])
         
-        for angle_deg in range(0, 360, int(angular_resolution)):
-            angle_rad = np.radians(angle_deg)
-            
-            # Cast ray in this direction
-            ray_direction = np.array([np.cos(angle_rad), 0, np.sin(angle_rad)])
-            
-            # Find closest obstacle in this direction
-            min_distance = max_range
-            
-            for obstacle in obstacles:
-                obs_pos = np.array(obstacle.get("position", [0, 0, 0]))
-                obs_size = max(obstacle.get("size", [1, 1, 1]))
-                
-                # Simple ray-sphere intersection
-                to_obstacle = obs_pos - np.array(drone_position)
-                projection = np.dot(to_obstacle, ray_direction)
-                
-                if projection > 0:  # Obstacle is in front
-                    closest_point = np.array(drone_position) + ray_direction * projection
-                    distance_to_closest = np.linalg.norm(closest_point - obs_pos)
-                    
-                    if distance_to_closest <= obs_size:
-                        obstacle_distance = projection - obs_size
-                        if obstacle_distance > 0 and obstacle_distance < min_distance:
-                            min_distance = obstacle_distance
-            
-            # Add noise to distance measurement
-            noise = np.random.normal(0, accuracy)
-            measured_distance = min_distance + noise
-            
-            scan_points.append({
-                "angle": angle_deg,
-                "distance": max(0.1, measured_distance),  # Minimum 0.1m
-                "valid": measured_distance < max_range
-            })
+        centers, radii = obstacle_arrays(obstacles)
+        min_distance = ray_sphere_ranges(drone_position, ray_directions, centers, radii, max_range)
+        if self.terrain is not None:
+            min_distance = np.minimum(min_distance, self.terrain.raycast(drone_position, ray_directions, max_range))
+        
+        # Add noise to distance measurements
+        measured_distance = min_distance + self.noise_streams["lidar"].normal(accuracy, len(angles))
+        scan_points = LidarScan(
+            angles=angles,
+            distances=np.maximum(0.1, measured_distance),  # Minimum 0.1m
+            valid=min_distance < max_range  # a return, whatever the noise does to it
+        )
         
         return SensorReading(
             timestamp=time.time(),
@@ -340,6 +357,57 @@ class BasicSensorModel:
             valid=True
         )
     
+    def read_lidar_3d(self, 
+                     drone_position: Tuple[float, float, float],
+                     obstacles: List[Dict[str, Any]],
+                     ground_height: float = 0.0) -> SensorReading:
+        """Simulate a multi-beam 3D LiDAR sweep as a point cloud"""
+        
+        if self.lidar_3d is None or self._check_sensor_failure("lidar_3d"):
+            return SensorReading(
+                timestamp=time.time(),
+                sensor_type="lidar_3d",
+                value=None,
+                confidence=0.0,
+                noise_level=1.0,
+                valid=False
+            )
+        
+        point_cloud = self.lidar_3d.scan(drone_position, obstacles, ground_height=ground_height,
+                                         terrain=self.terrain, noise=self.noise_streams["lidar_3d"])
+        
+        return SensorReading(
+            timestamp=time.time(),
+            sensor_type="lidar_3d",
+            value=point_cloud,
+            confidence=0.95,
+            noise_level=self.lidar_3d.accuracy,
+            valid=True
+        )
+    
+    def _get_lidar_rays(self, angular_resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached scan angles (degrees) and horizontal unit ray directions"""
+        if angular_resolution not in self._lidar_rays:
+            angles = np.arange(0.0, 360.0, angular_resolution)
+            radians = np.radians(angles)
+            directions = np.column_stack([np.cos(radians), np.zeros_like(radians), np.sin(radians)])
+            self._lidar_rays[angular_resolution] = (angles, directions)
+        return self._lidar_rays[angular_resolution]
+    
+    def reseed(self, seed: Optional[int] = None):
+        """Recreate all noise streams, e.g. to replay an identical benchmark run"""
+        self.seed = seed
+        self.noise_streams: Dict[str, NoiseStream] = {
+            sensor: NoiseStream.for_sensor(sensor, sensor_cfg.get("seed", seed))
+            for sensor, sensor_cfg in self.config.items()
+        }
+    
+    def _failure_stream(self, sensor_type: str) -> NoiseStream:
+        """Noise stream used for a sensor's failure/recovery draws"""
+        if sensor_type not in self.noise_streams:
+            self.noise_streams[sensor_type] = NoiseStream.for_sensor(sensor_type, self.seed)
+        return self.noise_streams[sensor_type]
+    
     def _check_sensor_failure(self, sensor_type: str) -> bool:
         """Check if sensor has failed"""
         
@@ -347,7 +415,7 @@ class BasicSensorModel:
         if sensor_type in self.sensor_failures:
             if self.sensor_failures[sensor_type]:
                 # 10% chance of recovery each reading
-                if np.random.random() < 0.1:
+                if self._failure_stream(sensor_type).uniform() < 0.1:
                     self.sensor_failures[sensor_type] = False
                     print(f"Sensor {sensor_type} recovered")
                     return False
@@ -355,7 +423,7 @@ class BasicSensorModel:
         
         # Check for new failure
         failure_prob = self.failure_probabilities.get(sensor_type, 0.0)
-        if np.random.random() < failure_prob:
+        if self._failure_stream(sensor_type).uniform() < failure_prob:
             self.sensor_failures[sensor_type] = True
             print(f"Sensor {sensor_type} failed!")
             return True
@@ -381,43 +449,98 @@ class BasicSensorModel:
         print("All sensor failures cleared")
     
     def simulate_sensor_suite(self,
-                            true_state: Dict[str, Any]) -> Dict[str, SensorReading]:
-        """Simulate reading from all sensors"""
-        
+                            true_state: Dict[str, Any],
+                            timestamp: Optional[float] = None,
+                            scheduled: bool = True) -> Dict[str, SensorReading]:
+        """Simulate reading from all sensors
+        
+        With scheduled=True each sensor only produces a new reading when it
+        is due according to its update_rate; otherwise its last reading is
+        returned again. timestamp defaults to wall-clock time and should be
+        the simulation time when running faster than real time. The keys
+        refreshed on this call are left in self.last_updated.
+        """
+        
+        now = time.time() if timestamp is None else timestamp
         readings = {}
+        updated = []
+        
+        def due(sensor: str) -> bool:
+            if not sensor_enabled(self.config, sensor):
+                return False
+            return not scheduled or self.scheduler.is_due(sensor, now)
+        
+        def reuse(*keys: str):
+            for key in keys:
+                if key in self.last_readings:
+                    readings[key] = self.last_readings[key]
         
         # GPS
         if "position" in true_state:
-            readings["gps"] = self.read_gps(true_state["position"])
+            if due("gps"):
+                readings["gps"] = self.read_gps(true_state["position"])
+                updated.append("gps")
+            else:
+                reuse("gps")
         
         # IMU
         if "acceleration" in true_state and "angular_velocity" in true_state:
-            imu_readings = self.read_imu(
-                true_state["acceleration"],
-                true_state["angular_velocity"]
-            )
-            readings.update(imu_readings)
-        
-        # Altimeter
-        if "altitude" in true_state:
-            readings["altimeter"] = self.read_altimeter(true_state["altitude"])
+            if due("imu"):
+                imu_readings = self.read_imu(
+                    true_state["acceleration"],
+                    true_state["angular_velocity"]
+                )
+                readings.update(imu_readings)
+                updated.extend(imu_readings.keys())
+            else:
+                reuse("accelerometer", "gyroscope")
+        
+        # Altimeter (height above terrain when a terrain model is set)
+        if "altitude" in true_state or (self.terrain is not None and "position" in true_state):
+            if due("altimeter"):
+                readings["altimeter"] = self.read_altimeter(true_state.get("altitude"),
+                                                            true_state.get("position"))
+                updated.append("altimeter")
+            else:
+                reuse("altimeter")
         
         # Camera
         if "target_position" in true_state:
-            readings["camera"] = self.read_camera(
-                true_state.get("target_position"),
-                true_state["position"],
-                true_state.get("obstacles", [])
-            )
+            if due("camera"):
+                readings["camera"] = self.read_camera(
+                    true_state.get("target_position"),
+                    true_state["position"],
+                    true_state.get("obstacles", []),
+                    true_state.get("orientation", (0.0, 0.0, 0.0))
+                )
+                updated.append("camera")
+            else:
+                reuse("camera")
         
         # LiDAR
         if "obstacles" in true_state:
-            readings["lidar"] = self.read_lidar(
-                true_state["position"],
-                true_state["obstacles"]
-            )
+            if due("lidar"):
+                readings["lidar"] = self.read_lidar(
+                    true_state["position"],
+                    true_state["obstacles"]
+                )
+                updated.append("lidar")
+            else:
+                reuse("lidar")
+        
+        # Multi-beam LiDAR (opt-in, heavier)
+        if "obstacles" in true_state:
+            if due("lidar_3d"):
+                readings["lidar_3d"] = self.read_lidar_3d(
+                    true_state["position"],
+                    true_state["obstacles"]
+                )
+                updated.append("lidar_3d")
+            else:
+                reuse("lidar_3d")
         
         # Store last readings
         self.last_readings.update(readings)
+        self.last_updated = updated
         
-        return readings 
\ No newline at end of file
+        return readings
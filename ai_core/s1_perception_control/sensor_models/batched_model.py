@@ -0,0 +1,247 @@
+"""
+Batched Sensor Model
+Simulates the basic sensor suite for many vehicles at once, for Monte Carlo runs
+"""
+
+import numpy as np
+import time
+from typing import Any, Dict, List, Optional
+
+from .basic_model import BasicSensorModel, sensor_enabled
+from .camera import PinholeCamera
+from .noise import NoiseStream
+from .raycast import batched_ray_sphere_ranges, obstacle_arrays
+
+
+class BatchedSensorModel:
+    """Array-in, array-out counterpart of BasicSensorModel for N vehicles
+
+    Noise, failure and camera visibility follow BasicSensorModel (same
+    config, same failure probabilities, 10% recovery chance per reading
+    while failed, same pinhole frustum and occlusion rules), but every
+    reading is produced for all vehicles in one vectorized call and failure
+    state is tracked per vehicle. Readings are returned as dicts of
+    arrays whose first axis is the vehicle index; values of vehicles whose
+    sensor is failed are NaN and marked invalid.
+    """
+
+    RECOVERY_PROBABILITY = 0.1
+    SENSORS = ("gps", "imu", "altimeter", "camera", "lidar")
+
+    def __init__(self,
+                 num_vehicles: int,
+                 sensor_config: Dict[str, Any] = None,
+                 seed: Optional[int] = None):
+        if sensor_config is None:
+            sensor_config = BasicSensorModel._default_config()
+
+        self.num_vehicles = num_vehicles
+        self.config = sensor_config
+        self.reseed(seed)
+
+        self.failure_probabilities: Dict[str, float] = {
+            sensor: BasicSensorModel.FAILURE_PROBABILITIES[sensor] for sensor in self.SENSORS
+        }
+        self.sensor_failures: Dict[str, np.ndarray] = {
+            sensor: np.zeros(num_vehicles, dtype=bool) for sensor in self.SENSORS
+        }
+
+        # Same frustum and occlusion model as BasicSensorModel.read_camera
+        self.camera = PinholeCamera.from_config(self.config["camera"]) if "camera" in self.config else None
+
+        # Horizontal LiDAR ray pattern shared by all vehicles (empty without a lidar section)
+        lidar_config = self.config.get("lidar")
+        self.lidar_angles = (np.arange(0.0, 360.0, lidar_config["angular_resolution"])
+                             if lidar_config is not None else np.zeros(0))
+        radians = np.radians(self.lidar_angles)
+        self.lidar_directions = np.column_stack([np.cos(radians), np.zeros_like(radians), np.sin(radians)])
+
+    def reseed(self, seed: Optional[int] = None):
+        """Recreate all noise streams, e.g. to replay an identical Monte Carlo batch"""
+        self.seed = seed
+        self.noise_streams: Dict[str, NoiseStream] = {
+            sensor: NoiseStream.for_sensor(sensor, sensor_cfg.get("seed", seed))
+            for sensor, sensor_cfg in self.config.items()
+        }
+
+    def reset_failures(self):
+        """Clear the failure state of every sensor on every vehicle"""
+        for failed in self.sensor_failures.values():
+            failed[:] = False
+
+    def _update_failures(self, sensor_type: str) -> np.ndarray:
+        """Advance per-vehicle failure state; returns the mask of vehicles whose sensor works"""
+        failed = self.sensor_failures[sensor_type]
+        draws = self.noise_streams[sensor_type].uniform(self.num_vehicles)
+
+        recovered = failed & (draws < self.RECOVERY_PROBABILITY)
+        new_failures = ~failed & (draws < self.failure_probabilities[sensor_type])
+        failed[:] = (failed & ~recovered) | new_failures
+        return ~failed
+
+    def read_gps(self, true_positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """GPS positions (N, 3) with per-vehicle confidence"""
+        working = self._update_failures("gps")
+        noise_std = self.config["gps"]["noise_std"]
+
+        noise = self.noise_streams["gps"].normal(noise_std, 3 * self.num_vehicles).reshape(-1, 3)
+        noise_magnitude = np.linalg.norm(noise, axis=1)
+
+        return {
+            "values": np.where(working[:, np.newaxis], true_positions + noise, np.nan),
+            "confidence": np.where(working, np.maximum(0.1, 1.0 - noise_magnitude / (3 * noise_std)), 0.0),
+            "valid": working
+        }
+
+    def read_imu(self,
+                 true_accelerations: np.ndarray,
+                 true_angular_velocities: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+        """Accelerometer and gyroscope readings (N, 3) sharing one failure state"""
+        working = self._update_failures("imu")
+        config = self.config["imu"]
+        count = 3 * self.num_vehicles
+
+        imu_noise = self.noise_streams["imu"]
+        accel_noise = imu_noise.normal(config["accel_noise_std"], count).reshape(-1, 3)
+        gyro_noise = imu_noise.normal(config["gyro_noise_std"], count).reshape(-1, 3)
+        drift = imu_noise.normal(config["drift_rate"], count).reshape(-1, 3)
+
+        mask = working[:, np.newaxis]
+        return {
+            "accelerometer": {
+                "values": np.where(mask, true_accelerations + accel_noise, np.nan),
+                "confidence": np.where(working, 0.9, 0.0),
+                "valid": working
+            },
+            "gyroscope": {
+                "values": np.where(mask, true_angular_velocities + gyro_noise + drift, np.nan),
+                "confidence": np.where(working, 0.95, 0.0),
+                "valid": working
+            }
+        }
+
+    def read_altimeter(self, true_altitudes: np.ndarray) -> Dict[str, np.ndarray]:
+        """Barometric altitudes (N,) with range-dependent confidence"""
+        working = self._update_failures("altimeter")
+        config = self.config["altimeter"]
+
+        noise = self.noise_streams["altimeter"].normal(config["noise_std"], self.num_vehicles)
+        altitudes = true_altitudes + noise
+
+        low, high = config["range"]
+        in_range = (altitudes >= low) & (altitudes <= high)
+        confidence = np.where(in_range, np.maximum(0.7, 1.0 - np.abs(noise) / (3 * config["noise_std"])), 0.1)
+
+        return {
+            "values": np.where(working, altitudes, np.nan),
+            "confidence": np.where(working, confidence, 0.0),
+            "valid": working
+        }
+
+    def read_camera(self,
+                    target_positions: np.ndarray,
+                    drone_positions: np.ndarray,
+                    obstacles: List[Dict[str, Any]],
+                    orientations: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Target detections (N, 3) and an (N, M) mask of detected obstacles
+
+        Detection follows BasicSensorModel.read_camera: only objects inside
+        the camera frustum and not hidden behind other obstacles are seen.
+        orientations (N, 3) are (pitch, roll, yaw) and default to level,
+        facing +x.
+        """
+        working = self._update_failures("camera")
+        detection_range = self.config["camera"]["detection_range"]
+        if orientations is None:
+            orientations = np.zeros((self.num_vehicles, 3))
+
+        centers, radii = obstacle_arrays(obstacles)
+        view = self.camera.observe_batch(drone_positions, orientations, centers, radii, target_positions)
+        detected = working & view.target_visible
+        distances = view.target_distances
+
+        # Noise grows with distance, as in BasicSensorModel.read_camera
+        noise = self.noise_streams["camera"].normal(1.0, 3 * self.num_vehicles).reshape(-1, 3)
+        noise *= 0.1 * distances[:, np.newaxis]
+
+        obstacles_detected = working[:, np.newaxis] & view.visible
+        overall = np.where(detected | obstacles_detected.any(axis=1), 0.8, 0.3)
+        return {
+            "target_positions": np.where(detected[:, np.newaxis], target_positions + noise, np.nan),
+            "target_pixels": np.where(detected[:, np.newaxis], view.target_pixels, np.nan),
+            "target_detected": detected,
+            "target_distances": distances,
+            "target_confidence": np.where(detected, np.maximum(0.3, 1.0 - distances / detection_range), 0.0),
+            "obstacles_detected": obstacles_detected,
+            "obstacle_pixels": view.pixels,
+            "obstacle_distances": view.distances,
+            "confidence": np.where(working, overall, 0.0),
+            "valid": working
+        }
+
+    def read_lidar(self,
+                   drone_positions: np.ndarray,
+                   obstacles: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Horizontal LiDAR ranges (N, rays) against a shared obstacle field"""
+        working = self._update_failures("lidar")
+        config = self.config["lidar"]
+        max_range = config["range"]
+
+        centers, radii = obstacle_arrays(obstacles)
+        ranges = batched_ray_sphere_ranges(drone_positions, self.lidar_directions,
+                                           centers, radii, max_range)
+        ranges += self.noise_streams["lidar"].normal(
+            config["accuracy"], ranges.size).reshape(ranges.shape)
+
+        return {
+            "angles": self.lidar_angles,
+            "distances": np.where(working[:, np.newaxis], np.maximum(0.1, ranges), np.nan),
+            "returns": working[:, np.newaxis] & (ranges < max_range),
+            "valid": working
+        }
+
+    def simulate(self,
+                 true_states: Dict[str, np.ndarray],
+                 obstacles: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Simulate every enabled sensor for all vehicles in one call
+
+        true_states holds arrays with a leading vehicle axis: "position" and
+        "target_position" (N, 3), "acceleration" and "angular_velocity"
+        (N, 3), "altitude" (N,), optionally camera "orientation" (N, 3).
+        Missing entries skip the sensors that need them, as do sensors the
+        config has no section for. Obstacles are shared by all vehicles.
+        """
+        readings: Dict[str, Any] = {"timestamp": time.time()}
+
+        positions = true_states.get("position")
+        if positions is not None:
+            positions = np.asarray(positions, dtype=float)
+            if sensor_enabled(self.config, "gps"):
+                readings["gps"] = self.read_gps(positions)
+
+        if sensor_enabled(self.config, "imu") and "acceleration" in true_states and "angular_velocity" in true_states:
+            readings.update(self.read_imu(
+                np.asarray(true_states["acceleration"], dtype=float),
+                np.asarray(true_states["angular_velocity"], dtype=float)
+            ))
+
+        if sensor_enabled(self.config, "altimeter") and "altitude" in true_states:
+            readings["altimeter"] = self.read_altimeter(np.asarray(true_states["altitude"], dtype=float))
+
+        if positions is not None and sensor_enabled(self.config, "camera") and "target_position" in true_states:
+            orientations = true_states.get("orientation")
+            readings["camera"] = self.read_camera(
+                np.asarray(true_states["target_position"], dtype=float),
+                positions,
+                obstacles or [],
+                None if orientations is None else np.asarray(orientations, dtype=float)
+            )
+
+        if positions is not None and obstacles is not None and sensor_enabled(self.config, "lidar"):
+            readings["lidar"] = self.read_lidar(positions, obstacles)
+
+        return readings
+
+    def get_failure_rates(self) -> Dict[str, float]:
+        """Fraction of vehicles whose sensor is currently failed"""
+        return {sensor: float(failed.mean()) for sensor, failed in self.sensor_failures.items()}
@@ -0,0 +1,328 @@
+"""
+Pinhole Camera Model
+Frustum culling, occlusion and pixel projection for simulated camera detections
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+
+from .raycast import obstacle_arrays, ray_sphere_ranges
+
+
+class SpatialGrid:
+    """Uniform grid over the horizontal (x, z) plane for range queries
+
+    Object indices are stored sorted by cell so each grid column of a query
+    box is one contiguous slice; a query touches only the cells overlapping
+    the box instead of every object.
+    """
+
+    def __init__(self, centers: np.ndarray, radii: np.ndarray, cell_size: float = 10.0):
+        self.centers = centers
+        self.radii = radii
+        self.cell_size = cell_size
+        # Objects are binned by center, so queries are padded by the largest radius
+        self.max_radius = float(radii.max()) if len(radii) else 0.0
+
+        if len(centers):
+            self.origin = centers[:, [0, 2]].min(axis=0)
+            cells = np.floor((centers[:, [0, 2]] - self.origin) / cell_size).astype(int)
+            self.shape = tuple(cells.max(axis=0) + 1)
+        else:
+            self.origin = np.zeros(2)
+            cells = np.zeros((0, 2), dtype=int)
+            self.shape = (1, 1)
+
+        cell_ids = cells[:, 0] * self.shape[1] + cells[:, 1]
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.cell_starts = np.searchsorted(cell_ids[self.order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def query_box(self, low: Sequence[float], high: Sequence[float]) -> np.ndarray:
+        """Indices of objects whose center lies in the cells overlapping the (x, z) box"""
+        if len(self.centers) == 0:
+            return np.zeros(0, dtype=int)
+
+        low = np.floor((np.asarray(low) - self.max_radius - self.origin) / self.cell_size).astype(int)
+        high = np.floor((np.asarray(high) + self.max_radius - self.origin) / self.cell_size).astype(int)
+        low = np.maximum(low, 0)
+        high = np.minimum(high, np.array(self.shape) - 1)
+        if np.any(low > high):
+            return np.zeros(0, dtype=int)
+
+        columns = self.shape[1]
+        slices = [
+            self.order[self.cell_starts[ix * columns + low[1]]:self.cell_starts[ix * columns + high[1] + 1]]
+            for ix in range(low[0], high[0] + 1)
+        ]
+        return np.concatenate(slices)
+
+
+@dataclass
+class CameraView:
+    """Objects visible from one camera pose"""
+    indices: np.ndarray    # (K,) obstacle indices in the input list
+    positions: np.ndarray  # (K, 3) obstacle centers
+    pixels: np.ndarray     # (K, 2) projected (u, v) pixel coordinates of the centers
+    distances: np.ndarray  # (K,) camera-to-center distances
+    target_visible: bool
+    target_pixel: Optional[Tuple[float, float]]
+    target_distance: Optional[float]
+
+
+@dataclass
+class BatchCameraView:
+    """Objects visible from N camera poses over one shared obstacle field"""
+    visible: np.ndarray           # (N, M) obstacle visibility per camera
+    pixels: np.ndarray            # (N, M, 2) projected centers, NaN behind the image plane
+    distances: np.ndarray         # (N, M) camera-to-center distances
+    target_visible: np.ndarray    # (N,)
+    target_pixels: np.ndarray     # (N, 2), NaN where the target is not visible
+    target_distances: np.ndarray  # (N,), NaN without a target
+
+
+class PinholeCamera:
+    """Forward-looking pinhole camera with horizontal field of view fov_degrees
+
+    Orientation is (pitch, roll, yaw) in radians using the perception
+    bearing convention: yaw is the azimuth atan2(z, x) and pitch the
+    elevation above the horizontal plane. Obstacles are spheres as in the
+    range sensors. The spatial index is built once per obstacle list and
+    reused while the same list object is passed; call invalidate_index()
+    after modifying the list in place.
+    """
+
+    def __init__(self,
+                 resolution: Tuple[int, int] = (640, 480),
+                 fov_degrees: float = 60.0,
+                 max_range: float = 50.0,
+                 cell_size: float = 10.0):
+        self.resolution = tuple(resolution)
+        self.max_range = max_range
+        self.cell_size = cell_size
+
+        width, height = self.resolution
+        self.tan_half_h = np.tan(np.radians(fov_degrees) / 2.0)
+        self.tan_half_v = self.tan_half_h * height / width
+        self.focal_length = (width / 2.0) / self.tan_half_h
+
+        self._indexed_obstacles: Optional[List[Dict[str, Any]]] = None
+        self._indexed_count = 0
+        self._grid: Optional[SpatialGrid] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PinholeCamera":
+        """Build from a sensor config block (see BasicSensorModel._default_config)"""
+        return cls(
+            resolution=tuple(config.get("resolution", (640, 480))),
+            fov_degrees=config.get("fov_degrees", 60.0),
+            max_range=config.get("detection_range", 50.0)
+        )
+
+    def invalidate_index(self):
+        """Force the spatial index to be rebuilt on the next call"""
+        self._indexed_obstacles = None
+        self._grid = None
+
+    def _index_for(self, obstacles: List[Dict[str, Any]]) -> SpatialGrid:
+        if self._grid is None or obstacles is not self._indexed_obstacles or len(obstacles) != self._indexed_count:
+            centers, radii = obstacle_arrays(obstacles)
+            self._grid = SpatialGrid(centers, radii, self.cell_size)
+            self._indexed_obstacles = obstacles
+            self._indexed_count = len(obstacles)
+        return self._grid
+
+    @staticmethod
+    def camera_axes(orientation: Sequence[float]) -> np.ndarray:
+        """Rows are the camera right, up and forward unit vectors in world frame
+
+        An (N, 3) array of orientations gives (N, 3, 3) axes.
+        """
+        orientation = np.asarray(orientation, dtype=float)
+        pitch, roll, yaw = orientation[..., 0], orientation[..., 1], orientation[..., 2]
+        forward = np.stack([np.cos(pitch) * np.cos(yaw), np.sin(pitch), np.cos(pitch) * np.sin(yaw)], axis=-1)
+        right = np.stack([-np.sin(yaw), np.zeros_like(yaw), np.cos(yaw)], axis=-1)
+        up = np.cross(right, forward)
+        cos_roll = np.cos(roll)[..., np.newaxis]
+        sin_roll = np.sin(roll)[..., np.newaxis]
+        right, up = cos_roll * right + sin_roll * up, cos_roll * up - sin_roll * right
+        return np.stack([right, up, forward], axis=-2)
+
+    def _frustum_bounds(self, origin: np.ndarray, axes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(x, z) bounding box of the frustum out to max_range"""
+        right, up, forward = axes
+        corners = [origin]
+        for sx in (-1.0, 1.0):
+            for sy in (-1.0, 1.0):
+                corners.append(origin + self.max_range * (forward + sx * self.tan_half_h * right
+                                                          + sy * self.tan_half_v * up))
+        corners = np.array(corners)[:, [0, 2]]
+        return corners.min(axis=0), corners.max(axis=0)
+
+    def _in_frustum(self, camera_points: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """Conservative sphere-vs-frustum test in camera coordinates"""
+        x, y, z = camera_points[..., 0], camera_points[..., 1], camera_points[..., 2]
+        # Distance to a side plane is (|x| - z tan) cos(half angle); compare against the radius
+        cos_h = 1.0 / np.sqrt(1.0 + self.tan_half_h**2)
+        cos_v = 1.0 / np.sqrt(1.0 + self.tan_half_v**2)
+        return ((z > -radii) & (z - radii <= self.max_range)
+                & ((np.abs(x) - z * self.tan_half_h) * cos_h <= radii)
+                & ((np.abs(y) - z * self.tan_half_v) * cos_v <= radii))
+
+    def project(self, camera_points: np.ndarray) -> np.ndarray:
+        """Camera-frame points (K, 3) with z > 0 to (u, v) pixel coordinates"""
+        width, height = self.resolution
+        inverse_depth = 1.0 / camera_points[:, 2]
+        u = width / 2.0 + self.focal_length * camera_points[:, 0] * inverse_depth
+        v = height / 2.0 - self.focal_length * camera_points[:, 1] * inverse_depth
+        return np.column_stack([u, v])
+
+    def observe(self,
+                position: Sequence[float],
+                orientation: Sequence[float],
+                obstacles: List[Dict[str, Any]],
+                target_position: Optional[Sequence[float]] = None) -> CameraView:
+        """Cull, occlusion-test and project the obstacles (and target) seen from a pose"""
+        origin = np.asarray(position, dtype=float)
+        axes = self.camera_axes(orientation)
+        grid = self._index_for(obstacles)
+
+        # Spatial prefilter, then exact frustum test on the survivors
+        candidates = grid.query_box(*self._frustum_bounds(origin, axes))
+        centers = grid.centers[candidates]
+        radii = grid.radii[candidates]
+        camera_points = (centers - origin) @ axes.T
+        in_view = self._in_frustum(camera_points, radii)
+        candidates, centers, radii, camera_points = (
+            candidates[in_view], centers[in_view], radii[in_view], camera_points[in_view])
+
+        offsets = centers - origin
+        distances = np.linalg.norm(offsets, axis=1)
+        visible = distances <= self.max_range
+
+        # Occlusion: a ray to each center must not enter another sphere before its own surface.
+        # Only the frustum survivors can occlude, since anything in the way is also in view.
+        if np.count_nonzero(visible) and len(candidates) > 1:
+            rays = np.flatnonzero(visible)
+            directions = offsets[rays] / np.maximum(distances[rays], 1e-9)[:, np.newaxis]
+            first_hit = ray_sphere_ranges(origin, directions, centers, radii, self.max_range)
+            own_surface = distances[rays] - radii[rays]
+            visible[rays] = (own_surface <= 0) | (first_hit >= own_surface - 1e-3 - 1e-4 * distances[rays])
+
+        # Objects behind the image plane (camera inside or beside them) have no pixel
+        in_front = camera_points[:, 2] > 1e-6
+        pixels = np.full((len(candidates), 2), np.nan)
+        pixels[in_front] = self.project(camera_points[in_front])
+
+        target_visible = False
+        target_pixel = None
+        target_distance = None
+        if target_position is not None:
+            target_offset = np.asarray(target_position, dtype=float) - origin
+            target_distance = float(np.linalg.norm(target_offset))
+            target_camera = axes @ target_offset
+            in_view = (target_camera[2] > 1e-6 and target_distance <= self.max_range
+                       and abs(target_camera[0]) <= target_camera[2] * self.tan_half_h
+                       and abs(target_camera[1]) <= target_camera[2] * self.tan_half_v)
+            if in_view:
+                occluder_range = float(ray_sphere_ranges(
+                    origin, (target_offset / target_distance)[np.newaxis, :],
+                    centers, radii, self.max_range)[0])
+                target_visible = occluder_range >= target_distance
+                if target_visible:
+                    u, v = self.project(target_camera[np.newaxis, :])[0]
+                    target_pixel = (float(u), float(v))
+
+        return CameraView(
+            indices=candidates[visible],
+            positions=centers[visible],
+            pixels=pixels[visible],
+            distances=distances[visible],
+            target_visible=target_visible,
+            target_pixel=target_pixel,
+            target_distance=target_distance
+        )
+
+    def observe_batch(self,
+                      positions: np.ndarray,
+                      orientations: np.ndarray,
+                      centers: np.ndarray,
+                      radii: np.ndarray,
+                      target_positions: Optional[np.ndarray] = None,
+                      max_pairs: int = 4_000_000) -> BatchCameraView:
+        """observe() for N poses at once against obstacle spheres (centers, radii)
+
+        Applies the same frustum, range and occlusion rules as observe(),
+        without the spatial index. The occlusion test is (pose, ray,
+        sphere), so poses are processed in chunks that keep it below
+        max_pairs elements.
+        """
+        origins = np.asarray(positions, dtype=float)
+        axes = self.camera_axes(orientations)
+        count = len(origins)
+
+        offsets = centers[np.newaxis, :, :] - origins[:, np.newaxis, :]
+        camera_points = np.einsum('nmd,nkd->nmk', offsets, axes)
+        distances = np.linalg.norm(offsets, axis=-1)
+        in_view = self._in_frustum(camera_points, radii)
+        visible = in_view & (distances <= self.max_range)
+
+        # Occlusion as in observe(): only spheres in view can block the ray to a center
+        if len(centers) > 1:
+            chunk = max(1, max_pairs // len(centers) ** 2)
+            for start in range(0, count, chunk):
+                block = slice(start, start + chunk)
+                block_offsets, block_distances = offsets[block], distances[block]
+                directions = block_offsets / np.maximum(block_distances, 1e-9)[..., np.newaxis]
+                first_hit = self._first_entry(directions, block_offsets, block_distances,
+                                              radii, in_view[block])
+                own_surface = block_distances - radii
+                visible[block] &= ((own_surface <= 0)
+                                   | (first_hit >= own_surface - 1e-3 - 1e-4 * block_distances))
+
+        in_front = camera_points[..., 2] > 1e-6
+        pixels = np.full(camera_points.shape[:2] + (2,), np.nan)
+        pixels[in_front] = self.project(camera_points[in_front])
+
+        target_visible = np.zeros(count, dtype=bool)
+        target_pixels = np.full((count, 2), np.nan)
+        target_distances = np.full(count, np.nan)
+        if target_positions is not None:
+            target_offsets = np.asarray(target_positions, dtype=float) - origins
+            target_distances = np.linalg.norm(target_offsets, axis=1)
+            target_camera = np.einsum('nkd,nd->nk', axes, target_offsets)
+            x, y, z = target_camera[:, 0], target_camera[:, 1], target_camera[:, 2]
+            target_visible = ((z > 1e-6) & (target_distances <= self.max_range)
+                              & (np.abs(x) <= z * self.tan_half_h) & (np.abs(y) <= z * self.tan_half_v))
+            if len(centers):
+                directions = target_offsets / np.maximum(target_distances, 1e-9)[:, np.newaxis]
+                occluder_range = self._first_entry(directions[:, np.newaxis, :], offsets, distances,
+                                                   radii, in_view)[:, 0]
+                target_visible &= occluder_range >= target_distances
+            target_pixels[target_visible] = self.project(target_camera[target_visible])
+
+        return BatchCameraView(
+            visible=visible,
+            pixels=pixels,
+            distances=distances,
+            target_visible=target_visible,
+            target_pixels=target_pixels,
+            target_distances=target_distances
+        )
+
+    def _first_entry(self,
+                     directions: np.ndarray,
+                     offsets: np.ndarray,
+                     distances: np.ndarray,
+                     radii: np.ndarray,
+                     occluders: np.ndarray) -> np.ndarray:
+        """(N, K) distance along rays (N, K, 3) to the first occluder sphere, max_range on a miss
+
+        offsets/distances (N, M, 3)/(N, M) locate the spheres from each
+        pose; occluders (N, M) masks which spheres count.
+        """
+        projection = np.einsum('nkd,nmd->nkm', directions, offsets)
+        half_chord_sq = projection * projection + (radii ** 2 - distances ** 2)[:, np.newaxis, :]
+        entry = projection - np.sqrt(np.maximum(half_chord_sq, 0.0))
+        hits = (half_chord_sq >= 0) & (projection > 0) & (entry > 0) & occluders[:, np.newaxis, :]
+        return np.where(hits, entry, self.max_range).min(axis=-1, initial=self.max_range)
@@ -0,0 +1,66 @@
+"""
+Sensor Noise Streams
+Block-buffered random draws from dedicated, seedable NumPy Generators
+"""
+
+import zlib
+import numpy as np
+from typing import Optional, Union
+
+
+class NoiseStream:
+    """Per-sensor noise source backed by pre-generated blocks
+
+    Draws come from a private np.random.Generator, so each sensor's noise is
+    reproducible from its seed and independent of every other sensor and of
+    the global NumPy RNG. Standard normals and uniforms are generated a block
+    at a time and handed out by advancing an index, which avoids the
+    per-call overhead of many tiny np.random calls.
+    """
+
+    def __init__(self, seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                 block_size: int = 4096):
+        self.block_size = block_size
+        self.generator = np.random.default_rng(seed)
+        self._normals = self.generator.standard_normal(block_size)
+        self._normal_index = 0
+        self._uniforms = self.generator.random(block_size)
+        self._uniform_index = 0
+
+    @classmethod
+    def for_sensor(cls, sensor: str, seed: Optional[int] = None,
+                   block_size: int = 4096) -> "NoiseStream":
+        """Stream for a named sensor; the same (seed, sensor) always gives the same draws"""
+        if seed is None:
+            return cls(None, block_size)
+        return cls(np.random.SeedSequence([seed, zlib.crc32(sensor.encode())]), block_size)
+
+    def normal(self, std: float = 1.0, size: Optional[int] = None) -> Union[float, np.ndarray]:
+        """Zero-mean Gaussian draw(s) with standard deviation std"""
+        count = 1 if size is None else size
+        if self._normal_index + count > len(self._normals):
+            remaining = self._normals[self._normal_index:]
+            fresh = self.generator.standard_normal(max(self.block_size, count))
+            self._normals = np.concatenate([remaining, fresh])
+            self._normal_index = 0
+
+        start = self._normal_index
+        self._normal_index += count
+        if size is None:
+            return float(self._normals[start]) * std
+        return self._normals[start:start + count] * std
+
+    def uniform(self, size: Optional[int] = None) -> Union[float, np.ndarray]:
+        """Draw(s) from [0, 1)"""
+        count = 1 if size is None else size
+        if self._uniform_index + count > len(self._uniforms):
+            remaining = self._uniforms[self._uniform_index:]
+            fresh = self.generator.random(max(self.block_size, count))
+            self._uniforms = np.concatenate([remaining, fresh])
+            self._uniform_index = 0
+
+        start = self._uniform_index
+        self._uniform_index += count
+        if size is None:
+            return float(self._uniforms[start])
+        return self._uniforms[start:start + count]
@@ -0,0 +1,100 @@
+"""
+Ray Casting Helpers
+Batched ray intersection routines shared by the simulated range sensors
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+
+def obstacle_arrays(obstacles: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Obstacle dicts to (centers, radii) arrays, using the largest size as radius"""
+    if not obstacles:
+        return np.zeros((0, 3)), np.zeros(0)
+    
+    centers = np.array([obstacle.get("position", [0, 0, 0]) for obstacle in obstacles], dtype=float)
+    radii = np.array([max(obstacle.get("size", [1, 1, 1])) for obstacle in obstacles], dtype=float)
+    return centers, radii
+
+
+def ray_sphere_ranges(origin: np.ndarray,
+                      directions: np.ndarray,
+                      centers: np.ndarray,
+                      radii: np.ndarray,
+                      max_range: float) -> np.ndarray:
+    """Distance along each unit ray to the nearest sphere entry point
+    
+    Tests every (ray, sphere) pair at once in float32, then solves the
+    entry distance only for the pairs that actually hit. Rays that hit
+    nothing in front of the origin return max_range.
+    """
+    ranges = np.full(len(directions), float(max_range), dtype=np.float32)
+    if len(centers) == 0:
+        return ranges.astype(float)
+    
+    to_centers = (centers - np.asarray(origin, dtype=float)).astype(np.float32)
+    center_dist_sq = np.einsum('ij,ij->i', to_centers, to_centers)   # (spheres,)
+    projection = directions.astype(np.float32) @ to_centers.T        # (rays, spheres)
+    
+    # Squared half chord; negative means the ray misses the sphere
+    half_chord_sq = projection * projection
+    half_chord_sq += (radii**2).astype(np.float32) - center_dist_sq
+    rows, cols = np.nonzero((half_chord_sq >= 0) & (projection > 0))
+    
+    entry = projection[rows, cols] - np.sqrt(half_chord_sq[rows, cols])
+    in_front = entry > 0
+    np.minimum.at(ranges, rows[in_front], entry[in_front])
+    
+    return ranges.astype(float)
+
+
+def batched_ray_sphere_ranges(origins: np.ndarray,
+                              directions: np.ndarray,
+                              centers: np.ndarray,
+                              radii: np.ndarray,
+                              max_range: float,
+                              max_pairs: int = 4_000_000) -> np.ndarray:
+    """ray_sphere_ranges for many origins sharing one ray pattern -> (origins, rays)
+    
+    Origins are processed in chunks so the (origin, ray, sphere) working set
+    stays below max_pairs elements.
+    """
+    origins = np.asarray(origins, dtype=float)
+    num_rays = len(directions)
+    ranges = np.full((len(origins), num_rays), float(max_range), dtype=np.float32)
+    if len(centers) == 0 or len(origins) == 0:
+        return ranges.astype(float)
+    
+    directions32 = directions.astype(np.float32)
+    radii_sq = (radii**2).astype(np.float32)
+    chunk = max(1, max_pairs // (num_rays * len(centers)))
+    
+    for start in range(0, len(origins), chunk):
+        block = origins[start:start + chunk]
+        to_centers = (centers[np.newaxis, :, :] - block[:, np.newaxis, :]).astype(np.float32)
+        center_dist_sq = np.einsum('nmd,nmd->nm', to_centers, to_centers)
+        projection = np.einsum('kd,nmd->nkm', directions32, to_centers)
+        
+        half_chord_sq = projection * projection
+        half_chord_sq += radii_sq - center_dist_sq[:, np.newaxis, :]
+        n, k, m = np.nonzero((half_chord_sq >= 0) & (projection > 0))
+        
+        entry = projection[n, k, m] - np.sqrt(half_chord_sq[n, k, m])
+        in_front = entry > 0
+        flat = ranges[start:start + chunk].reshape(-1)
+        np.minimum.at(flat, n[in_front] * num_rays + k[in_front], entry[in_front])
+        ranges[start:start + chunk] = flat.reshape(len(block), num_rays)
+    
+    return ranges.astype(float)
+
+
+def ray_plane_ranges(origin: np.ndarray,
+                     directions: np.ndarray,
+                     ground_height: float,
+                     max_range: float) -> np.ndarray:
+    """Distance along each unit ray to a horizontal ground plane (y up)"""
+    height = float(origin[1]) - ground_height
+    down = directions[:, 1] < -1e-9
+    distances = np.full(len(directions), float(max_range))
+    distances[down] = height / -directions[down, 1]
+    return np.where(distances > 0, np.minimum(distances, max_range), max_range)
@@ -0,0 +1,148 @@
+"""
+Sensor Reading Types
+Slotted reading records and array-backed payloads for simulated sensors
+"""
+
+import numpy as np
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+
+
+# One LiDAR return. Fields the dict views expose stay float64 so legacy
+# consumers see the values exactly as computed.
+SCAN_POINT_DTYPE = np.dtype([
+    ("angle", np.float64),     # degrees
+    ("distance", np.float64),  # meters
+    ("valid", np.bool_)
+])
+
+# One camera detection (target or obstacle)
+DETECTION_DTYPE = np.dtype([
+    ("position", np.float64, (3,)),
+    ("size", np.float64, (3,)),
+    ("pixel", np.float64, (2,)),   # (u, v), NaN when behind the image plane
+    ("confidence", np.float64),
+    ("distance", np.float64),
+    ("type", np.int16)             # index into DETECTION_TYPES
+])
+
+# Detection type names by code; names seen for the first time are appended
+DETECTION_TYPES: List[str] = ["unknown", "target", "tree", "rock", "building"]
+_DETECTION_TYPE_CODES: Dict[str, int] = {name: code for code, name in enumerate(DETECTION_TYPES)}
+
+
+def detection_type_codes(names: Sequence) -> np.ndarray:
+    """DETECTION_DTYPE type codes for type names"""
+    codes = np.empty(len(names), dtype=np.int16)
+    for i, name in enumerate(names):
+        code = _DETECTION_TYPE_CODES.get(name)
+        if code is None:
+            code = _DETECTION_TYPE_CODES[name] = len(DETECTION_TYPES)
+            DETECTION_TYPES.append(name)
+        codes[i] = code
+    return codes
+
+
+@dataclass
+class SensorReading:
+    """Single sensor reading with metadata"""
+    __slots__ = ("timestamp", "sensor_type", "value", "confidence", "noise_level", "valid")
+    timestamp: float
+    sensor_type: str
+    value: Any
+    confidence: float  # 0.0 to 1.0
+    noise_level: float
+    valid: bool
+
+
+class LidarScan(Sequence):
+    """Array-backed LiDAR scan
+
+    Returns live in one SCAN_POINT_DTYPE structured array for vectorized
+    consumers; indexing or iterating yields the old {"angle", "distance",
+    "valid"} dicts.
+    """
+    __slots__ = ("points",)
+
+    def __init__(self, angles: np.ndarray, distances: np.ndarray, valid: np.ndarray):
+        self.points = np.empty(len(distances), dtype=SCAN_POINT_DTYPE)
+        self.points["angle"] = angles
+        self.points["distance"] = distances
+        self.points["valid"] = valid
+
+    @property
+    def angles(self) -> np.ndarray:
+        return self.points["angle"]
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self.points["distance"]
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.points["valid"]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        angle, distance, valid = self.points[index].item()
+        return {"angle": angle, "distance": distance, "valid": valid}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize the list-of-dicts view"""
+        return [self[i] for i in range(len(self))]
+
+
+def detection_dicts(detections: np.ndarray) -> List[Dict[str, Any]]:
+    """DETECTION_DTYPE records to the legacy list-of-dicts form"""
+    return [
+        {
+            "position": tuple(record["position"].tolist()),
+            "size": record["size"].tolist(),
+            "pixel": tuple(record["pixel"].tolist()),
+            "confidence": float(record["confidence"]),
+            "distance": float(record["distance"]),
+            "type": DETECTION_TYPES[record["type"]]
+        }
+        for record in detections
+    ]
+
+
+class CameraDetections(Mapping):
+    """Array-backed camera payload
+
+    targets and obstacles are DETECTION_DTYPE structured arrays. The mapping
+    interface keeps the old dict layout ("targets_detected",
+    "obstacles_detected", "image_quality"), materializing list-of-dicts only
+    when those keys are read.
+    """
+    __slots__ = ("targets", "obstacles", "image_quality")
+
+    _KEYS = ("targets_detected", "obstacles_detected", "image_quality")
+
+    def __init__(self,
+                 targets: Optional[np.ndarray] = None,
+                 obstacles: Optional[np.ndarray] = None,
+                 image_quality: float = 1.0):
+        self.targets = np.zeros(0, dtype=DETECTION_DTYPE) if targets is None else targets
+        self.obstacles = np.zeros(0, dtype=DETECTION_DTYPE) if obstacles is None else obstacles
+        self.image_quality = image_quality
+
+    def __getitem__(self, key: str):
+        if key == "targets_detected":
+            return detection_dicts(self.targets)
+        if key == "obstacles_detected":
+            return detection_dicts(self.obstacles)
+        if key == "image_quality":
+            return self.image_quality
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
@@ -0,0 +1,61 @@
+"""
+Multi-Rate Sensor Scheduler
+Decides which simulated sensors are due for a new reading at a given time
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+
+class SensorScheduler:
+    """Per-sensor release times derived from each sensor's update_rate
+
+    A sensor is due once its next release time has passed. Release times
+    advance by whole periods so the long-run rate matches the configured
+    rate; if the caller falls more than a period behind, the schedule
+    restarts from the current time instead of bursting to catch up. A rate
+    of 0 makes a sensor due on every call; sensors the scheduler was not
+    given a rate for are never due.
+    """
+
+    def __init__(self, update_rates: Dict[str, float], max_events: int = 1000):
+        self.periods = {
+            sensor: (1.0 / rate if rate > 0 else 0.0)
+            for sensor, rate in update_rates.items()
+        }
+        self.next_due: Dict[str, float] = {}
+        self.timeline: Deque[Tuple[float, str]] = deque(maxlen=max_events)
+        self.reading_counts: Dict[str, int] = {sensor: 0 for sensor in update_rates}
+
+    def is_due(self, sensor: str, now: float) -> bool:
+        """Check (and consume) whether sensor should produce a reading at time now"""
+        period = self.periods.get(sensor)
+        if period is None:
+            # Not configured: never due
+            return False
+
+        next_due = self.next_due.get(sensor)
+        # Small tolerance so float-accumulated sim clocks don't skip a slot
+        if next_due is not None and now < next_due - 1e-9:
+            return False
+
+        next_due = now + period if next_due is None else next_due + period
+        if next_due <= now:
+            next_due = now + period
+        self.next_due[sensor] = next_due
+
+        self.timeline.append((now, sensor))
+        self.reading_counts[sensor] = self.reading_counts.get(sensor, 0) + 1
+        return True
+
+    def get_timeline(self, sensor: str = None) -> List[Tuple[float, str]]:
+        """Recent (timestamp, sensor) reading events, optionally for one sensor"""
+        if sensor is None:
+            return list(self.timeline)
+        return [event for event in self.timeline if event[1] == sensor]
+
+    def reset(self):
+        """Make every sensor due immediately"""
+        self.next_due.clear()
+        self.timeline.clear()
+        self.reading_counts = {sensor: 0 for sensor in self.periods}
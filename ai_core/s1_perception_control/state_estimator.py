@@ -0,0 +1,315 @@
+"""
+State Estimator for System 1 (S1)
+Error-state EKF fusing asynchronous GPS, IMU and altimeter readings
+"""
+
+import numpy as np
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ai_core.interface.sim_interface import DroneState
+
+
+class ErrorStateEKF:
+    """Multi-rate error-state Kalman filter for drone position and velocity
+
+    The nominal state (position, velocity, accelerometer bias, altimeter
+    bias) is propagated with the accelerometer at IMU rate; the filter
+    tracks the covariance of the 10-dimensional error state and folds GPS
+    and altimeter corrections back into the nominal state as they arrive.
+    Accelerometer readings are taken as world-frame linear acceleration;
+    attitude is not estimated and is passed through from the reference state.
+
+    All matrices are allocated once; predict and update write into them in
+    place so a steady-state step performs no array allocation beyond the
+    tiny measurement-sized temporaries.
+    """
+
+    STATE_SIZE = 10
+    POS = slice(0, 3)
+    VEL = slice(3, 6)
+    ACCEL_BIAS = slice(6, 9)
+    ALT_BIAS = 9
+
+    def __init__(self,
+                 accel_noise_std: float = 0.1,
+                 accel_bias_walk_std: float = 0.001,
+                 altimeter_bias_walk_std: float = 0.01,
+                 gps_noise_std: float = 0.5,
+                 altimeter_noise_std: float = 0.1,
+                 gps_gate: float = 16.27,
+                 terrain: Any = None):
+        n = self.STATE_SIZE
+
+        # Nominal state
+        self.position = np.zeros(3)
+        self.velocity = np.zeros(3)
+        self.accel_bias = np.zeros(3)
+        self.altimeter_bias = 0.0
+        self.acceleration = np.zeros(3)
+        self.angular_velocity = np.zeros(3)
+
+        # Error-state covariance and process model
+        self.P = np.eye(n)
+        self.P[self.POS, self.POS] *= 100.0
+        self.P[self.VEL, self.VEL] *= 10.0
+        self.P[self.ACCEL_BIAS, self.ACCEL_BIAS] *= 0.1
+        self.P[self.ALT_BIAS, self.ALT_BIAS] = 1.0
+        self.F = np.eye(n)
+        self.Q_rate = np.zeros((n, n))
+        self.Q_rate[self.VEL, self.VEL] = np.eye(3) * accel_noise_std**2
+        self.Q_rate[self.ACCEL_BIAS, self.ACCEL_BIAS] = np.eye(3) * accel_bias_walk_std**2
+        self.Q_rate[self.ALT_BIAS, self.ALT_BIAS] = altimeter_bias_walk_std**2
+
+        # GPS observes position; the altimeter observes height (y) plus its bias
+        self.H_gps = np.zeros((3, n))
+        self.H_gps[:, self.POS] = np.eye(3)
+        self.R_gps = np.eye(3) * gps_noise_std**2
+        self.H_alt = np.zeros((1, n))
+        self.H_alt[0, 1] = 1.0
+        self.H_alt[0, self.ALT_BIAS] = 1.0
+        self.R_alt = np.array([[altimeter_noise_std**2]])
+        # Chi-square gate on GPS innovations (3 dof, 99.9%)
+        self.gps_gate = gps_gate
+        # With a terrain heightfield the altimeter measures height above ground
+        self.terrain = terrain
+
+        # Scratch buffers reused by every step
+        self._I = np.eye(n)
+        self._FP = np.empty((n, n))
+        self._PHt = {3: np.empty((n, 3)), 1: np.empty((n, 1))}
+        self._KH = np.empty((n, n))
+        self._IKH = np.empty((n, n))
+        self._P_next = np.empty((n, n))
+        self._dx = np.empty(n)
+
+        self.time: Optional[float] = None
+        self.last_imu_time: Optional[float] = None
+        self.initialized = False
+        self.counts = {"predict": 0, "gps": 0, "altimeter": 0, "rejected": 0}
+
+    @classmethod
+    def from_sensor_config(cls, config: Dict[str, Any], terrain: Any = None) -> "ErrorStateEKF":
+        """Noise parameters from a BasicSensorModel config"""
+        imu = config.get("imu", {})
+        return cls(
+            accel_noise_std=imu.get("accel_noise_std", 0.1),
+            gps_noise_std=config.get("gps", {}).get("noise_std", 0.5),
+            altimeter_noise_std=config.get("altimeter", {}).get("noise_std", 0.1),
+            terrain=terrain
+        )
+
+    def initialize(self,
+                   position: Tuple[float, float, float],
+                   velocity: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                   timestamp: float = 0.0):
+        """Set the nominal state, e.g. from the first GPS fix"""
+        self.position[:] = position
+        self.velocity[:] = velocity
+        self.time = timestamp
+        self.initialized = True
+
+    def predict(self, dt: float):
+        """Propagate nominal state and error covariance by dt using the held acceleration"""
+        if dt <= 0.0:
+            return
+
+        accel = self.acceleration - self.accel_bias
+        self.position += self.velocity * dt + 0.5 * dt * dt * accel
+        self.velocity += accel * dt
+
+        # Only the dt-dependent blocks of F change
+        F = self.F
+        for i in range(3):
+            F[i, 3 + i] = dt
+            F[i, 6 + i] = -0.5 * dt * dt
+            F[3 + i, 6 + i] = -dt
+
+        np.matmul(F, self.P, out=self._FP)
+        np.matmul(self._FP, F.T, out=self.P)
+        self.P += self.Q_rate * dt
+        self.counts["predict"] += 1
+
+    def predict_to(self, timestamp: float):
+        """Propagate up to timestamp"""
+        if self.time is not None:
+            self.predict(timestamp - self.time)
+        self.time = timestamp if self.time is None else max(self.time, timestamp)
+
+    def _correct(self, innovation: np.ndarray, H: np.ndarray, R: np.ndarray, gate: Optional[float] = None) -> bool:
+        """Kalman update in place; returns False if the innovation was gated out"""
+        PHt = self._PHt[len(innovation)]
+        np.matmul(self.P, H.T, out=PHt)
+        S = H @ PHt + R
+        S_inv = np.linalg.inv(S)
+
+        if gate is not None and float(innovation @ S_inv @ innovation) > gate:
+            self.counts["rejected"] += 1
+            return False
+
+        K = PHt @ S_inv
+        np.matmul(K, innovation, out=self._dx)
+
+        # Joseph form keeps P symmetric positive definite
+        np.matmul(K, H, out=self._KH)
+        np.subtract(self._I, self._KH, out=self._IKH)
+        np.matmul(self._IKH, self.P, out=self._FP)
+        np.matmul(self._FP, self._IKH.T, out=self._P_next)
+        self._P_next += K @ R @ K.T
+        self.P[:] = self._P_next
+
+        # Inject error into nominal state (error state resets to zero)
+        dx = self._dx
+        self.position += dx[self.POS]
+        self.velocity += dx[self.VEL]
+        self.accel_bias += dx[self.ACCEL_BIAS]
+        self.altimeter_bias += dx[self.ALT_BIAS]
+        return True
+
+    def update_gps(self, position: Tuple[float, float, float], timestamp: float) -> bool:
+        """Fuse a GPS position fix taken at timestamp"""
+        if not self.initialized:
+            self.initialize(position, timestamp=timestamp)
+            return True
+
+        self.predict_to(timestamp)
+        accepted = self._correct(np.asarray(position, dtype=float) - self.position,
+                                 self.H_gps, self.R_gps, self.gps_gate)
+        if accepted:
+            self.counts["gps"] += 1
+        return accepted
+
+    def update_altimeter(self, altitude: float, timestamp: float) -> bool:
+        """Fuse a barometric altitude taken at timestamp"""
+        if not self.initialized:
+            return False
+
+        self.predict_to(timestamp)
+        predicted = self.position[1] + self.altimeter_bias
+        if self.terrain is not None:
+            # Linearize the ground height around the current horizontal position
+            x, z = self.position[0], self.position[2]
+            step = 0.5 * self.terrain.resolution
+            predicted -= self.terrain.height_at(x, z)
+            self.H_alt[0, 0] = -(self.terrain.height_at(x + step, z) - self.terrain.height_at(x - step, z)) / (2 * step)
+            self.H_alt[0, 2] = -(self.terrain.height_at(x, z + step) - self.terrain.height_at(x, z - step)) / (2 * step)
+        innovation = np.array([altitude - predicted])
+        self._correct(innovation, self.H_alt, self.R_alt)
+        self.counts["altimeter"] += 1
+        return True
+
+    def update_imu(self,
+                   acceleration: Optional[Tuple[float, float, float]],
+                   angular_velocity: Optional[Tuple[float, float, float]],
+                   timestamp: float):
+        """Propagate to timestamp, then hold the new IMU sample for the next interval"""
+        if self.initialized:
+            self.predict_to(timestamp)
+        else:
+            self.time = timestamp
+        if acceleration is not None:
+            self.acceleration[:] = acceleration
+        if angular_velocity is not None:
+            self.angular_velocity[:] = angular_velocity
+        self.last_imu_time = timestamp
+
+    def ingest(self, readings: Dict[str, Any], timestamp: float, keys: Optional[Iterable[str]] = None):
+        """Fuse BasicSensorModel readings taken at timestamp
+
+        keys limits fusion to the readings that are actually new, e.g.
+        BasicSensorModel.last_updated after a scheduled simulate_sensor_suite
+        call; by default every valid reading is fused. The IMU is processed
+        first so corrections apply to a state propagated to timestamp.
+        """
+        keys = set(readings if keys is None else keys)
+
+        def fresh(key: str):
+            reading = readings.get(key)
+            if key in keys and reading is not None and reading.valid:
+                return reading.value
+            return None
+
+        accel = fresh("accelerometer")
+        gyro = fresh("gyroscope")
+        if accel is not None or gyro is not None:
+            self.update_imu(accel, gyro, timestamp)
+
+        gps = fresh("gps")
+        if gps is not None:
+            self.update_gps(gps, timestamp)
+
+        altitude = fresh("altimeter")
+        if altitude is not None:
+            self.update_altimeter(altitude, timestamp)
+
+    def drone_state(self, reference: DroneState) -> DroneState:
+        """DroneState with fused position/velocity; the rest copied from reference"""
+        return DroneState(
+            position=tuple(self.position.tolist()),
+            velocity=tuple(self.velocity.tolist()),
+            orientation=reference.orientation,
+            battery_level=reference.battery_level,
+            is_armed=reference.is_armed
+        )
+
+    @property
+    def position_std(self) -> np.ndarray:
+        """1-sigma position uncertainty per axis"""
+        return np.sqrt(np.diag(self.P)[self.POS])
+
+
+def benchmark_state_estimator(duration_s: float = 10.0, seed: int = 0) -> Dict[str, float]:
+    """Run the EKF on a scheduled BasicSensorModel stream and report throughput
+
+    The drone flies a circle on a simulated 200 Hz clock; readings arrive at
+    each sensor's configured update rate. Reports per-step filter time
+    (fusion only, sensor simulation excluded), achievable update rate and
+    position error against truth versus raw GPS.
+    """
+    from .sensor_models.basic_model import BasicSensorModel
+
+    sensors = BasicSensorModel(seed=seed)
+    ekf = ErrorStateEKF.from_sensor_config(sensors.config)
+    dt = 1.0 / 200.0
+    radius, omega = 20.0, 0.3
+
+    step_times = []
+    fused_errors = []
+    gps_errors = []
+    for step in range(int(duration_s / dt)):
+        t = step * dt
+        angle = omega * t
+        position = np.array([radius * np.cos(angle), 10.0 + np.sin(t), radius * np.sin(angle)])
+        velocity = np.array([-radius * omega * np.sin(angle), np.cos(t), radius * omega * np.cos(angle)])
+        acceleration = np.array([-radius * omega**2 * np.cos(angle), -np.sin(t),
+                                 -radius * omega**2 * np.sin(angle)])
+
+        readings = sensors.simulate_sensor_suite({
+            "position": tuple(position),
+            "acceleration": tuple(acceleration),
+            "angular_velocity": (0.0, 0.0, omega),
+            "altitude": position[1]
+        }, timestamp=t)
+
+        start = time.perf_counter()
+        ekf.ingest(readings, t, sensors.last_updated)
+        step_times.append(time.perf_counter() - start)
+
+        if t > 1.0:
+            fused_errors.append(np.linalg.norm(ekf.position - position))
+            if "gps" in sensors.last_updated and readings["gps"].valid:
+                gps_errors.append(np.linalg.norm(np.array(readings["gps"].value) - position))
+
+    step_us = np.array(step_times) * 1e6
+    return {
+        "mean_step_us": float(step_us.mean()),
+        "p99_step_us": float(np.percentile(step_us, 99)),
+        "max_rate_hz": float(1e6 / step_us.mean()),
+        "fused_rmse_m": float(np.sqrt(np.mean(np.square(fused_errors)))),
+        "gps_rmse_m": float(np.sqrt(np.mean(np.square(gps_errors))))
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark_state_estimator().items():
+        print(f"{key}: {value:.3f}")
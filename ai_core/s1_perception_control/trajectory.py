@@ -0,0 +1,97 @@
+"""
+Trajectory Generation for System 1 (S1)
+Minimum-jerk reference trajectories computed once per S2 command and sampled each tick
+"""
+
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+
+class MinimumJerkTrajectory:
+    """Quintic minimum-jerk trajectory between two 3D states
+
+    Coefficients are solved once in the constructor; sampling is a fixed
+    number of multiply-adds per axis regardless of how long the trajectory
+    runs. Past the end time the reference continues at the end velocity.
+    """
+
+    def __init__(self,
+                 start_position: Sequence[float],
+                 end_position: Sequence[float],
+                 duration: float,
+                 start_velocity: Optional[Sequence[float]] = None,
+                 end_velocity: Optional[Sequence[float]] = None,
+                 start_acceleration: Optional[Sequence[float]] = None):
+        self.duration = max(float(duration), 1e-3)
+
+        p0 = np.asarray(start_position, dtype=float)
+        p1 = np.asarray(end_position, dtype=float)
+        v0 = np.zeros(3) if start_velocity is None else np.asarray(start_velocity, dtype=float)
+        v1 = np.zeros(3) if end_velocity is None else np.asarray(end_velocity, dtype=float)
+        a0 = np.zeros(3) if start_acceleration is None else np.asarray(start_acceleration, dtype=float)
+
+        T = self.duration
+        dp = p1 - p0
+
+        # Boundary conditions: p, v, a at t=0 and p, v at t=T with zero end acceleration
+        c3 = (20 * dp - (8 * v1 + 12 * v0) * T - 3 * a0 * T**2) / (2 * T**3)
+        c4 = (-30 * dp + (14 * v1 + 16 * v0) * T + 3 * a0 * T**2) / (2 * T**4)
+        c5 = (12 * dp - 6 * (v1 + v0) * T - a0 * T**2) / (2 * T**5)
+
+        # Rows are axes, columns are c0..c5
+        self.coefficients = np.stack([p0, v0, a0 / 2, c3, c4, c5], axis=1)
+        self.end_position = p1
+        self.end_velocity = v1
+
+        # Plain float copies for allocation-free scalar sampling
+        self._coeffs = tuple(tuple(float(c) for c in row) for row in self.coefficients)
+        self._end_position = tuple(float(x) for x in p1)
+        self._end_velocity = tuple(float(x) for x in v1)
+
+    @classmethod
+    def from_distance(cls,
+                      start_position: Sequence[float],
+                      end_position: Sequence[float],
+                      cruise_speed: float,
+                      min_duration: float = 0.5,
+                      **kwargs) -> "MinimumJerkTrajectory":
+        """Build a trajectory whose duration follows from distance and cruise speed"""
+        distance = float(np.linalg.norm(np.asarray(end_position, dtype=float) -
+                                        np.asarray(start_position, dtype=float)))
+        # A minimum-jerk profile peaks at 1.875x its average speed
+        duration = max(min_duration, 1.875 * distance / max(cruise_speed, 1e-3))
+        return cls(start_position, end_position, duration, **kwargs)
+
+    def sample(self, t: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reference position, velocity and acceleration at time t since start"""
+        if t >= self.duration:
+            dt = t - self.duration
+            return (self.end_position + self.end_velocity * dt,
+                    self.end_velocity.copy(),
+                    np.zeros(3))
+
+        t = max(t, 0.0)
+        c = self.coefficients
+        position = ((((c[:, 5] * t + c[:, 4]) * t + c[:, 3]) * t + c[:, 2]) * t + c[:, 1]) * t + c[:, 0]
+        velocity = (((5 * c[:, 5] * t + 4 * c[:, 4]) * t + 3 * c[:, 3]) * t + 2 * c[:, 2]) * t + c[:, 1]
+        acceleration = ((20 * c[:, 5] * t + 12 * c[:, 4]) * t + 6 * c[:, 3]) * t + 2 * c[:, 2]
+
+        return position, velocity, acceleration
+
+    def sample_into(self, t: float,
+                    position_out: np.ndarray,
+                    velocity_out: np.ndarray):
+        """Scalar sampling into preallocated buffers (no array allocation)"""
+        if t >= self.duration:
+            dt = t - self.duration
+            for axis in range(3):
+                position_out[axis] = self._end_position[axis] + self._end_velocity[axis] * dt
+                velocity_out[axis] = self._end_velocity[axis]
+            return
+
+        if t < 0.0:
+            t = 0.0
+        for axis in range(3):
+            c0, c1, c2, c3, c4, c5 = self._coeffs[axis]
+            position_out[axis] = ((((c5 * t + c4) * t + c3) * t + c2) * t + c1) * t + c0
+            velocity_out[axis] = (((5 * c5 * t + 4 * c4) * t + 3 * c3) * t + 2 * c2) * t + c1
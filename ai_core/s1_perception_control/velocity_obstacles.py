@@ -0,0 +1,309 @@
+"""
+Velocity-Obstacle Avoidance for System 1 (S1)
+ORCA-style reciprocal collision avoidance computed over arrays of neighbours
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+
+@dataclass
+class ORCAResult:
+    """Collision-free velocities for one or more agents"""
+    velocities: np.ndarray     # (A, 3) chosen velocities
+    feasible: np.ndarray       # (A,) True if all ORCA constraints are satisfied
+    max_violation: np.ndarray  # (A,) worst constraint violation (m/s), 0 when feasible
+    neighbor_counts: np.ndarray  # (A,) constraints considered per agent
+
+
+class ORCAAvoidance:
+    """Optimal reciprocal collision avoidance in 3D
+
+    Each neighbour (static obstacle sphere or moving agent) contributes one
+    ORCA half-space in velocity space, built with the RVO2-3D construction
+    for all neighbours at once. The new velocity is picked from a candidate
+    set (the preferred velocity, its projection onto every constraint plane
+    and a fixed sphere of sampled velocities) scored in a single batched
+    pass: the feasible candidate closest to the preferred velocity wins, and
+    if none is feasible the one with the smallest worst-case violation.
+    Everything is batched over agents, so a swarm is solved in one call.
+
+    A preferred velocity aimed straight at a neighbour is the symmetric
+    case where ORCA only ever slows down (two agents head-on, or a goal
+    right behind an obstacle), so it is tilted sideways by symmetry_bias
+    of its speed, keeping right in the horizontal plane.
+    """
+
+    def __init__(self,
+                 time_horizon: float = 2.0,
+                 obstacle_time_horizon: float = 1.0,
+                 neighbor_distance: float = 20.0,
+                 max_neighbors: int = 64,
+                 max_speed: float = 15.0,
+                 agent_radius: float = 1.0,
+                 time_step: float = 0.05,
+                 candidate_directions: int = 96,
+                 candidate_speeds: int = 4,
+                 symmetry_bias: float = 0.1):
+        self.time_horizon = time_horizon
+        self.obstacle_time_horizon = obstacle_time_horizon
+        self.neighbor_distance = neighbor_distance
+        self.max_neighbors = max_neighbors
+        self.max_speed = max_speed
+        self.agent_radius = agent_radius
+        self.time_step = time_step
+        self.symmetry_bias = symmetry_bias
+
+        # Fixed candidate velocities: Fibonacci sphere directions x speed shells
+        i = np.arange(candidate_directions) + 0.5
+        polar = np.arccos(1.0 - 2.0 * i / candidate_directions)
+        azimuth = np.pi * (1.0 + 5**0.5) * i
+        directions = np.column_stack([
+            np.sin(polar) * np.cos(azimuth),
+            np.cos(polar),
+            np.sin(polar) * np.sin(azimuth)
+        ])
+        speeds = max_speed * np.arange(1, candidate_speeds + 1) / candidate_speeds
+        self.candidate_grid = np.concatenate([
+            np.zeros((1, 3)),
+            (directions[np.newaxis, :, :] * speeds[:, np.newaxis, np.newaxis]).reshape(-1, 3)
+        ])
+
+    @staticmethod
+    def obstacles_from_perception(obstacles: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Convert perception obstacle dicts to (positions, radii, velocities) arrays"""
+        if not obstacles:
+            return np.zeros((0, 3)), np.zeros(0), np.zeros((0, 3))
+
+        positions = np.array([obstacle.get("position", [0, 0, 0]) for obstacle in obstacles], dtype=float)
+        radii = np.array([max(obstacle.get("size", [1, 1, 1])) for obstacle in obstacles], dtype=float)
+        velocities = np.array([obstacle.get("velocity", [0, 0, 0]) for obstacle in obstacles], dtype=float)
+        return positions, radii, velocities
+
+    def compute_velocity(self,
+                         position: np.ndarray,
+                         velocity: np.ndarray,
+                         preferred_velocity: np.ndarray,
+                         obstacle_positions: np.ndarray,
+                         obstacle_radii: np.ndarray,
+                         obstacle_velocities: Optional[np.ndarray] = None,
+                         responsibility: Optional[np.ndarray] = None) -> ORCAResult:
+        """Collision-free velocity for a single drone
+
+        responsibility is the share of each avoidance the drone takes on:
+        1.0 (default) for static or non-cooperative neighbours, 0.5 for
+        agents that run ORCA themselves.
+        """
+        obstacle_positions = np.asarray(obstacle_positions, dtype=float).reshape(-1, 3)
+        if obstacle_velocities is None:
+            obstacle_velocities = np.zeros_like(obstacle_positions)
+        if responsibility is None:
+            responsibility = np.ones(len(obstacle_positions))
+
+        return self._solve(
+            np.asarray(position, dtype=float)[np.newaxis],
+            np.asarray(velocity, dtype=float)[np.newaxis],
+            np.asarray(preferred_velocity, dtype=float)[np.newaxis],
+            np.full(1, self.agent_radius),
+            obstacle_positions[np.newaxis],
+            np.asarray(obstacle_radii, dtype=float).reshape(1, -1),
+            np.asarray(obstacle_velocities, dtype=float).reshape(1, -1, 3),
+            np.asarray(responsibility, dtype=float).reshape(1, -1),
+            np.full((1, len(obstacle_positions)), self.obstacle_time_horizon)
+        )
+
+    def compute_swarm_velocities(self,
+                                 positions: np.ndarray,
+                                 velocities: np.ndarray,
+                                 preferred_velocities: np.ndarray,
+                                 radii: Optional[np.ndarray] = None,
+                                 obstacle_positions: Optional[np.ndarray] = None,
+                                 obstacle_radii: Optional[np.ndarray] = None) -> ORCAResult:
+        """Collision-free velocities for A cooperating agents plus shared static obstacles"""
+        positions = np.asarray(positions, dtype=float)
+        velocities = np.asarray(velocities, dtype=float)
+        num_agents = len(positions)
+        radii = np.full(num_agents, self.agent_radius) if radii is None else np.asarray(radii, dtype=float)
+
+        # Every other agent is a reciprocal neighbour (responsibility 0.5)
+        others = ~np.eye(num_agents, dtype=bool)
+        neighbor_index = np.broadcast_to(np.arange(num_agents), (num_agents, num_agents))[others]
+        neighbor_index = neighbor_index.reshape(num_agents, num_agents - 1)
+        n_pos = positions[neighbor_index]
+        n_vel = velocities[neighbor_index]
+        n_rad = radii[neighbor_index]
+        n_resp = np.full(n_rad.shape, 0.5)
+        n_tau = np.full(n_rad.shape, self.time_horizon)
+
+        if obstacle_positions is not None and len(obstacle_positions) > 0:
+            obstacle_positions = np.asarray(obstacle_positions, dtype=float)
+            obstacle_radii = np.asarray(obstacle_radii, dtype=float)
+            num_obstacles = len(obstacle_positions)
+            n_pos = np.concatenate([n_pos, np.broadcast_to(obstacle_positions, (num_agents, num_obstacles, 3))], axis=1)
+            n_vel = np.concatenate([n_vel, np.zeros((num_agents, num_obstacles, 3))], axis=1)
+            n_rad = np.concatenate([n_rad, np.broadcast_to(obstacle_radii, (num_agents, num_obstacles))], axis=1)
+            n_resp = np.concatenate([n_resp, np.ones((num_agents, num_obstacles))], axis=1)
+            n_tau = np.concatenate([n_tau, np.full((num_agents, num_obstacles), self.obstacle_time_horizon)], axis=1)
+
+        return self._solve(positions, velocities, np.asarray(preferred_velocities, dtype=float),
+                           radii, n_pos, n_rad, n_vel, n_resp, n_tau)
+
+    def _solve(self,
+               positions: np.ndarray,
+               velocities: np.ndarray,
+               preferred: np.ndarray,
+               radii: np.ndarray,
+               n_pos: np.ndarray,
+               n_rad: np.ndarray,
+               n_vel: np.ndarray,
+               n_resp: np.ndarray,
+               n_tau: np.ndarray) -> ORCAResult:
+        """Batched ORCA for A agents against (A, M) neighbour arrays"""
+        num_agents = len(positions)
+        preferred = self._limit_speed(preferred)
+
+        rel_pos = n_pos - positions[:, np.newaxis, :]
+        dist_sq = np.einsum('amd,amd->am', rel_pos, rel_pos)
+
+        # Keep only the nearest neighbours within range
+        in_range = dist_sq <= self.neighbor_distance ** 2
+        if rel_pos.shape[1] > self.max_neighbors:
+            nearest = np.argpartition(np.where(in_range, dist_sq, np.inf),
+                                      self.max_neighbors - 1, axis=1)[:, :self.max_neighbors]
+            rel_pos = np.take_along_axis(rel_pos, nearest[..., np.newaxis], axis=1)
+            n_vel = np.take_along_axis(n_vel, nearest[..., np.newaxis], axis=1)
+            dist_sq, in_range, n_rad, n_resp, n_tau = (
+                np.take_along_axis(arr, nearest, axis=1)
+                for arr in (dist_sq, in_range, n_rad, n_resp, n_tau)
+            )
+
+        if rel_pos.shape[1] == 0 or not in_range.any():
+            return ORCAResult(velocities=preferred, feasible=np.ones(num_agents, dtype=bool),
+                              max_violation=np.zeros(num_agents),
+                              neighbor_counts=np.zeros(num_agents, dtype=int))
+
+        preferred = self._break_symmetry(preferred, rel_pos, dist_sq, in_range)
+        normals, points = self._orca_planes(
+            rel_pos, dist_sq, velocities[:, np.newaxis, :] - n_vel,
+            radii[:, np.newaxis] + n_rad, n_tau, n_resp, velocities
+        )
+        offsets = np.einsum('amd,amd->am', normals, points)
+
+        # Candidates: preferred, preferred projected onto each plane, fixed grid
+        pref_dot = np.einsum('amd,ad->am', normals, preferred)
+        shortfall = np.maximum(offsets - pref_dot, 0.0)
+        projected = preferred[:, np.newaxis, :] + shortfall[..., np.newaxis] * normals
+        candidates = np.concatenate([
+            preferred[:, np.newaxis, :],
+            self._limit_speed(projected),
+            np.broadcast_to(self.candidate_grid, (num_agents,) + self.candidate_grid.shape)
+        ], axis=1)
+
+        # Violation of every constraint by every candidate: (A, C, M)
+        violation = offsets[:, np.newaxis, :] - np.einsum('acd,amd->acm', candidates, normals)
+        violation = np.where(in_range[:, np.newaxis, :], violation, -np.inf)
+        worst = np.maximum(violation.max(axis=2), 0.0)
+
+        deviation = np.sum((candidates - preferred[:, np.newaxis, :]) ** 2, axis=2)
+        feasible_candidates = worst <= 1e-6
+        any_feasible = feasible_candidates.any(axis=1)
+        score = np.where(any_feasible[:, np.newaxis],
+                         np.where(feasible_candidates, deviation, np.inf),
+                         worst)
+        best = np.argmin(score, axis=1)
+
+        rows = np.arange(num_agents)
+        return ORCAResult(
+            velocities=candidates[rows, best],
+            feasible=any_feasible,
+            max_violation=worst[rows, best],
+            neighbor_counts=in_range.sum(axis=1)
+        )
+
+    def _orca_planes(self,
+                     rel_pos: np.ndarray,
+                     dist_sq: np.ndarray,
+                     rel_vel: np.ndarray,
+                     combined_radius: np.ndarray,
+                     tau: np.ndarray,
+                     responsibility: np.ndarray,
+                     velocities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ORCA half-space (unit normal, point) per neighbour; feasible side is n.(v - p) >= 0"""
+        eps = 1e-9
+        r_sq = combined_radius ** 2
+        colliding = dist_sq <= r_sq
+
+        # Not colliding: vector from cut-off circle center to relative velocity
+        w = rel_vel - rel_pos / tau[..., np.newaxis]
+        w_len_sq = np.einsum('amd,amd->am', w, w)
+        dot = np.einsum('amd,amd->am', w, rel_pos)
+        use_cutoff = (dot < 0.0) & (dot ** 2 > r_sq * w_len_sq)
+
+        # Case 1: project on the cut-off sphere
+        w_len = np.sqrt(w_len_sq) + eps
+        cutoff_normal = w / w_len[..., np.newaxis]
+        cutoff_u = (combined_radius / tau - w_len)[..., np.newaxis] * cutoff_normal
+
+        # Case 2: project on the cone side (RVO2-3D construction)
+        a = dist_sq
+        b = np.einsum('amd,amd->am', rel_pos, rel_vel)
+        cross = np.cross(rel_pos, rel_vel)
+        c = (np.einsum('amd,amd->am', rel_vel, rel_vel) -
+             np.einsum('amd,amd->am', cross, cross) / np.maximum(dist_sq - r_sq, eps))
+        t = (b + np.sqrt(np.maximum(b * b - a * c, 0.0))) / np.maximum(a, eps)
+        ww = rel_vel - t[..., np.newaxis] * rel_pos
+        # Head-on relative velocity lies on the cone axis: push sideways, preferring horizontal
+        on_axis = np.einsum('amd,amd->am', ww, ww) < 1e-12
+        if on_axis.any():
+            side = np.cross(rel_pos, [0.0, 1.0, 0.0])
+            vertical = np.einsum('amd,amd->am', side, side) < 1e-12
+            side = np.where(vertical[..., np.newaxis], np.cross(rel_pos, [1.0, 0.0, 0.0]), side)
+            side /= np.sqrt(np.einsum('amd,amd->am', side, side))[..., np.newaxis] + eps
+            ww = np.where(on_axis[..., np.newaxis], -eps * side, ww)
+        ww_len = np.sqrt(np.einsum('amd,amd->am', ww, ww)) + eps
+        cone_normal = ww / ww_len[..., np.newaxis]
+        cone_u = (combined_radius * t - ww_len)[..., np.newaxis] * cone_normal
+
+        # Already colliding: resolve within one time step
+        wc = rel_vel - rel_pos / self.time_step
+        wc_len = np.sqrt(np.einsum('amd,amd->am', wc, wc)) + eps
+        collide_normal = wc / wc_len[..., np.newaxis]
+        collide_u = (combined_radius / self.time_step - wc_len)[..., np.newaxis] * collide_normal
+
+        normal = np.where(use_cutoff[..., np.newaxis], cutoff_normal, cone_normal)
+        u = np.where(use_cutoff[..., np.newaxis], cutoff_u, cone_u)
+        normal = np.where(colliding[..., np.newaxis], collide_normal, normal)
+        u = np.where(colliding[..., np.newaxis], collide_u, u)
+
+        points = velocities[:, np.newaxis, :] + responsibility[..., np.newaxis] * u
+        return normal, points
+
+    def _break_symmetry(self,
+                        preferred: np.ndarray,
+                        rel_pos: np.ndarray,
+                        dist_sq: np.ndarray,
+                        in_range: np.ndarray) -> np.ndarray:
+        """Tilt preferred velocities that point straight at an in-range neighbour"""
+        speed_sq = np.einsum('ad,ad->a', preferred, preferred)
+        along = np.einsum('amd,ad->am', rel_pos, preferred)
+        # cos^2 of the angle to the neighbour above cos^2(1 degree)
+        aimed = in_range & (along > 0.0) & (along ** 2 >= 0.9997 * dist_sq * speed_sq[:, np.newaxis])
+        agents = aimed.any(axis=1)
+        if not agents.any():
+            return preferred
+
+        side = np.cross(preferred[agents], [0.0, 1.0, 0.0])
+        vertical = np.einsum('ad,ad->a', side, side) < 1e-12
+        side = np.where(vertical[:, np.newaxis], np.cross(preferred[agents], [1.0, 0.0, 0.0]), side)
+        side /= np.sqrt(np.einsum('ad,ad->a', side, side))[:, np.newaxis] + 1e-12
+
+        tilted = preferred.copy()
+        tilted[agents] += self.symmetry_bias * np.sqrt(speed_sq[agents])[:, np.newaxis] * side
+        return self._limit_speed(tilted)
+
+    def _limit_speed(self, velocities: np.ndarray) -> np.ndarray:
+        """Scale velocities down to max_speed"""
+        speed = np.linalg.norm(velocities, axis=-1, keepdims=True)
+        scale = np.minimum(1.0, self.max_speed / np.maximum(speed, 1e-9))
+        return velocities * scale
@@ -0,0 +1,217 @@
+"""
+LLM Backend Pool for Hunter Drone AI
+Hedged planning requests across model servers with latency-based routing
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from ai_core.s2_planner.ollama_client import OllamaClient
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BackendStats:
+    """Running latency and health figures for one backend"""
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    invalid: int = 0        # answered, but rejected by the caller
+    wins: int = 0           # produced the plan that was used
+    cancelled: int = 0      # lost a hedge race
+    ewma_latency: Optional[float] = None
+    consecutive_failures: int = 0
+    unhealthy_until: float = 0.0
+
+@dataclass
+class LLMBackend:
+    """A model on a server: name for reporting, client for transport"""
+    name: str
+    client: OllamaClient
+    model: str = "llama3"
+    stats: BackendStats = field(default_factory=BackendStats)
+
+class BackendPool:
+    """Sends a prompt to the fastest healthy backend and hedges when it is slow
+
+    The primary is the healthy backend with the lowest latency EWMA per
+    usable answer (untried backends first, so each gets measured). If it has
+    not answered after its expected latency times hedge_factor (hedge_delay
+    before any history), the next-ranked backend gets the same prompt, up to
+    max_parallel in flight. With a single backend the hedge is a retry against it. The first
+    response the caller's accept() turns into a result wins and the rest are
+    cancelled. A failed or rejected response launches the next backend
+    immediately.
+
+    failure_threshold consecutive errors take a backend out of rotation for
+    cooldown_seconds; it is only used in that time if nothing else is left.
+    With streaming, each attempt ends as soon as its JSON object closes.
+    """
+
+    def __init__(self, backends: List[LLMBackend], hedge_delay: float = 0.5,
+                 hedge_factor: float = 1.5, max_parallel: int = 2,
+                 failure_threshold: int = 3, cooldown_seconds: float = 10.0,
+                 latency_alpha: float = 0.2, streaming: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.backends = backends
+        self.hedge_delay = hedge_delay
+        self.hedge_factor = hedge_factor
+        self.max_parallel = max_parallel
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.latency_alpha = latency_alpha
+        self.streaming = streaming
+        self.clock = clock
+        self.hedges = 0
+
+    @classmethod
+    def from_specs(cls, specs: List[Dict[str, Any]], **kwargs) -> "BackendPool":
+        """Pool from [{"host": ..., "model": ..., "name": ...}, ...]"""
+        backends = []
+        for spec in specs:
+            model = spec.get("model", "llama3")
+            client = OllamaClient(host=spec.get("host"), model=model,
+                                  max_concurrency=spec.get("max_concurrency", 2))
+            backends.append(LLMBackend(spec.get("name", f"{model}@{client.host}"), client, model))
+        return cls(backends, **kwargs)
+
+    def ranked_backends(self) -> List[LLMBackend]:
+        """Healthy backends fastest first, then cooling-down ones"""
+        now = self.clock()
+
+        def expected_latency(backend: LLMBackend) -> float:
+            stats = backend.stats
+            if stats.ewma_latency is None:
+                return -1.0
+            # Latency per usable answer: a fast backend that keeps returning
+            # rejected plans ranks behind a slower reliable one
+            usable = (stats.successes - stats.invalid + 1) / (stats.successes + 1)
+            return stats.ewma_latency / usable
+
+        healthy = [b for b in self.backends if b.stats.unhealthy_until <= now]
+        cooling = [b for b in self.backends if b.stats.unhealthy_until > now]
+        return (sorted(healthy, key=expected_latency)
+                + sorted(cooling, key=lambda b: b.stats.unhealthy_until))
+
+    def _hedge_after(self, backend: LLMBackend) -> float:
+        latency = backend.stats.ewma_latency
+        return self.hedge_delay if latency is None else latency * self.hedge_factor
+
+    async def query(self, prompt: str, accept: Callable[[str], Optional[Any]]) -> Any:
+        """First accepted result across backends
+
+        accept(response) returns the parsed, validated result or None to
+        reject the response. Raises RuntimeError when every attempt fails or
+        is rejected.
+        """
+        queue = self.ranked_backends()
+        if not queue:
+            raise RuntimeError("No LLM backends configured")
+        if len(queue) == 1:
+            queue = queue * 2
+
+        pending: Dict[asyncio.Task, LLMBackend] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch():
+            backend = queue.pop(0)
+            pending[asyncio.create_task(self._attempt(backend, prompt))] = backend
+            return backend
+
+        try:
+            newest = launch()
+            while pending:
+                timeout = None
+                if queue and len(pending) < self.max_parallel:
+                    timeout = self._hedge_after(newest)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    newest = launch()
+                    self.hedges += 1
+                    logger.debug(f"Hedging planning request to {newest.name}")
+                    continue
+
+                for task in done:
+                    backend = pending.pop(task)
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    result = accept(task.result())
+                    if result is None:
+                        backend.stats.invalid += 1
+                        last_error = ValueError(f"{backend.name} returned an unusable plan")
+                        continue
+                    backend.stats.wins += 1
+                    return result
+
+                # Failed or rejected attempts free a slot for the next backend now
+                while queue and len(pending) < self.max_parallel:
+                    newest = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise RuntimeError(f"No backend produced a valid plan: {last_error}")
+
+    async def _attempt(self, backend: LLMBackend, prompt: str) -> str:
+        stats = backend.stats
+        stats.requests += 1
+        started = self.clock()
+        try:
+            if self.streaming:
+                response = await backend.client.generate_json(prompt, backend.model)
+            else:
+                response = await backend.client.generate(prompt, backend.model)
+        except asyncio.CancelledError:
+            # Censored sample: the backend was at least this slow
+            stats.cancelled += 1
+            elapsed = self.clock() - started
+            if stats.ewma_latency is None or elapsed > stats.ewma_latency:
+                self._update_latency(stats, elapsed)
+            raise
+        except Exception as e:
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.failure_threshold:
+                stats.unhealthy_until = self.clock() + self.cooldown_seconds
+                logger.warning(f"LLM backend {backend.name} unhealthy after "
+                               f"{stats.consecutive_failures} failures: {e}")
+            raise
+
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.unhealthy_until = 0.0
+        self._update_latency(stats, self.clock() - started)
+        return response
+
+    def _update_latency(self, stats: BackendStats, latency: float):
+        if stats.ewma_latency is None:
+            stats.ewma_latency = latency
+        else:
+            stats.ewma_latency += self.latency_alpha * (latency - stats.ewma_latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-backend counters and latency EWMA, plus the hedge count"""
+        now = self.clock()
+        return {
+            "hedges": self.hedges,
+            "backends": {
+                backend.name: {
+                    **vars(backend.stats),
+                    "healthy": backend.stats.unhealthy_until <= now
+                }
+                for backend in self.backends
+            }
+        }
+
+    async def close(self):
+        """Close every distinct client"""
+        for client in {id(b.client): b.client for b in self.backends}.values():
+            await client.close()
@@ -0,0 +1,233 @@
+"""
+Escape Map for Hunter Drone AI
+Geodesic time-to-reach fields that predict where the ground-bound target will run
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai_core.s2_planner.prompt_builder import obstacle_arrays
+
+# 8-connected moves as (dx, dy) cell offsets
+_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+class EscapeMap:
+    """Target reachability over the planning grid
+
+    The grid is rasterized at cells_per_unit; cells whose centers lie within
+    obstacle_radius of a blocks_target obstacle are impassable to the target
+    (the drone flies over everything). The target's geodesic distance field
+    is computed by label-correcting wavefront propagation: each round relaxes
+    the 8 neighbors (no corner cutting past blocked cells) of only the cells
+    that improved in the previous round, so work follows the reachable
+    region instead of sweeping the whole grid.
+
+    Likely escape: the cell the target reaches with the largest lead over
+    the drone (drone straight-line time minus target geodesic time). The
+    predicted route follows the distance field from that cell back to the
+    target.
+
+    The obstacle raster is maintained incrementally: update_obstacles()
+    stamps only added/removed obstacles into a per-cell occupancy count.
+    Distance fields are cached per target cell together with the raster
+    they were computed on, and repaired on the next request: cells that
+    could have routed through a newly blocked cell are reset and
+    re-propagated from the intact region; newly freed cells are seeded from
+    their neighbors.
+    """
+
+    def __init__(self, grid_size: int, cells_per_unit: int = 4, obstacle_radius: float = 0.5,
+                 target_speed: float = 1.8, drone_speed: float = 1.6, max_cached_fields: int = 64):
+        self.grid_size = grid_size
+        self.cells_per_unit = cells_per_unit
+        self.obstacle_radius = obstacle_radius
+        self.target_speed = target_speed
+        self.drone_speed = drone_speed
+        self.max_cached_fields = max_cached_fields
+
+        self.cells = grid_size * cells_per_unit
+        self.occupancy = np.zeros((self.cells, self.cells), dtype=np.int32)
+        self.version = 0
+        self._stamped: Counter = Counter()
+        # Target cell -> (padded distance field, padded free mask it was computed on)
+        self._fields: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+        centers = (np.arange(self.cells) + 0.5) / cells_per_unit
+        self._center_x, self._center_y = np.meshgrid(centers, centers, indexing="ij")
+
+        # Disk of cell offsets around an obstacle's cell that may be covered
+        reach = int(math.ceil(obstacle_radius * cells_per_unit)) + 1
+        offsets = np.arange(-reach, reach + 1)
+        self._disk = np.stack(np.meshgrid(offsets, offsets, indexing="ij"), axis=-1).reshape(-1, 2)
+
+        # Moves as offsets into the flattened grid padded by one blocked cell,
+        # so neighbors of interior cells are always in bounds
+        width = self.cells + 2
+        moves = np.array(_MOVES)
+        diagonal = np.all(moves != 0, axis=1)
+        self._offsets = moves[:, 0] * width + moves[:, 1]
+        self._costs = np.where(diagonal, math.sqrt(2.0), 1.0) / cells_per_unit
+        self._diagonal = np.flatnonzero(diagonal)
+        # The two orthogonal cells a diagonal move squeezes past
+        self._sides = np.stack([moves[diagonal, 0] * width, moves[diagonal, 1]])
+
+    @property
+    def free(self) -> np.ndarray:
+        return self.occupancy == 0
+
+    def update_obstacles(self, obstacles: List) -> bool:
+        """Sync the raster with obstacles; True if anything changed"""
+        positions, blocks_target, _ = obstacle_arrays(obstacles)
+        keys = Counter(map(tuple, np.round(positions[blocks_target], 3).tolist()))
+        if keys == self._stamped:
+            return False
+
+        added = keys - self._stamped
+        removed = self._stamped - keys
+        if added:
+            self._stamp(np.array(list(added.elements()), dtype=float), 1)
+        if removed:
+            self._stamp(np.array(list(removed.elements()), dtype=float), -1)
+
+        self._stamped = keys
+        self.version += 1
+        return True
+
+    def _stamp(self, positions: np.ndarray, delta: int):
+        """Add delta to every cell whose center is within obstacle_radius of a position"""
+        base = np.floor(positions * self.cells_per_unit).astype(int)
+        cells = base[:, None, :] + self._disk[None, :, :]
+        centers = (cells + 0.5) / self.cells_per_unit
+        covered = np.sum((centers - positions[:, None, :]) ** 2, axis=-1) <= self.obstacle_radius ** 2
+        covered &= np.all((cells >= 0) & (cells < self.cells), axis=-1)
+        ix, iy = cells[covered].T
+        np.add.at(self.occupancy, (ix, iy), delta)
+
+    def _cell(self, pos: List[float]) -> Tuple[int, int]:
+        ix = int(np.clip(pos[0] * self.cells_per_unit, 0, self.cells - 1))
+        iy = int(np.clip(pos[1] * self.cells_per_unit, 0, self.cells - 1))
+        return ix, iy
+
+    def target_distance(self, target_pos: List[float]) -> np.ndarray:
+        """Geodesic distance (grid units) from the target to every cell; inf if unreachable"""
+        source = self._cell(target_pos)
+        padded_source = (source[0] + 1, source[1] + 1)
+        free = np.zeros((self.cells + 2, self.cells + 2), dtype=bool)
+        free[1:-1, 1:-1] = self.free
+        free[padded_source] = True  # the target is standing there, whatever the raster says
+
+        cached = self._fields.pop(source, None)
+        if cached is None:
+            if len(self._fields) >= self.max_cached_fields:
+                self._fields.pop(next(iter(self._fields)))
+            dist = np.full(free.shape, np.inf)
+            dist[padded_source] = 0.0
+            self._propagate(dist, free, np.array([np.ravel_multi_index(padded_source, free.shape)]))
+        else:
+            dist, computed_on = cached
+            if not np.array_equal(free, computed_on):
+                dist = self._repair(dist.copy(), computed_on, free)
+
+        self._fields[source] = (dist, free)
+        return dist[1:-1, 1:-1]
+
+    def _repair(self, dist: np.ndarray, old_free: np.ndarray, free: np.ndarray) -> np.ndarray:
+        """Bring a field computed on old_free up to date with free"""
+        blocked = old_free & ~free
+        stale = ~old_free & free
+        if blocked.any():
+            # A shortest path only visits cells nearer the source than its end,
+            # so distances below the nearest newly blocked cell still hold
+            threshold = dist[blocked].min()
+            if np.isfinite(threshold):
+                reset = np.isfinite(dist) & (dist >= threshold)
+                dist[reset] = np.inf
+                stale |= reset & free
+            dist[~free] = np.inf
+
+        # Re-propagate from every intact cell bordering the stale region
+        near = np.zeros_like(stale)
+        inner = (slice(1, -1), slice(1, -1))
+        for dx, dy in _MOVES:
+            near[inner] |= stale[1 + dx:self.cells + 1 + dx, 1 + dy:self.cells + 1 + dy]
+        frontier = np.flatnonzero(near & np.isfinite(dist))
+        self._propagate(dist, free, frontier)
+        return dist
+
+    def _propagate(self, dist: np.ndarray, free: np.ndarray, frontier: np.ndarray):
+        """Relax neighbors from frontier until no distance improves (in place on padded grids)
+
+        Cells expand nearest-first in bands a couple of moves wide, so a
+        frontier that starts at mixed distances (a repair) does not flood
+        the grid with labels that a nearer cell will overwrite later.
+        """
+        dist = dist.reshape(-1)
+        free = free.reshape(-1)
+        band = 2.0 * self._costs.max()
+        pending = frontier
+        while len(pending):
+            nearest = dist[pending]
+            expand = nearest <= nearest.min() + band
+            frontier, pending = pending[expand], pending[~expand]
+
+            targets = frontier[:, None] + self._offsets
+            candidate = dist[frontier][:, None] + self._costs
+            passable = free[targets]
+            passable[:, self._diagonal] &= (free[frontier[:, None] + self._sides[0]]
+                                            & free[frontier[:, None] + self._sides[1]])
+            passable &= candidate < dist[targets]
+
+            targets = targets[passable]
+            candidate = candidate[passable]
+            np.minimum.at(dist, targets, candidate)
+            # Cells whose new distance came from this round expand later
+            pending = np.unique(np.concatenate([pending, targets[dist[targets] == candidate]]))
+
+    def escape_route(self, drone_pos: List[float], target_pos: List[float]) -> np.ndarray:
+        """(K, 2) positions from the target to its best escape cell"""
+        field = self.target_distance(target_pos)
+        reachable = np.isfinite(field)
+
+        drone_time = np.hypot(self._center_x - drone_pos[0], self._center_y - drone_pos[1]) / self.drone_speed
+        lead = np.where(reachable, drone_time - field / self.target_speed, -np.inf)
+        goal = np.unravel_index(int(np.argmax(lead)), lead.shape)
+
+        # Walk downhill on the distance field back to the target
+        path = [goal]
+        ix, iy = goal
+        while field[ix, iy] > 0.0:
+            best = None
+            for dx, dy in _MOVES:
+                nx, ny = ix + dx, iy + dy
+                if 0 <= nx < self.cells and 0 <= ny < self.cells and field[nx, ny] < field[ix, iy]:
+                    if best is None or field[nx, ny] < field[best]:
+                        best = (nx, ny)
+            if best is None:
+                break
+            ix, iy = best
+            path.append(best)
+
+        route = (np.array(path[::-1], dtype=float) + 0.5) / self.cells_per_unit
+        route[0] = target_pos[:2]
+        return route
+
+    def predict_target_positions(self, drone_pos: List[float], target_pos: List[float],
+                                 times: List[float]) -> List[List[float]]:
+        """Where the target will be after each time if it runs its escape route"""
+        route = self.escape_route(drone_pos, target_pos)
+        if len(route) < 2:
+            return [list(target_pos[:2]) for _ in times]
+
+        arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(route, axis=0).T))])
+        travelled = np.asarray(times, dtype=float) * self.target_speed
+        xs = np.interp(travelled, arc, route[:, 0])
+        ys = np.interp(travelled, arc, route[:, 1])
+        return [[float(x), float(y)] for x, y in zip(xs, ys)]
+
+    def time_to_reach(self, target_pos: List[float], pos: List[float]) -> Optional[float]:
+        """Seconds the target needs to reach pos, or None if it cannot"""
+        seconds = self.target_distance(target_pos)[self._cell(pos)] / self.target_speed
+        return float(seconds) if np.isfinite(seconds) else None
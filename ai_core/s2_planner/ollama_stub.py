@@ -0,0 +1,168 @@
+"""
+Stand-in Ollama Server
+Minimal local /api/generate endpoint for exercising the planner without a model
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Callable, Optional, Union
+
+DEFAULT_RESPONSE = json.dumps({
+    "plan": [[5.0, 5.0], [6.0, 6.0], [7.0, 7.0]],
+    "reasoning": "Stand-in server plan: close diagonally toward the target",
+    "strategy_type": "intercept",
+    "confidence": 0.5
+})
+
+# Rough stand-in for model tokens: up to four characters with leading space
+_TOKEN = re.compile(r"\s*\S{1,4}|\s+")
+
+class StubOllamaServer:
+    """HTTP/1.1 keep-alive server answering /api/generate with canned text
+
+    response may be a string or a callable (prompt, model) -> string, and
+    latency_seconds simulates inference time. Requests with "stream": true
+    get NDJSON chunks, one pseudo-token every token_latency_seconds, and
+    generation stops if the client disconnects. connections, requests and
+    tokens_sent count what the server has seen, e.g. to confirm a client
+    reuses its connections or abandons a stream early.
+
+        async with StubOllamaServer(latency_seconds=0.05) as server:
+            client = OllamaClient(host=server.url)
+    """
+
+    def __init__(self, response: Union[str, Callable[[str, str], str]] = DEFAULT_RESPONSE,
+                 latency_seconds: float = 0.0, token_latency_seconds: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.response = response
+        self.latency_seconds = latency_seconds
+        self.token_latency_seconds = token_latency_seconds
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.requests = 0
+        self.tokens_sent = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubOllamaServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                method, path, _ = request_line.decode().split(" ", 2)
+                await self._respond(reader, writer, method, path, body)
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            # Client went away or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                       method: str, path: str, body: bytes):
+        if method != "POST" or path != "/api/generate":
+            self._write(writer, 404, {"error": f"{method} {path} not found"})
+            return
+
+        self.requests += 1
+        request = json.loads(body or b"{}")
+        prompt = request.get("prompt", "")
+        model = request.get("model", "")
+
+        started = time.perf_counter()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        text = self.response(prompt, model) if callable(self.response) else self.response
+
+        if request.get("stream", True) is not False:
+            await self._stream(reader, writer, model, text, started)
+            return
+
+        self.tokens_sent += len(_TOKEN.findall(text))
+        self._write(writer, 200, {
+            "model": model,
+            "response": text,
+            "done": True,
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "load_duration": 0,
+            "eval_count": len(text.split())
+        })
+        await writer.drain()
+
+    async def _stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                      model: str, text: str, started: float):
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\n"
+                     b"Connection: keep-alive\r\n\r\n")
+
+        tokens = _TOKEN.findall(text)
+        for token in tokens:
+            if reader.at_eof():
+                # Client hung up: abandon the rest of the generation
+                raise ConnectionResetError
+            if self.token_latency_seconds:
+                await asyncio.sleep(self.token_latency_seconds)
+            self._write_chunk(writer, {"model": model, "response": token, "done": False})
+            self.tokens_sent += 1
+            await writer.drain()
+
+        self._write_chunk(writer, {
+            "model": model,
+            "response": "",
+            "done": True,
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "load_duration": 0,
+            "eval_count": len(tokens)
+        })
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, payload: dict):
+        line = json.dumps(payload).encode() + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        reason = "OK" if status == 200 else "Not Found"
+        writer.write(f"HTTP/1.1 {status} {reason}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: keep-alive\r\n\r\n".encode() + data)
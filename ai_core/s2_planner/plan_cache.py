@@ -0,0 +1,111 @@
+"""
+Plan Cache for Hunter Drone AI
+Reuses recent LLM plans for situations that are nearly identical
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PlanCache:
+    """LRU + TTL cache of plans keyed by a quantized situation signature
+
+    The signature is drone-relative: the target offset, the obstacles near
+    the drone (offset, and whether they block the target) and the emergency
+    flag, each rounded to position_quantum grid units. Plans are stored
+    relative to the drone, so a hit is translated to the current drone
+    position before it is returned.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 5.0,
+                 position_quantum: float = 0.5, obstacle_radius: float = 3.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.position_quantum = position_quantum
+        self.obstacle_radius = obstacle_radius
+        self.clock = clock
+
+        # key -> (stored_at, relative_plan, reasoning)
+        self.entries: "OrderedDict[Tuple, Tuple[float, List[List[float]], str]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "stores": 0}
+
+    def _quantize(self, value: float) -> int:
+        return int(math.floor(value / self.position_quantum + 0.5))
+
+    def situation_key(self, drone_pos: List[float], target_pos: List[float],
+                      obstacles: List, emergency_mode: bool = False) -> Tuple:
+        """Quantized, drone-relative signature of a planning situation"""
+        target_offset = (self._quantize(target_pos[0] - drone_pos[0]),
+                         self._quantize(target_pos[1] - drone_pos[1]))
+
+        local_obstacles = []
+        radius_sq = self.obstacle_radius ** 2
+        for obstacle in obstacles:
+            # Handle both old format (list) and new format (dict)
+            if isinstance(obstacle, dict):
+                position = obstacle["position"]
+                blocks_target = obstacle.get("blocks_target", True)
+            else:
+                position = obstacle
+                blocks_target = True
+
+            dx = position[0] - drone_pos[0]
+            dy = position[1] - drone_pos[1]
+            if dx * dx + dy * dy <= radius_sq:
+                local_obstacles.append((self._quantize(dx), self._quantize(dy), bool(blocks_target)))
+
+        return (target_offset, tuple(sorted(local_obstacles)), bool(emergency_mode))
+
+    def get(self, drone_pos: List[float], target_pos: List[float], obstacles: List,
+            emergency_mode: bool = False) -> Optional[Tuple[List[List[float]], str]]:
+        """Cached (plan, reasoning) translated to drone_pos, or None"""
+        key = self.situation_key(drone_pos, target_pos, obstacles, emergency_mode)
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        stored_at, relative_plan, reasoning = entry
+        if self.clock() - stored_at > self.ttl_seconds:
+            del self.entries[key]
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        plan = [[drone_pos[0] + dx, drone_pos[1] + dy] for dx, dy in relative_plan]
+        return plan, reasoning
+
+    def put(self, drone_pos: List[float], target_pos: List[float], obstacles: List,
+            plan: List[List[float]], reasoning: str, emergency_mode: bool = False):
+        """Store a plan for this situation, evicting the least recently used entry if full"""
+        key = self.situation_key(drone_pos, target_pos, obstacles, emergency_mode)
+        relative_plan = [[point[0] - drone_pos[0], point[1] - drone_pos[1]] for point in plan]
+
+        self.entries[key] = (self.clock(), relative_plan, reasoning)
+        self.entries.move_to_end(key)
+        self.stats["stores"] += 1
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Drop all cached plans (statistics are kept)"""
+        self.entries.clear()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Hit/miss counters plus hit rate and current size"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self.entries),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
@@ -0,0 +1,152 @@
+"""
+Candidate Plan Search for Hunter Drone AI
+Samples many short plans and scores them in one vectorized pass
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from ai_core.s2_planner.prompt_builder import obstacle_arrays
+
+@dataclass
+class PlanSearchResult:
+    """Best candidate plus how it compared"""
+    plan: np.ndarray          # (steps, 2)
+    score: float              # lower is better
+    candidates: int
+    baseline_score: Optional[float] = None  # score of the supplied baseline plan, if any
+
+class CandidatePlanSearch:
+    """Vectorized sample-and-score plan search on the planning grid
+
+    Candidates come from two families:
+    - aim plans: fly straight at the target's predicted position at one of
+      aim_times, at one of step_scales x max_step per step (never
+      overshooting the aim point);
+    - random plans: each step heads at the target's predicted position for
+      that step plus Gaussian heading noise, with a random step length.
+    An optional baseline plan (e.g. the greedy one) is scored alongside, so
+    the result is never worse than it.
+
+    Every candidate is scored at once against the predicted target
+    positions: distance from the optimal engagement range (later steps
+    weigh more), clearance from obstacles that block the drone, path
+    length, and a hard penalty for ending farther than 1.2x the current
+    distance (the planner's validity rule), or than optimal_range when the
+    drone is already on top of the target.
+    """
+
+    def __init__(self, grid_size: int, plan_steps: int = 3, step_seconds: float = 0.5,
+                 max_step: float = 1.0, num_random: int = 224,
+                 aim_times: Sequence[float] = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0),
+                 step_scales: Sequence[float] = (0.25, 0.5, 0.75, 1.0),
+                 heading_noise: float = 0.6, optimal_range: float = 1.5,
+                 safety_margin: float = 0.5, seed: Optional[int] = None):
+        self.grid_size = grid_size
+        self.plan_steps = plan_steps
+        self.step_seconds = step_seconds
+        self.max_step = max_step
+        self.num_random = num_random
+        self.aim_times = np.asarray(aim_times, dtype=float)
+        self.step_scales = np.asarray(step_scales, dtype=float)
+        self.heading_noise = heading_noise
+        self.optimal_range = optimal_range
+        self.safety_margin = safety_margin
+        self.rng = np.random.default_rng(seed)
+
+        # Later steps matter more: that is where the plan leaves the drone
+        self.step_weights = np.linspace(1.0, 2.0, plan_steps)
+
+    def _clamp(self, points: np.ndarray) -> np.ndarray:
+        return np.clip(points, 0.5, self.grid_size - 0.5)
+
+    def generate(self, drone_pos: List[float], step_targets: np.ndarray,
+                 aim_points: np.ndarray) -> np.ndarray:
+        """(N, steps, 2) candidate plans"""
+        drone = np.asarray(drone_pos[:2], dtype=float)
+        steps = np.arange(1, self.plan_steps + 1)
+
+        # Aim family: (aims x scales) straight lines, stopping at the aim point
+        offsets = aim_points - drone
+        lengths = np.hypot(offsets[:, 0], offsets[:, 1])
+        units = offsets / np.maximum(lengths, 1e-9)[:, None]
+        travel = self.step_scales[None, :, None] * self.max_step * steps[None, None, :]
+        travel = np.minimum(travel, lengths[:, None, None])
+        aim_plans = drone + units[:, None, None, :] * travel[..., None]
+        aim_plans = aim_plans.reshape(-1, self.plan_steps, 2)
+
+        # Random family: noisy heading toward each step's predicted target position
+        count = self.num_random
+        step_lengths = self.rng.uniform(0.2, 1.0, (count, self.plan_steps)) * self.max_step
+        noise = self.rng.normal(0.0, self.heading_noise, (count, self.plan_steps))
+        random_plans = np.empty((count, self.plan_steps, 2))
+        position = np.broadcast_to(drone, (count, 2))
+        for step in range(self.plan_steps):
+            offset = step_targets[step] - position
+            heading = np.arctan2(offset[:, 1], offset[:, 0]) + noise[:, step]
+            position = self._clamp(position + step_lengths[:, step, None]
+                                   * np.stack([np.cos(heading), np.sin(heading)], axis=-1))
+            random_plans[:, step] = position
+
+        return self._clamp(np.concatenate([aim_plans, random_plans]))
+
+    def score(self, plans: np.ndarray, drone_pos: List[float], target_pos: List[float],
+              step_targets: np.ndarray, blocking: np.ndarray) -> np.ndarray:
+        """(N,) scores for (N, steps, 2) plans; lower is better"""
+        drone = np.asarray(drone_pos[:2], dtype=float)
+
+        # Engagement: be at optimal range of where the target will be
+        gap = plans - step_targets[None]
+        distance = np.hypot(gap[..., 0], gap[..., 1])
+        range_error = np.where(distance > self.optimal_range,
+                               distance - self.optimal_range,
+                               0.5 * (self.optimal_range - distance))
+        cost = range_error @ self.step_weights
+
+        # Obstacles the drone cannot fly over
+        if len(blocking):
+            offsets = plans[:, :, None, :] - blocking[None, None]
+            clearance = np.hypot(offsets[..., 0], offsets[..., 1]).min(axis=-1)
+            cost += 10.0 * np.maximum(0.0, self.safety_margin - clearance).sum(axis=-1)
+
+        # Prefer shorter paths between equally good plans
+        legs = np.diff(np.concatenate([np.broadcast_to(drone, (len(plans), 1, 2)), plans], axis=1), axis=1)
+        cost += 0.05 * np.hypot(legs[..., 0], legs[..., 1]).sum(axis=-1)
+
+        # Same rule _validate_plan applies: don't end much farther away. The
+        # floor keeps the rule from rejecting every plan at zero distance
+        start_distance = float(np.hypot(*(np.asarray(target_pos[:2], dtype=float) - drone)))
+        final_distance = np.hypot(*(plans[:, -1] - np.asarray(target_pos[:2], dtype=float)).T)
+        max_final_distance = max(start_distance * 1.2, self.optimal_range)
+        cost += np.where(final_distance > max_final_distance, 1e3, 0.0)
+        return cost
+
+    def search(self, drone_pos: List[float], target_pos: List[float], obstacles: List,
+               predict: Callable[[List[float]], List[List[float]]],
+               baseline: Optional[List[List[float]]] = None) -> PlanSearchResult:
+        """Best plan among freshly sampled candidates (and baseline)
+
+        predict(times) returns the target's predicted [x, y] at each time.
+        """
+        step_times = [(step + 1) * self.step_seconds for step in range(self.plan_steps)]
+        predicted = np.asarray(predict(step_times + self.aim_times.tolist()), dtype=float)
+        step_targets, aim_points = predicted[:self.plan_steps], predicted[self.plan_steps:]
+
+        plans = self.generate(drone_pos, step_targets, aim_points)
+        if baseline is not None:
+            plans = np.concatenate([plans, np.asarray(baseline, dtype=float)[None]])
+
+        positions, _, _ = obstacle_arrays(obstacles)
+        blocks_drone = np.array([obstacle.get("blocks_drone", True) if isinstance(obstacle, dict) else True
+                                 for obstacle in obstacles], dtype=bool)
+        scores = self.score(plans, drone_pos, target_pos, step_targets, positions[blocks_drone])
+
+        best = int(np.argmin(scores))
+        return PlanSearchResult(
+            plan=plans[best],
+            score=float(scores[best]),
+            candidates=len(plans),
+            baseline_score=float(scores[-1]) if baseline is not None else None
+        )
@@ -5,18 +5,31 @@ Handles strategic planning, path generation, and interception calculations
 
 import asyncio
 import json
-import subprocess
 import time
 import math
-from typing import Dict, List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
 import logging
 
+from ai_core.s2_planner.escape_map import EscapeMap
+from ai_core.s2_planner.mcts_planner import MCTSPlanner
+from ai_core.s2_planner.plan_cache import PlanCache
+from ai_core.s2_planner.plan_search import CandidatePlanSearch
+from ai_core.s2_planner.prompt_builder import PlanningPromptBuilder
+
+if TYPE_CHECKING:
+    # The LLM path needs httpx; it is imported on first use so the
+    # algorithmic, sampled and MCTS modes run without it
+    from ai_core.s2_planner.backend_pool import BackendPool, LLMBackend
+    from ai_core.s2_planner.ollama_client import OllamaClient
+
 logger = logging.getLogger(__name__)
 
 class DronePlanner:
     """Strategic planner for drone movement and interception"""
     
-    def __init__(self, grid_size: int = 10):
+    def __init__(self, grid_size: int = 10, anytime: bool = False, llm_deadline: float = 2.0,
+                 backends: Optional[List["LLMBackend"]] = None, sample_plans: bool = False,
+                 mcts_budget: Optional[float] = None):
         self.grid_size = grid_size
         self.plan_steps = 3
         self.max_speed = 16.0  # ft/s - Realistic 2x2ft surveillance drone speed  
@@ -33,22 +46,86 @@ class DronePlanner:
             "shooting_approach": "Close to 2.5 unit max range for target engagement",
             "emergency_pursuit": "Direct aggressive pursuit when other strategies fail"
         }
+        
+        # Planning prompt within a token budget; static prefix built once
+        self.prompt_builder = PlanningPromptBuilder(
+            grid_size, self.plan_steps, self.max_speed, self.max_acceleration, self.skills
+        )
+        
+        # Where the ground-bound target can run, given obstacles that block it
+        self.escape_map = EscapeMap(grid_size, target_speed=1.8, drone_speed=self.max_speed / 10.0)
+        
+        # Sampled mode: score many candidate plans instead of one greedy plan
+        self.plan_search = CandidatePlanSearch(grid_size, self.plan_steps) if sample_plans else None
+        
+        # MCTS mode: plans come from tree search within mcts_budget seconds, no LLM
+        self.mcts = (MCTSPlanner(grid_size, self.plan_steps, target_speed=1.8, time_budget=mcts_budget)
+                     if mcts_budget is not None else None)
+        
+        # Recent validated LLM plans keyed by quantized situation
+        self.plan_cache = PlanCache()
+        
+        # Model servers raced per query, pooled by _get_backend_pool() on the
+        # first LLM query; without backends it creates llm_client, a keep-alive
+        # connection to llama3 on the local Ollama server
+        self.backends = backends
+        self.llm_client: Optional["OllamaClient"] = None
+        self.backend_pool: Optional["BackendPool"] = None
+        
+        # Anytime mode: answer with the algorithmic plan immediately and let
+        # the LLM plan replace it on a later decision if it arrives within
+        # llm_deadline seconds and still validates
+        self.anytime = anytime
+        self.llm_deadline = llm_deadline
+        self._llm_task: Optional[asyncio.Task] = None
+        self._llm_launched_at = 0.0
+        self._llm_situation: Tuple = ()
+        self.anytime_stats = {"launched": 0, "upgrades": 0, "invalid": 0}
+        
+        # Blocking-mode query in flight; a newer decision cancels it
+        self._inflight_query: Optional[asyncio.Task] = None
+        
+        # LLM query outcomes across both modes
+        self.llm_stats = {"completed": 0, "timed_out": 0, "superseded": 0, "failed": 0}
     
     async def create_interception_plan(self, drone_pos: List[float], target_pos: List[float], 
                                      obstacles: List[Dict], memory_context: Dict,
-                                     emergency_mode: bool = False) -> Tuple[List[List[float]], str]:
-        """Create an interception plan using AI reasoning"""
+                                     emergency_mode: bool = False,
+                                     deadline: Optional[float] = None) -> Tuple[List[List[float]], str]:
+        """Create an interception plan using AI reasoning
+        
+        deadline is a time.monotonic() instant by which the decision is due;
+        an LLM query still running then is cancelled and the algorithmic
+        plan is used instead.
+        """
         
         if emergency_mode:
             return self._create_emergency_plan(drone_pos, target_pos, obstacles)
         
-        # Try AI-powered planning first
+        if self.mcts is not None:
+            return self._create_mcts_plan(drone_pos, target_pos, obstacles, deadline)
+        
+        # Reuse a recent plan for a near-identical situation
+        cached = self.plan_cache.get(drone_pos, target_pos, obstacles, emergency_mode)
+        if cached is not None:
+            plan, reasoning = cached
+            if self._validate_plan(plan, drone_pos, target_pos, obstacles):
+                return plan, reasoning
+        
+        if self.anytime:
+            return self._anytime_plan(drone_pos, target_pos, obstacles, memory_context)
+        
+        # Try AI-powered planning first, within the decision's budget
         try:
-            plan, reasoning = await self._ai_powered_planning(
-                drone_pos, target_pos, obstacles, memory_context
+            result = await self._bounded_ai_planning(
+                drone_pos, target_pos, obstacles, memory_context, deadline
             )
+            if result is None:
+                return self._create_algorithmic_plan(drone_pos, target_pos, obstacles)
             
+            plan, reasoning = result
             if self._validate_plan(plan, drone_pos, target_pos, obstacles):
+                self.plan_cache.put(drone_pos, target_pos, obstacles, plan, reasoning, emergency_mode)
                 return plan, reasoning
             else:
                 logger.warning("AI plan failed validation, using fallback")
@@ -59,6 +136,115 @@ class DronePlanner:
         # Fallback to algorithmic planning
         return self._create_algorithmic_plan(drone_pos, target_pos, obstacles)
     
+    async def _bounded_ai_planning(self, drone_pos: List[float], target_pos: List[float],
+                                   obstacles: List[Dict], memory_context: Dict,
+                                   deadline: Optional[float]) -> Optional[Tuple[List[List[float]], str]]:
+        """_ai_powered_planning cut off at deadline; None if timed out or superseded"""
+        # This decision supersedes any query still running for an older state
+        if self._inflight_query is not None and not self._inflight_query.done():
+            self._inflight_query.cancel()
+        
+        timeout = None if deadline is None else deadline - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            self.llm_stats["timed_out"] += 1
+            return None
+        
+        task = asyncio.create_task(
+            self._ai_powered_planning(drone_pos, target_pos, obstacles, memory_context)
+        )
+        self._inflight_query = task
+        try:
+            await asyncio.wait({task}, timeout=timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            if self._inflight_query is task:
+                self._inflight_query = None
+        
+        if not task.done():
+            task.cancel()
+            self.llm_stats["timed_out"] += 1
+            logger.warning(f"AI planning exceeded {timeout:.2f}s budget, using fallback")
+            return None
+        if task.cancelled():
+            self.llm_stats["superseded"] += 1
+            return None
+        if task.exception() is not None:
+            self.llm_stats["failed"] += 1
+            raise task.exception()
+        
+        self.llm_stats["completed"] += 1
+        return task.result()
+    
+    def _anytime_plan(self, drone_pos: List[float], target_pos: List[float],
+                      obstacles: List[Dict], memory_context: Dict) -> Tuple[List[List[float]], str]:
+        """Fast-path plan: a finished LLM plan if usable, else the algorithmic one"""
+        upgraded = self._collect_llm_plan(drone_pos, target_pos, obstacles)
+        if upgraded is not None:
+            return upgraded
+        
+        # One background query at a time; a newer one starts once it resolves
+        if self._llm_task is None:
+            self._llm_situation = (list(drone_pos), list(target_pos), list(obstacles))
+            self._llm_launched_at = time.monotonic()
+            self._llm_task = asyncio.create_task(
+                self._timed_ai_planning(drone_pos, target_pos, obstacles, memory_context)
+            )
+            self.anytime_stats["launched"] += 1
+        
+        return self._create_algorithmic_plan(drone_pos, target_pos, obstacles)
+    
+    async def _timed_ai_planning(self, drone_pos: List[float], target_pos: List[float],
+                                 obstacles: List[Dict], memory_context: Dict) -> Tuple[List[List[float]], str, float]:
+        """_ai_powered_planning plus the monotonic time it finished"""
+        plan, reasoning = await self._ai_powered_planning(drone_pos, target_pos, obstacles, memory_context)
+        return plan, reasoning, time.monotonic()
+    
+    def _collect_llm_plan(self, drone_pos: List[float], target_pos: List[float],
+                          obstacles: List[Dict]) -> Optional[Tuple[List[List[float]], str]]:
+        """Resolve the background LLM query against the latest state"""
+        task = self._llm_task
+        if task is None:
+            return None
+        
+        if not task.done():
+            if time.monotonic() - self._llm_launched_at > self.llm_deadline:
+                task.cancel()
+                self._llm_task = None
+                self.llm_stats["timed_out"] += 1
+            return None
+        
+        self._llm_task = None
+        if task.cancelled():
+            return None
+        if task.exception() is not None:
+            logger.error(f"Background AI planning failed: {task.exception()}")
+            self.llm_stats["failed"] += 1
+            return None
+        
+        plan, reasoning, finished_at = task.result()
+        if finished_at - self._llm_launched_at > self.llm_deadline:
+            self.llm_stats["timed_out"] += 1
+            return None
+        self.llm_stats["completed"] += 1
+        
+        # Valid for the situation it was planned for -> worth caching
+        planned_drone, planned_target, planned_obstacles = self._llm_situation
+        if self._validate_plan(plan, planned_drone, planned_target, planned_obstacles):
+            self.plan_cache.put(planned_drone, planned_target, planned_obstacles, plan, reasoning)
+        else:
+            self.anytime_stats["invalid"] += 1
+            return None
+        
+        # ...but only used if it still holds for where things are now
+        if not self._validate_plan(plan, drone_pos, target_pos, obstacles):
+            self.anytime_stats["invalid"] += 1
+            return None
+        
+        self.anytime_stats["upgrades"] += 1
+        return plan, reasoning
+    
     async def _ai_powered_planning(self, drone_pos: List[float], target_pos: List[float], 
                                  obstacles: List[Dict], memory_context: Dict) -> Tuple[List[List[float]], str]:
         """Use AI (Ollama) to generate strategic plans"""
@@ -66,87 +252,41 @@ class DronePlanner:
         # Build context from memory
         context_str = self._build_memory_context(memory_context)
         
-        # Calculate current metrics
-        distance_to_target = self._distance(drone_pos, target_pos)
-        target_direction = self._get_direction(drone_pos, target_pos)
+        # Create AI prompt: cached static prefix + corridor-pruned situation
+        prompt = self.prompt_builder.build(
+            drone_pos, target_pos, obstacles, context_str,
+            target_direction=self._get_direction(drone_pos, target_pos)
+        )
+        
+        def accept(response: str) -> Optional[Tuple[List[List[float]], str]]:
+            # Only a well-formed plan that validates can win the backend race
+            result = self._parse_ai_response(response.strip())
+            if not (result and "plan" in result and "reasoning" in result):
+                return None
+            if not self._validate_plan(result["plan"], drone_pos, target_pos, obstacles):
+                return None
+            return result["plan"], result["reasoning"]
         
-        # Create AI prompt
-        prompt = f"""You are an expert hunter drone strategist. You control a drone hunting an evasive target.
-
-CURRENT SITUATION:
-- Drone Position: {self._format_pos(drone_pos)} 
-- Target Position: {self._format_pos(target_pos)}
-- Distance to Target: {distance_to_target:.2f} units
-- Target Direction: {target_direction}
-- Obstacles: {self._format_obstacles_for_prompt(obstacles)}
-
-ENVIRONMENT:
-- Grid Size: {self.grid_size}x{self.grid_size} units (each unit = 10ft)
-- Drone: Max speed {self.max_speed} ft/s (~35 mph), Max acceleration {self.max_acceleration} ft/s² - CAN FLY OVER OBSTACLES
-- Target: Human runner (~25 mph max), ground-bound, CANNOT fly over obstacles - must navigate around them
-- Speed Advantage: Drone is ~40% faster than target and has aerial mobility
-- WEAPONS: Must neutralize target within shooting range (max 2.5 units, optimal 1.5 units)
-- MISSION: Position within range and engage - NOT capture by proximity
-
-MEMORY CONTEXT:
-{context_str}
-
-AVAILABLE SKILLS:
-{chr(10).join([f"- {skill}: {desc}" for skill, desc in self.skills.items()])}
-
-TASK: Create a {self.plan_steps}-step interception plan. The target is ACTIVELY EVADING - predict where it will go and intercept it there.
-
-STRATEGY CONSIDERATIONS:
-1. AERIAL ADVANTAGE: You can fly directly over obstacles while target must go around
-2. ENGAGEMENT RANGE: Must get within 2.5 units to neutralize (optimal: 1.5 units)
-3. Predict target's likely escape routes (limited by ground obstacles)
-4. Use obstacles to cut off target's escape paths - you can fly over them to intercept
-5. Plan positioning for engagement, not just pursuit - STOP WHEN IN RANGE
-6. Target will seek cover behind obstacles - use your flight to bypass this
-7. Maintain shooting position once in optimal range (1.5 units)
-8. Use successful patterns from memory
-
-Respond in JSON format:
-{{
-    "plan": [[x1,y1], [x2,y2], [x3,y3]],
-    "reasoning": "Detailed explanation of strategy and predictions",
-    "strategy_type": "intercept|corner|pursuit|ambush",
-    "confidence": 0.0-1.0
-}}"""
-
         try:
-            response = await self._query_ollama(prompt)
-            result = self._parse_ai_response(response)
-            
-            if result and "plan" in result and "reasoning" in result:
-                return result["plan"], result["reasoning"]
-            else:
-                raise ValueError("Invalid AI response format")
+            return await self._get_backend_pool().query(prompt, accept)
                 
         except Exception as e:
             logger.error(f"AI planning error: {e}")
             raise
     
-    async def _query_ollama(self, prompt: str, model: str = "llama3") -> str:
-        """Query Ollama API asynchronously"""
-        try:
-            process = await asyncio.create_subprocess_exec(
-                "ollama", "run", model,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+    def _get_backend_pool(self) -> "BackendPool":
+        """Create the backend pool on first use; the local Ollama client only if no backends were given"""
+        if self.backend_pool is None:
+            from ai_core.s2_planner.backend_pool import BackendPool, LLMBackend
             
-            stdout, stderr = await process.communicate(prompt.encode())
-            
-            if process.returncode != 0:
-                raise RuntimeError(f"Ollama error: {stderr.decode()}")
-            
-            return stdout.decode().strip()
-            
-        except Exception as e:
-            logger.error(f"Ollama query failed: {e}")
-            raise
+            backends = self.backends
+            if not backends:
+                from ai_core.s2_planner.ollama_client import OllamaClient
+                
+                self.llm_client = OllamaClient()
+                backends = [LLMBackend("llama3", self.llm_client, "llama3")]
+            self.backend_pool = BackendPool(backends)
+        return self.backend_pool
     
     def _parse_ai_response(self, response: str) -> Optional[Dict]:
         """Parse AI response and extract JSON"""
@@ -174,16 +314,18 @@ Respond in JSON format:
         plan = []
         current_pos = drone_pos[:]
         
-        # Predict target movement
-        target_velocity = self._estimate_target_velocity(target_pos)
+        # Predict target movement along its likely escape route
+        self.escape_map.update_obstacles(obstacles)
+        prediction_times = [(step + 1) * 0.5 for step in range(self.plan_steps)]  # 0.5 seconds per step
+        predicted_positions = self.escape_map.predict_target_positions(drone_pos, target_pos, prediction_times)
+        target_velocity = [
+            round((predicted_positions[0][0] - target_pos[0]) / prediction_times[0], 2),
+            round((predicted_positions[0][1] - target_pos[1]) / prediction_times[0], 2)
+        ]
         
         for step in range(self.plan_steps):
             # Predict where target will be
-            prediction_time = (step + 1) * 0.5  # 0.5 seconds per step
-            predicted_target_pos = [
-                target_pos[0] + target_velocity[0] * prediction_time,
-                target_pos[1] + target_velocity[1] * prediction_time
-            ]
+            predicted_target_pos = predicted_positions[step]
             
             # Plan interception point
             interception_point = self._calculate_interception_point(
@@ -204,6 +346,35 @@ Respond in JSON format:
         
         reasoning = f"Algorithmic engagement plan: {range_status}. Target velocity: {target_velocity}"
         
+        # Sampled mode: the greedy plan competes with hundreds of candidates
+        if self.plan_search is not None:
+            result = self.plan_search.search(
+                drone_pos, target_pos, obstacles,
+                predict=lambda times: self.escape_map.predict_target_positions(drone_pos, target_pos, times),
+                baseline=plan
+            )
+            plan = result.plan.tolist()
+            reasoning += (f". Best of {result.candidates} sampled candidates "
+                          f"(score {result.score:.2f}, greedy {result.baseline_score:.2f})")
+        
+        return plan, reasoning
+    
+    def _create_mcts_plan(self, drone_pos: List[float], target_pos: List[float],
+                          obstacles: List[Dict], deadline: Optional[float] = None) -> Tuple[List[List[float]], str]:
+        """Create plan by tree search against a simulated evading target"""
+        self.escape_map.update_obstacles(obstacles)
+        
+        # Stay inside the decision's budget as well as the planner's own
+        budget = self.mcts.time_budget
+        if deadline is not None:
+            budget = max(0.0, min(budget, deadline - time.monotonic()))
+        
+        plan, value = self.mcts.plan(drone_pos, target_pos, self.escape_map, time_budget=budget)
+        stats = self.mcts.last_stats
+        reasoning = (f"MCTS pursuit plan: expected engagement value {value:.2f} from "
+                     f"{stats['rollouts']} rollouts ({stats['iterations']} batches, "
+                     f"{stats['elapsed_ms']:.0f} ms)")
+        
         return plan, reasoning
     
     def _create_emergency_plan(self, drone_pos: List[float], target_pos: List[float], 
@@ -329,14 +500,16 @@ Respond in JSON format:
         
         return self._clamp_to_bounds(interception_point)
     
-    def _estimate_target_velocity(self, target_pos: List[float]) -> List[float]:
-        """Estimate target velocity based on position"""
-        # Simplified - assume target moves away from center
-        center = [self.grid_size / 2, self.grid_size / 2]
-        direction = self._get_direction_vector(center, target_pos)
-        speed = 1.8  # Realistic human jogging speed (3.0 * 0.6 base multiplier)
-        
-        return [direction[0] * speed, direction[1] * speed]
+    def get_planning_metrics(self) -> Dict:
+        """LLM query outcomes, anytime upgrades, plan cache and backend latency"""
+        return {
+            **self.llm_stats,
+            "anytime": dict(self.anytime_stats),
+            "plan_cache": self.plan_cache.get_metrics(),
+            "last_prompt": dict(self.prompt_builder.last_stats),
+            "llm_client": self.llm_client.get_stats() if self.llm_client is not None else {},
+            "backends": self.backend_pool.get_stats() if self.backend_pool is not None else {}
+        }
     
     def _get_direction_vector(self, from_pos: List[float], to_pos: List[float]) -> List[float]:
         """Get normalized direction vector"""
@@ -399,21 +572,3 @@ Respond in JSON format:
             max(0.5, min(self.grid_size - 0.5, pos[0])),
             max(0.5, min(self.grid_size - 0.5, pos[1]))
         ]
-    
-    def _format_pos(self, pos: List[float]) -> str:
-        """Format position for display"""
-        return f"[{pos[0]:.1f}, {pos[1]:.1f}]"
-    
-    def _format_obstacles_for_prompt(self, obstacles: List[Dict]) -> str:
-        """Format obstacles for AI prompt"""
-        formatted = []
-        for obs in obstacles:
-            if isinstance(obs, dict):
-                pos_str = self._format_pos(obs["position"])
-                obs_type = obs.get("type", "unknown")
-                blocks_target = obs.get("blocks_target", True)
-                formatted.append(f"{pos_str} ({obs_type}, blocks_target: {blocks_target})")
-            else:
-                # Legacy format
-                formatted.append(self._format_pos(obs))
-        return formatted
\ No newline at end of file
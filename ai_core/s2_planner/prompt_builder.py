@@ -0,0 +1,208 @@
+"""
+Prompt Builder for Hunter Drone AI
+Token-budgeted planning prompts with corridor obstacle pruning
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Compass sectors for atan2 / (pi/4), counter-clockwise from East (+x), North is +y
+_SECTORS = ("E", "NE", "N", "NW", "W", "SW", "S", "SE")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English and JSON)"""
+    return (len(text) + 3) // 4
+
+def obstacle_arrays(obstacles: List) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """(positions (N, 2), blocks_target (N,), types) from dict or legacy list obstacles"""
+    positions = np.empty((len(obstacles), 2))
+    blocks_target = np.ones(len(obstacles), dtype=bool)
+    types = []
+    for i, obstacle in enumerate(obstacles):
+        # Handle both old format (list) and new format (dict)
+        if isinstance(obstacle, dict):
+            positions[i] = obstacle["position"][:2]
+            blocks_target[i] = obstacle.get("blocks_target", True)
+            types.append(obstacle.get("type", "unknown"))
+        else:
+            positions[i] = obstacle[:2]
+            types.append("unknown")
+    return positions, blocks_target, types
+
+class PlanningPromptBuilder:
+    """Builds the interception prompt within a token budget
+
+    The prompt is split into a static prefix (role, environment, skills,
+    strategy and response format) that is identical across calls and built
+    once per configuration, and a per-decision suffix (memory, situation,
+    task). Keeping the shared text first lets servers that reuse the KV
+    cache of a matching prompt prefix (Ollama/llama.cpp do) skip most of
+    the prompt evaluation.
+
+    Only obstacles within corridor_radius of the drone-target segment are
+    listed, nearest the segment first and at most max_obstacles; the rest
+    are summarized as counts by compass bearing from the target. If the
+    prompt still exceeds token_budget, listed obstacles move into the
+    summary, then trailing memory lines are dropped.
+    """
+
+    def __init__(self, grid_size: int, plan_steps: int, max_speed: float, max_acceleration: float,
+                 skills: Dict[str, str], token_budget: int = 1500, max_obstacles: int = 12,
+                 corridor_radius: float = 2.5):
+        self.grid_size = grid_size
+        self.plan_steps = plan_steps
+        self.max_speed = max_speed
+        self.max_acceleration = max_acceleration
+        self.skills = skills
+        self.token_budget = token_budget
+        self.max_obstacles = max_obstacles
+        self.corridor_radius = corridor_radius
+
+        self._prefix_key: Tuple = ()
+        self._prefix = ""
+        self._prefix_tokens = 0
+        self.last_stats: Dict[str, int] = {}
+
+    def static_prefix(self) -> Tuple[str, int]:
+        """(prefix text, estimated tokens), rebuilt only when its inputs change"""
+        key = (self.grid_size, self.plan_steps, self.max_speed, self.max_acceleration,
+               tuple(self.skills.items()))
+        if key != self._prefix_key:
+            self._prefix = self._render_prefix()
+            self._prefix_tokens = estimate_tokens(self._prefix)
+            self._prefix_key = key
+        return self._prefix, self._prefix_tokens
+
+    def _render_prefix(self) -> str:
+        skills = "\n".join(f"- {skill}: {desc}" for skill, desc in self.skills.items())
+        return f"""You are an expert hunter drone strategist. You control a drone hunting an evasive target.
+
+ENVIRONMENT:
+- Grid Size: {self.grid_size}x{self.grid_size} units (each unit = 10ft)
+- Drone: Max speed {self.max_speed} ft/s (~35 mph), Max acceleration {self.max_acceleration} ft/s² - CAN FLY OVER OBSTACLES
+- Target: Human runner (~25 mph max), ground-bound, CANNOT fly over obstacles - must navigate around them
+- Speed Advantage: Drone is ~40% faster than target and has aerial mobility
+- WEAPONS: Must neutralize target within shooting range (max 2.5 units, optimal 1.5 units)
+- MISSION: Position within range and engage - NOT capture by proximity
+
+AVAILABLE SKILLS:
+{skills}
+
+STRATEGY CONSIDERATIONS:
+1. AERIAL ADVANTAGE: You can fly directly over obstacles while target must go around
+2. ENGAGEMENT RANGE: Must get within 2.5 units to neutralize (optimal: 1.5 units)
+3. Predict target's likely escape routes (limited by ground obstacles)
+4. Use obstacles to cut off target's escape paths - you can fly over them to intercept
+5. Plan positioning for engagement, not just pursuit - STOP WHEN IN RANGE
+6. Target will seek cover behind obstacles - use your flight to bypass this
+7. Maintain shooting position once in optimal range (1.5 units)
+8. Use successful patterns from memory
+
+Respond in JSON format:
+{{
+    "plan": [[x1,y1], [x2,y2], [x3,y3]],
+    "reasoning": "Detailed explanation of strategy and predictions",
+    "strategy_type": "intercept|corner|pursuit|ambush",
+    "confidence": 0.0-1.0
+}}
+"""
+
+    def rank_obstacles(self, drone_pos: List[float], target_pos: List[float],
+                       positions: np.ndarray) -> np.ndarray:
+        """Indices of obstacles inside the corridor, nearest the segment first"""
+        if len(positions) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        drone = np.asarray(drone_pos[:2], dtype=float)
+        segment = np.asarray(target_pos[:2], dtype=float) - drone
+        length_sq = float(segment @ segment)
+
+        offsets = positions - drone
+        if length_sq > 1e-12:
+            along = np.clip(offsets @ segment / length_sq, 0.0, 1.0)
+            offsets = offsets - along[:, None] * segment
+        corridor_distance = np.hypot(offsets[:, 0], offsets[:, 1])
+
+        inside = np.flatnonzero(corridor_distance <= self.corridor_radius)
+        if len(inside) > self.max_obstacles:
+            nearest = np.argpartition(corridor_distance[inside], self.max_obstacles - 1)
+            inside = inside[nearest[:self.max_obstacles]]
+        return inside[np.argsort(corridor_distance[inside], kind="stable")]
+
+    def build(self, drone_pos: List[float], target_pos: List[float], obstacles: List,
+              memory_text: str, target_direction: str) -> str:
+        """Full prompt: cached prefix + budgeted situation suffix"""
+        prefix, prefix_tokens = self.static_prefix()
+        positions, blocks_target, types = obstacle_arrays(obstacles)
+        ranked = self.rank_obstacles(drone_pos, target_pos, positions)
+        memory_lines = memory_text.split("\n")
+
+        listed = len(ranked)
+        while True:
+            suffix = self._render_suffix(drone_pos, target_pos, target_direction,
+                                         positions, blocks_target, types, ranked[:listed],
+                                         "\n".join(memory_lines))
+            overflow = prefix_tokens + estimate_tokens(suffix) - self.token_budget
+            if overflow <= 0:
+                break
+            if listed > 0:
+                # ~10 tokens per listed obstacle
+                listed = max(0, listed - max(1, overflow // 10))
+            elif len(memory_lines) > 1:
+                memory_lines.pop()
+            else:
+                break
+
+        self.last_stats = {
+            "prompt_tokens": prefix_tokens + estimate_tokens(suffix),
+            "prefix_tokens": prefix_tokens,
+            "obstacles_listed": listed,
+            "obstacles_summarized": len(positions) - listed
+        }
+        return prefix + suffix
+
+    def _render_suffix(self, drone_pos: List[float], target_pos: List[float], target_direction: str,
+                       positions: np.ndarray, blocks_target: np.ndarray, types: List[str],
+                       listed: np.ndarray, memory_text: str) -> str:
+        distance = math.hypot(target_pos[0] - drone_pos[0], target_pos[1] - drone_pos[1])
+
+        lines = [
+            "",
+            "MEMORY CONTEXT:",
+            memory_text,
+            "",
+            "CURRENT SITUATION:",
+            f"- Drone Position: [{drone_pos[0]:.1f}, {drone_pos[1]:.1f}]",
+            f"- Target Position: [{target_pos[0]:.1f}, {target_pos[1]:.1f}]",
+            f"- Distance to Target: {distance:.2f} units",
+            f"- Target Direction: {target_direction}",
+            f"- Obstacles near the drone-target corridor ({len(listed)} of {len(positions)}):"
+        ]
+        for i in listed:
+            blocking = "blocks target" if blocks_target[i] else "passable"
+            lines.append(f"  [{positions[i, 0]:.1f}, {positions[i, 1]:.1f}] {types[i]}, {blocking}")
+
+        lines.append(self._summarize_rest(target_pos, positions, blocks_target, listed))
+        lines += [
+            "",
+            f"TASK: Create a {self.plan_steps}-step interception plan. The target is ACTIVELY EVADING - "
+            "predict where it will go and intercept it there. Respond in the JSON format above."
+        ]
+        return "\n".join(lines)
+
+    def _summarize_rest(self, target_pos: List[float], positions: np.ndarray,
+                        blocks_target: np.ndarray, listed: np.ndarray) -> str:
+        rest = np.ones(len(positions), dtype=bool)
+        rest[listed] = False
+        count = int(rest.sum())
+        if count == 0:
+            return "- No other obstacles"
+
+        offsets = positions[rest] - np.asarray(target_pos[:2], dtype=float)
+        sectors = np.round(np.arctan2(offsets[:, 1], offsets[:, 0]) / (math.pi / 4)).astype(int) % 8
+        counts = np.bincount(sectors, minlength=8)
+        by_bearing = ", ".join(f"{name} {n}" for name, n in zip(_SECTORS, counts) if n)
+        return (f"- {count} other obstacles ({int(blocks_target[rest].sum())} block target), "
+                f"by bearing from target: {by_bearing}")
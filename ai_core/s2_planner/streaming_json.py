@@ -0,0 +1,93 @@
+"""
+Streaming JSON Extraction
+Finds the first complete JSON object in LLM output as tokens arrive
+"""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+# Characters that can change nesting or string state
+_STRUCTURAL = re.compile(r'[{}\[\]"\\]')
+
+class StreamingJSONParser:
+    """Incremental scanner for the first JSON object in a token stream
+
+    feed() each chunk as it arrives; it returns the parsed object as soon as
+    the brace that closes it is seen, so the caller can stop generation
+    without waiting for trailing prose. Only structural characters are
+    visited, and string/escape state carries across chunk boundaries.
+    A balanced {...} that is not valid JSON (braces in prose) is skipped
+    and scanning resumes after its opening brace.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self.object_text = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def complete(self) -> bool:
+        return self.result is not None
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Add a chunk; the parsed object once it has closed, else None"""
+        if self.result is not None:
+            return self.result
+
+        self.text += chunk
+        text = self.text
+        pos = self._pos
+
+        while True:
+            if self._escaped:
+                # The escaped character itself is inert
+                if pos >= len(text):
+                    break
+                self._escaped = False
+                pos += 1
+                continue
+
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char = match.group()
+            pos = match.end()
+
+            if self._depth == 0:
+                if char == "{":
+                    self._start = match.start()
+                    self._depth = 1
+            elif self._in_string:
+                if char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = text[self._start:pos]
+                    try:
+                        parsed = json.loads(candidate)
+                    except ValueError:
+                        parsed = None
+                    if isinstance(parsed, dict):
+                        self.result = parsed
+                        self.object_text = candidate
+                        self._pos = pos
+                        return parsed
+                    # Not an object after all: rescan just past its opening brace
+                    pos = self._start + 1
+
+        self._pos = pos
+        return None
@@ -0,0 +1,66 @@
+"""
+Vectorized Intercept Solver
+Computes intercept times and points for many targets (and pursuer speeds) at once
+"""
+
+import numpy as np
+from typing import Union
+from dataclasses import dataclass
+
+
+@dataclass
+class InterceptSolution:
+    """Batched intercept results
+
+    Shapes follow NumPy broadcasting of the inputs: for N targets in D
+    dimensions and a scalar speed, times is (N,) and points is (N, D).
+    Passing speeds of shape (S, 1) gives times (S, N) and points (S, N, D).
+    """
+    times: np.ndarray      # seconds until intercept
+    points: np.ndarray     # predicted target position at intercept
+    feasible: np.ndarray   # True where the intercept triangle has a positive root
+
+
+def solve_intercepts(pursuer_position: np.ndarray,
+                     target_positions: np.ndarray,
+                     target_velocities: np.ndarray,
+                     pursuer_speed: Union[float, np.ndarray] = 10.0,
+                     min_time: float = 0.1) -> InterceptSolution:
+    """Solve the intercept triangle for every target in one pass
+
+    Works in any number of dimensions (the last axis holds coordinates), so
+    S1 uses it with 3D positions and S2 with 2D grid positions. Where no
+    intercept exists (no real root, or only intercepts in the past), or the
+    target speed matches the pursuer speed, the time falls back to
+    straight-line distance / speed.
+    """
+    pursuer_position = np.asarray(pursuer_position, dtype=float)
+    target_positions = np.asarray(target_positions, dtype=float)
+    target_velocities = np.asarray(target_velocities, dtype=float)
+    speed = np.asarray(pursuer_speed, dtype=float)
+
+    relative_pos = target_positions - pursuer_position
+
+    # Quadratic |r + v t| = s t  ->  a t^2 + b t + c = 0
+    a = np.einsum('...i,...i->...', target_velocities, target_velocities) - speed ** 2
+    b = 2.0 * np.einsum('...i,...i->...', relative_pos, target_velocities)
+    c = np.einsum('...i,...i->...', relative_pos, relative_pos)
+    a, b, c = np.broadcast_arrays(a, b, c)
+
+    discriminant = b ** 2 - 4.0 * a * c
+    solvable = (discriminant >= 0) & (np.abs(a) >= 0.001)
+
+    # Evaluate roots only where they are defined to avoid warnings
+    safe_a = np.where(solvable, a, 1.0)
+    sqrt_disc = np.sqrt(np.where(solvable, discriminant, 0.0))
+    t1 = (-b + sqrt_disc) / (2.0 * safe_a)
+    t2 = (-b - sqrt_disc) / (2.0 * safe_a)
+    root = np.where(t1 > 0, t1, t2)
+    feasible = solvable & (root > 0)
+
+    fallback = np.sqrt(c) / speed
+    times = np.maximum(min_time, np.where(feasible, root, fallback))
+
+    points = target_positions + target_velocities * times[..., np.newaxis]
+
+    return InterceptSolution(times=times, points=points, feasible=feasible)
@@ -0,0 +1,350 @@
+"""
+Terrain Heightfield
+Procedural elevation grid with batched height and ray queries
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+import yaml
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+DEFAULT_TERRAIN_CONFIG = Path(__file__).resolve().parents[1] / "configs" / "terrain_config.yaml"
+
+
+def fractal_noise(x: np.ndarray,
+                  z: np.ndarray,
+                  seed: int,
+                  scale: float = 0.01,
+                  octaves: int = 4,
+                  persistence: float = 0.5,
+                  lacunarity: float = 2.0) -> np.ndarray:
+    """Multi-octave 2D Perlin gradient noise, roughly in [-1, 1]"""
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(0.0, 2.0 * np.pi, (octaves, 256, 256))
+    gradients = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+
+    total = np.zeros(np.broadcast(x, z).shape)
+    amplitude = 1.0
+    frequency = scale
+    amplitude_sum = 0.0
+    for octave in range(octaves):
+        u = x * frequency
+        v = z * frequency
+        u0 = np.floor(u)
+        v0 = np.floor(v)
+        fu = u - u0
+        fv = v - v0
+        i0 = u0.astype(int) & 255
+        j0 = v0.astype(int) & 255
+        i1 = (i0 + 1) & 255
+        j1 = (j0 + 1) & 255
+
+        table = gradients[octave]
+        dot = lambda i, j, du, dv: table[i, j, 0] * du + table[i, j, 1] * dv
+        n00 = dot(i0, j0, fu, fv)
+        n10 = dot(i1, j0, fu - 1.0, fv)
+        n01 = dot(i0, j1, fu, fv - 1.0)
+        n11 = dot(i1, j1, fu - 1.0, fv - 1.0)
+
+        # Quintic fade
+        su = fu * fu * fu * (fu * (fu * 6.0 - 15.0) + 10.0)
+        sv = fv * fv * fv * (fv * (fv * 6.0 - 15.0) + 10.0)
+        nx0 = n00 + su * (n10 - n00)
+        nx1 = n01 + su * (n11 - n01)
+        total += amplitude * (nx0 + sv * (nx1 - nx0))
+
+        amplitude_sum += amplitude
+        amplitude *= persistence
+        frequency *= lacunarity
+
+    # 2D Perlin noise spans about +-sqrt(0.5)
+    return total / (amplitude_sum * np.sqrt(0.5))
+
+
+class Heightfield:
+    """Regular elevation grid over the x/z plane (y is up)
+
+    heights[i, j] is the ground height at (x_min + i * resolution,
+    z_min + j * resolution). Between samples the surface is bilinear; queries
+    outside the grid clamp to the edge for heights, and rays that leave the
+    grid are treated as misses. A max-height mip pyramid over the grid cells
+    lets ray casting skip whole tiles the ray passes above.
+    """
+
+    def __init__(self, heights: np.ndarray, resolution: float, x_min: float, z_min: float):
+        # Plain ndarray view (still backed by the memory map) for cheap indexing
+        self.heights = heights.view(np.ndarray)
+        self.resolution = float(resolution)
+        self.x_min = float(x_min)
+        self.z_min = float(z_min)
+        self.shape = heights.shape
+        self.x_max = self.x_min + (self.shape[0] - 1) * self.resolution
+        self.z_max = self.z_min + (self.shape[1] - 1) * self.resolution
+        self.max_levels = self._build_max_levels()
+
+    @classmethod
+    def from_config(cls,
+                    config: Union[str, Path, Dict[str, Any], None] = None,
+                    cache_dir: Union[str, Path, None] = None) -> "Heightfield":
+        """Generate (or load from the memory-mapped cache) the terrain described by a terrain config
+
+        The grid is centred on the origin. Generated grids are written once
+        to cache_dir as .npy files named by a hash of the generation and
+        elevation settings, and later loads memory-map them read-only.
+        """
+        if config is None or isinstance(config, (str, Path)):
+            with open(config or DEFAULT_TERRAIN_CONFIG, 'r') as f:
+                config = yaml.safe_load(f)
+
+        generation = config.get("generation", {})
+        elevation = config.get("elevation", {})
+        size_x, size_z = generation.get("size", [1000, 1000])
+        resolution = generation.get("resolution", 2.0)
+
+        key = hashlib.sha1(json.dumps({"generation": generation, "elevation": elevation},
+                                      sort_keys=True).encode()).hexdigest()[:16]
+        cache_dir = Path(cache_dir) if cache_dir is not None else Path(tempfile.gettempdir()) / "drone_terrain"
+        cache_path = cache_dir / f"heightfield_{key}.npy"
+
+        if not cache_path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            heights = cls.generate(config)
+            # Write then rename so concurrent loaders never see a partial file
+            partial_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(partial_path, 'wb') as f:
+                np.save(f, heights)
+            os.replace(partial_path, cache_path)
+
+        heights = np.load(cache_path, mmap_mode='r')
+        return cls(heights, resolution, -size_x / 2.0, -size_z / 2.0)
+
+    @staticmethod
+    def generate(config: Dict[str, Any]) -> np.ndarray:
+        """Elevation samples (float32) for a terrain config"""
+        generation = config.get("generation", {})
+        elevation = config.get("elevation", {})
+        size_x, size_z = generation.get("size", [1000, 1000])
+        resolution = generation.get("resolution", 2.0)
+        min_height = elevation.get("min_height", 0.0)
+        max_height = elevation.get("max_height", 50.0)
+
+        xs = np.arange(int(round(size_x / resolution)) + 1) * resolution - size_x / 2.0
+        zs = np.arange(int(round(size_z / resolution)) + 1) * resolution - size_z / 2.0
+        noise = fractal_noise(
+            xs[:, np.newaxis], zs[np.newaxis, :],
+            seed=generation.get("seed", 0),
+            scale=elevation.get("noise_scale", 0.01),
+            octaves=elevation.get("octaves", 4),
+            persistence=elevation.get("persistence", 0.5),
+            lacunarity=elevation.get("lacunarity", 2.0)
+        )
+        normalized = np.clip(0.5 * (noise + 1.0), 0.0, 1.0)
+        return (min_height + normalized * (max_height - min_height)).astype(np.float32)
+
+    def _build_max_levels(self) -> List[np.ndarray]:
+        """Max-height pyramid: level 0 is per cell, level k covers 2^k x 2^k cells"""
+        h = np.asarray(self.heights)
+        cell_max = np.maximum(np.maximum(h[:-1, :-1], h[1:, :-1]), np.maximum(h[:-1, 1:], h[1:, 1:]))
+        levels = [cell_max]
+        while max(levels[-1].shape) > 1:
+            level = levels[-1]
+            rows, cols = level.shape
+            padded = np.full((rows + rows % 2, cols + cols % 2), -np.inf, dtype=level.dtype)
+            padded[:rows, :cols] = level
+            levels.append(padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).max(axis=(1, 3)))
+        return levels
+
+    @property
+    def max_height(self) -> float:
+        return float(self.max_levels[-1][0, 0])
+
+    def height_at(self, x: Union[float, np.ndarray], z: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Bilinear ground height at world (x, z); accepts arrays of any matching shape"""
+        scalar = np.ndim(x) == 0 and np.ndim(z) == 0
+        gx = np.clip((np.asarray(x, dtype=float) - self.x_min) / self.resolution, 0.0, self.shape[0] - 1)
+        gz = np.clip((np.asarray(z, dtype=float) - self.z_min) / self.resolution, 0.0, self.shape[1] - 1)
+        i = np.minimum(gx.astype(int), self.shape[0] - 2)
+        j = np.minimum(gz.astype(int), self.shape[1] - 2)
+        fx = gx - i
+        fz = gz - j
+
+        h = self.heights
+        near = h[i, j] + fx * (h[i + 1, j] - h[i, j])
+        far = h[i, j + 1] + fx * (h[i + 1, j + 1] - h[i, j + 1])
+        heights = near + fz * (far - near)
+        return float(heights) if scalar else heights
+
+    def heights_at(self, points: np.ndarray) -> np.ndarray:
+        """Ground height below each (x, y, z) point, shape (..., 3) -> (...)"""
+        points = np.asarray(points, dtype=float)
+        return self.height_at(points[..., 0], points[..., 2])
+
+    def altitude_above_ground(self, position) -> float:
+        """Height of a point above the terrain surface"""
+        return float(position[1]) - self.height_at(position[0], position[2])
+
+    def raycast(self, origin: np.ndarray, directions: np.ndarray, max_range: float) -> np.ndarray:
+        """Distance along each unit ray to the terrain surface, max_range on a miss
+
+        origin is a single (3,) point or one (K, 3) origin per ray. Rays walk
+        the max-height mip pyramid: each step tests tiles from the ray's
+        start level down to single cells and skips the coarsest tile the ray
+        stays above for its whole crossing. A ray starts its next step one
+        level above the one it just cleared. A ray that cannot clear its own
+        cell is intersected with the cell's bilinear surface analytically:
+        along the ray, surface height is quadratic in t, so the hit is the
+        smallest root in the cell (_cell_intersection).
+        """
+        directions = np.asarray(directions, dtype=float)
+        origins = np.broadcast_to(np.asarray(origin, dtype=float), directions.shape)
+        ranges = np.full(len(directions), float(max_range))
+        if len(directions) == 0:
+            return ranges
+
+        res = self.resolution
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inverse = 1.0 / directions
+
+        # Clip each ray to the grid footprint and to the part below the highest tile
+        t_start = np.zeros(len(directions))
+        t_end = np.full(len(directions), float(max_range))
+        for axis, low, high in ((0, self.x_min, self.x_max), (2, self.z_min, self.z_max)):
+            with np.errstate(invalid='ignore'):
+                t_low = (low - origins[:, axis]) * inverse[:, axis]
+                t_high = (high - origins[:, axis]) * inverse[:, axis]
+            parallel = directions[:, axis] == 0.0
+            inside = (origins[:, axis] >= low) & (origins[:, axis] <= high)
+            t_start = np.where(parallel, np.where(inside, t_start, np.inf),
+                               np.maximum(t_start, np.minimum(t_low, t_high)))
+            t_end = np.where(parallel, t_end, np.minimum(t_end, np.maximum(t_low, t_high)))
+        # Only the stretch of each ray below the highest terrain point can hit
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_top = (self.max_height - origins[:, 1]) * inverse[:, 1]
+        rising = directions[:, 1] > 0.0
+        falling = directions[:, 1] < 0.0
+        t_end = np.where(rising, np.minimum(t_end, t_top), t_end)
+        t_start = np.where(falling, np.maximum(t_start, t_top), t_start)
+        level_above = (directions[:, 1] == 0.0) & (origins[:, 1] > self.max_height)
+        active = np.flatnonzero((t_start <= t_end) & ~level_above)
+
+        t = t_start[active]
+        t_stop = t_end[active]
+        step_eps = 1e-6 * res
+        levels = self.max_levels
+        max_iterations = 4 * sum(self.shape)
+        top_level = len(levels) - 1
+        # Level each ray starts its search at; one above the last level it cleared
+        ray_level = np.full(len(active), top_level)
+
+        for _ in range(max_iterations):
+            if len(active) == 0:
+                break
+            o = origins[active]
+            d = directions[active]
+            inv = inverse[active]
+            p = o + d * t[:, np.newaxis]
+            # Nudge along the ray so points on a cell boundary land in the cell being entered
+            cell_x = np.clip(np.floor((p[:, 0] - self.x_min) / res + 1e-6 * np.sign(d[:, 0])).astype(int),
+                             0, self.shape[0] - 2)
+            cell_z = np.clip(np.floor((p[:, 2] - self.z_min) / res + 1e-6 * np.sign(d[:, 2])).astype(int),
+                             0, self.shape[1] - 2)
+
+            # Coarsest tile the ray clears over its whole crossing, if any;
+            # rays drop to finer levels only while they have not cleared one
+            advance = np.full(len(active), -1.0)
+            cleared_level = np.ones(len(active), dtype=int)
+            cell_exit = np.empty(len(active))
+            heading = (d[:, 0] > 0).astype(int), (d[:, 2] > 0).astype(int)
+            height_now = o[:, 1] + d[:, 1] * t
+            pending = np.zeros(0, dtype=int)
+            for level_index in range(top_level, -1, -1):
+                joining = np.flatnonzero(ray_level == level_index)
+                if len(joining):
+                    pending = np.concatenate([pending, joining])
+                if len(pending) == 0:
+                    continue
+                tile_size = (1 << level_index) * res
+                tile_x = cell_x[pending] >> level_index
+                tile_z = cell_z[pending] >> level_index
+                op, ip = o[pending], inv[pending]
+                with np.errstate(invalid='ignore'):
+                    exit_x = (self.x_min + (tile_x + heading[0][pending]) * tile_size - op[:, 0]) * ip[:, 0]
+                    exit_z = (self.z_min + (tile_z + heading[1][pending]) * tile_size - op[:, 2]) * ip[:, 2]
+                t_exit = np.fmin(np.where(np.isfinite(ip[:, 0]), exit_x, np.inf),
+                                 np.where(np.isfinite(ip[:, 2]), exit_z, np.inf))
+                t_exit = np.minimum(np.maximum(t_exit, t[pending]), t_stop[pending])
+                lowest = np.minimum(height_now[pending], op[:, 1] + d[pending, 1] * t_exit)
+                clears = lowest > levels[level_index][tile_x, tile_z]
+                advance[pending[clears]] = t_exit[clears]
+                cleared_level[pending[clears]] = level_index + 1
+                pending = pending[~clears]
+                if level_index == 0:
+                    cell_exit[pending] = t_exit[~clears]
+
+            # Rays not clearing even their own cell: intersect the bilinear patch exactly
+            in_cell = advance < 0
+            hit = np.zeros(len(active), dtype=bool)
+            if np.any(in_cell):
+                ray = np.flatnonzero(in_cell)
+                t0 = t[ray]
+                t1 = cell_exit[ray]
+                hit_t = self._cell_intersection(o[ray], d[ray], cell_x[ray], cell_z[ray], t0, t1)
+                found = hit_t <= t1
+                hit[ray[found]] = True
+                t[ray[found]] = hit_t[found]
+                advance[ray[~found]] = t1[~found]
+
+            ranges[active[hit]] = np.minimum(t[hit], max_range)
+            t = advance + step_eps
+            keep = ~hit & (t < t_stop)
+            active, t, t_stop = active[keep], t[keep], t_stop[keep]
+            ray_level = np.minimum(cleared_level[keep], top_level)
+
+        return ranges
+
+    def _cell_intersection(self,
+                           origins: np.ndarray,
+                           directions: np.ndarray,
+                           cell_x: np.ndarray,
+                           cell_z: np.ndarray,
+                           t0: np.ndarray,
+                           t1: np.ndarray) -> np.ndarray:
+        """First t in [t0, t1] where each ray meets its cell's bilinear surface, inf if none
+
+        Along a ray the bilinear height is quadratic in t, so ray height minus
+        surface height is a quadratic whose smallest root in range is the hit.
+        """
+        h = self.heights
+        h00 = h[cell_x, cell_z]
+        slope_x = h[cell_x + 1, cell_z] - h00
+        slope_z = h[cell_x, cell_z + 1] - h00
+        twist = h[cell_x + 1, cell_z + 1] - h00 - slope_x - slope_z
+
+        # Cell-local coordinates fx = ax + bx t, fz = az + bz t
+        ax = (origins[:, 0] - self.x_min) / self.resolution - cell_x
+        az = (origins[:, 2] - self.z_min) / self.resolution - cell_z
+        bx = directions[:, 0] / self.resolution
+        bz = directions[:, 2] / self.resolution
+
+        c0 = origins[:, 1] - h00 - slope_x * ax - slope_z * az - twist * ax * az
+        c1 = directions[:, 1] - slope_x * bx - slope_z * bz - twist * (ax * bz + bx * az)
+        c2 = -twist * bx * bz
+
+        gap_start = c0 + t0 * (c1 + t0 * c2)
+        hit_t = np.where(gap_start <= 0.0, t0, np.inf)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            linear_root = -c0 / c1
+            root = np.sqrt(c1 * c1 - 4.0 * c2 * c0)
+            # Numerically stable pair of quadratic roots
+            q = -0.5 * (c1 + np.copysign(root, c1))
+            roots = np.stack([np.where(np.abs(c2) > 1e-12, q / c2, linear_root),
+                              np.where(np.abs(c2) > 1e-12, c0 / q, linear_root)])
+        roots = np.where((roots >= t0) & (roots <= t1), roots, np.inf)
+        return np.minimum(hit_t, roots.min(axis=0))
+
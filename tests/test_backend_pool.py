@@ -0,0 +1,138 @@
+"""
+BackendPool hedging, failover and health tracking
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from ai_core.s2_planner.backend_pool import BackendPool, LLMBackend
+from ai_core.s2_planner.planner import DronePlanner
+
+
+class FakeClient:
+    """Stands in for OllamaClient: answers (or raises) after latency seconds"""
+
+    def __init__(self, response: str = "ok", latency: float = 0.0, error: Exception = None):
+        self.response = response
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+
+    async def generate_json(self, prompt: str, model: str = "llama3") -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    generate = generate_json
+
+    async def close(self):
+        pass
+
+
+def _accept_ok(response: str):
+    return response if response.startswith("ok") else None
+
+
+def _query(pool: BackendPool, accept=_accept_ok):
+    async def scenario():
+        started = time.monotonic()
+        result = await pool.query("plan please", accept)
+        # Let cancelled attempts record their outcome
+        await asyncio.sleep(0.01)
+        return result, time.monotonic() - started
+
+    return asyncio.run(scenario())
+
+
+def test_slow_primary_is_hedged_to_the_next_backend():
+    slow = LLMBackend("slow", FakeClient("ok slow", latency=2.0))
+    fast = LLMBackend("fast", FakeClient("ok fast", latency=0.01))
+    pool = BackendPool([slow, fast], hedge_delay=0.05)
+
+    result, elapsed = _query(pool)
+
+    assert result == "ok fast"
+    assert elapsed < 1.0
+    assert pool.hedges == 1
+    assert fast.stats.wins == 1
+    # The losing attempt was cancelled, and counts as at least that slow
+    assert slow.stats.cancelled == 1 and slow.stats.ewma_latency >= 0.05
+
+
+def test_no_hedge_when_the_primary_answers_in_time():
+    first = LLMBackend("first", FakeClient("ok first", latency=0.01))
+    second = LLMBackend("second", FakeClient("ok second"))
+    pool = BackendPool([first, second], hedge_delay=1.0)
+
+    result, _ = _query(pool)
+
+    assert result == "ok first"
+    assert pool.hedges == 0 and second.client.calls == 0
+
+
+def test_failed_primary_fails_over_without_waiting_for_the_hedge():
+    broken = LLMBackend("broken", FakeClient(error=ConnectionError("refused")))
+    backup = LLMBackend("backup", FakeClient("ok backup", latency=0.01))
+    pool = BackendPool([broken, backup], hedge_delay=5.0)
+
+    result, elapsed = _query(pool)
+
+    assert result == "ok backup"
+    assert elapsed < 1.0
+    assert pool.hedges == 0
+    assert broken.stats.failures == 1 and backup.stats.wins == 1
+
+
+def test_rejected_answer_fails_over_and_counts_as_invalid():
+    sloppy = LLMBackend("sloppy", FakeClient("not a plan"))
+    careful = LLMBackend("careful", FakeClient("ok careful", latency=0.01))
+    pool = BackendPool([sloppy, careful], hedge_delay=5.0)
+
+    result, _ = _query(pool)
+
+    assert result == "ok careful"
+    assert sloppy.stats.invalid == 1 and sloppy.stats.successes == 1
+
+
+def test_every_backend_failing_raises():
+    pool = BackendPool([LLMBackend("a", FakeClient(error=ConnectionError("a"))),
+                        LLMBackend("b", FakeClient("nonsense"))], hedge_delay=5.0)
+
+    with pytest.raises(RuntimeError):
+        _query(pool)
+
+
+def test_repeated_failures_take_a_backend_out_of_rotation():
+    now = [100.0]
+    broken = LLMBackend("broken", FakeClient(error=ConnectionError("refused")))
+    backup = LLMBackend("backup", FakeClient("ok backup"))
+    pool = BackendPool([broken, backup], hedge_delay=5.0, failure_threshold=2,
+                       cooldown_seconds=10.0, clock=lambda: now[0])
+    # Untried backends rank first, so the broken one is tried until it is benched
+    backup.stats.ewma_latency = 1.0
+
+    for _ in range(2):
+        assert _query(pool)[0] == "ok backup"
+    assert pool.get_stats()["backends"]["broken"]["healthy"] is False
+
+    _query(pool)
+    assert broken.client.calls == 2
+
+    # Back in rotation once the cooldown has passed
+    now[0] += 10.0
+    assert pool.ranked_backends()[0] is broken
+
+
+def test_planner_with_its_own_backends_creates_no_default_client():
+    planner = DronePlanner(backends=[LLMBackend("custom", FakeClient())])
+    pool = planner._get_backend_pool()
+
+    assert pool.backends == planner.backends
+    assert planner.llm_client is None
+    assert planner.get_planning_metrics()["llm_client"] == {}
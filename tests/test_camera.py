@@ -0,0 +1,73 @@
+"""
+Camera detections in the scalar and batched sensor models
+"""
+
+import numpy as np
+
+from ai_core.s1_perception_control.sensor_models.basic_model import BasicSensorModel
+from ai_core.s1_perception_control.sensor_models.batched_model import BatchedSensorModel
+
+
+def _without_failures(model):
+    model.failure_probabilities = {sensor: 0.0 for sensor in model.failure_probabilities}
+    return model
+
+
+def test_config_without_camera_is_accepted():
+    config = BasicSensorModel._default_config()
+    del config["camera"]
+
+    model = BasicSensorModel(sensor_config=config, seed=0)
+    readings = model.simulate_sensor_suite({
+        "position": (0.0, 10.0, 0.0),
+        "target_position": (10.0, 10.0, 0.0)
+    }, timestamp=0.0)
+
+    assert model.camera is None
+    assert "camera" not in readings and "gps" in readings
+
+
+def test_occluded_obstacle_is_not_detected():
+    obstacles = [
+        {"position": [10.0, 10.0, 0.0], "size": [2.0, 2.0, 2.0], "type": "near"},
+        {"position": [20.0, 10.0, 0.0], "size": [1.0, 1.0, 1.0], "type": "hidden"},
+        {"position": [20.0, 10.0, 8.0], "size": [1.0, 1.0, 1.0], "type": "beside"}
+    ]
+    scalar = _without_failures(BasicSensorModel(seed=0))
+    batched = _without_failures(BatchedSensorModel(1, seed=0))
+
+    detections = scalar.read_camera((30.0, 10.0, 0.0), (0.0, 10.0, 0.0), obstacles).value
+    batch = batched.read_camera(np.array([[30.0, 10.0, 0.0]]), np.array([[0.0, 10.0, 0.0]]), obstacles)
+
+    assert [obstacle["type"] for obstacle in detections["obstacles_detected"]] == ["near", "beside"]
+    assert detections["targets_detected"] == []
+    assert batch["obstacles_detected"][0].tolist() == [True, False, True]
+    assert not batch["target_detected"][0]
+
+
+def test_batched_camera_matches_scalar_camera():
+    rng = np.random.default_rng(7)
+    obstacles = [
+        {"position": rng.uniform([-40, 0, -40], [40, 20, 40]).tolist(),
+         "size": rng.uniform(0.5, 4.0, 3).tolist(), "type": "rock"}
+        for _ in range(40)
+    ]
+    count = 50
+    positions = rng.uniform([-20, 5, -20], [20, 15, 20], (count, 3))
+    orientations = rng.uniform([-0.3, -0.3, -np.pi], [0.3, 0.3, np.pi], (count, 3))
+    targets = rng.uniform([-30, 0, -30], [30, 10, 30], (count, 3))
+
+    scalar = _without_failures(BasicSensorModel(seed=0))
+    batched = _without_failures(BatchedSensorModel(count, seed=0))
+    batch = batched.read_camera(targets, positions, obstacles, orientations)
+
+    for i in range(count):
+        view = scalar.camera.observe(positions[i], orientations[i], obstacles, targets[i])
+        assert np.flatnonzero(batch["obstacles_detected"][i]).tolist() == sorted(view.indices.tolist())
+        assert batch["target_detected"][i] == view.target_visible
+        np.testing.assert_allclose(batch["obstacle_pixels"][i][view.indices], view.pixels)
+        if view.target_visible:
+            np.testing.assert_allclose(batch["target_pixels"][i], view.target_pixel)
+
+    # The scene should exercise both outcomes
+    assert batch["obstacles_detected"].any() and not batch["obstacles_detected"].all()
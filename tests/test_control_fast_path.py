@@ -0,0 +1,83 @@
+"""
+Allocation checks for ControlModule.execute_command_fast
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ai_core.s1_perception_control.control_module import ControlCommand, ControlMode, ControlModule
+from ai_core.s1_perception_control.perception_module import PerceptionState
+
+WARMUP_CALLS = 200
+MEASURED_CALLS = 2000
+
+
+def _perception() -> PerceptionState:
+    return PerceptionState(
+        timestamp=0.0,
+        drone_position=(0.0, 10.0, 0.0),
+        drone_velocity=(1.0, 0.0, 0.5),
+        drone_orientation=(0.0, 0.0, 0.0),
+        target_position=(20.0, 10.0, 15.0),
+        target_velocity=(1.5, 0.0, -0.5),
+        target_visible=True,
+        target_distance=25.0,
+        target_bearing=(0.0, 0.0),
+        obstacles=[],
+        immediate_threats=[],
+        safe_directions=np.zeros((0, 2)),
+        battery_level=100.0,
+        flight_envelope={}
+    )
+
+
+def _allocated_growth(call, count: int) -> int:
+    """Net bytes still allocated by ai_core code after count calls"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(count):
+            call()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    only_ai_core = [tracemalloc.Filter(True, "*ai_core*")]
+    diff = after.filter_traces(only_ai_core).compare_to(before.filter_traces(only_ai_core), "filename")
+    return sum(stat.size_diff for stat in diff)
+
+
+@pytest.mark.parametrize("mode", [ControlMode.HOVER, ControlMode.WAYPOINT, ControlMode.INTERCEPT])
+def test_fast_path_does_not_grow_allocations(mode):
+    control = ControlModule()
+    perception = _perception()
+    command = ControlCommand(
+        command_id="fast-path", timestamp=0.0, mode=mode,
+        target_position=(10.0, 12.0, 5.0), target_velocity=None,
+        duration_ms=10_000, urgency="high", parameters={}
+    )
+
+    for _ in range(WARMUP_CALLS):
+        control.execute_command_fast(command, perception)
+
+    growth = _allocated_growth(lambda: control.execute_command_fast(command, perception), MEASURED_CALLS)
+
+    # Whatever a single tick leaves behind (e.g. the last timestamp float) is
+    # fine; anything proportional to the call count is a leak
+    assert growth < 1024, f"{mode.value}: {growth} bytes retained over {MEASURED_CALLS} calls"
+
+
+def test_fast_path_reuses_command_instance():
+    control = ControlModule()
+    perception = _perception()
+    command = ControlCommand(
+        command_id="fast-path", timestamp=0.0, mode=ControlMode.INTERCEPT,
+        target_position=None, target_velocity=None,
+        duration_ms=10_000, urgency="high", parameters={}
+    )
+
+    first = control.execute_command_fast(command, perception)
+    second = control.execute_command_fast(command, perception)
+    assert first is second
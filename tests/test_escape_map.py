@@ -0,0 +1,78 @@
+"""
+EscapeMap distance fields and target prediction
+"""
+
+import numpy as np
+
+from ai_core.s2_planner.escape_map import EscapeMap
+
+
+def _wall(x: float, y_from: float, y_to: float):
+    return [{"position": [x, y], "blocks_target": True} for y in np.arange(y_from, y_to, 0.25)]
+
+
+def _fresh_field(obstacles, target):
+    escape_map = EscapeMap(grid_size=10)
+    escape_map.update_obstacles(obstacles)
+    return escape_map.target_distance(target)
+
+
+def test_prediction_goes_around_a_wall():
+    # A wall at x=5 with a gap above y=6.5; the drone chases from the west
+    drone, target = [3.0, 5.0], [4.0, 5.0]
+    times = [0.25 * step for step in range(1, 41)]
+
+    open_field = EscapeMap(grid_size=10)
+    open_field.update_obstacles([])
+    straight = open_field.predict_target_positions(drone, target, times)
+    # With nothing in the way the target runs straight east
+    assert all(abs(y - 5.0) < 0.5 for _, y in straight)
+
+    walled = EscapeMap(grid_size=10)
+    walled.update_obstacles(_wall(5.0, 0.0, 6.0))
+    predicted = walled.predict_target_positions(drone, target, times)
+
+    free = walled.free
+    assert all(free[walled._cell(position)] for position in predicted)
+    crossings = [y for (x0, y), (x1, _) in zip(predicted, predicted[1:]) if (x0 - 5.0) * (x1 - 5.0) <= 0]
+    assert crossings and all(y > 6.5 for y in crossings)
+    assert predicted[-1][0] > 5.5
+
+    # Reaching the far side takes the detour, not the straight line
+    assert walled.time_to_reach(target, [6.0, 2.0]) > open_field.time_to_reach(target, [6.0, 2.0]) + 1.0
+
+
+def test_walled_in_cells_are_unreachable():
+    escape_map = EscapeMap(grid_size=10)
+    escape_map.update_obstacles(_wall(5.0, 0.0, 10.0))
+
+    assert escape_map.time_to_reach([3.0, 2.0], [7.0, 2.0]) is None
+    assert escape_map.time_to_reach([3.0, 2.0], [3.0, 8.0]) is not None
+
+
+def test_incremental_repair_matches_a_fresh_field():
+    rng = np.random.default_rng(0)
+    escape_map = EscapeMap(grid_size=10)
+    target = [2.1, 3.3]
+    obstacles = _wall(5.0, 0.0, 8.5)
+    escape_map.update_obstacles(obstacles)
+    escape_map.target_distance(target)
+
+    for _ in range(20):
+        # Move a few obstacles: some cells get blocked, others freed
+        for index in rng.choice(len(obstacles), size=3, replace=False):
+            obstacles[index] = {"position": list(rng.uniform(0.0, 10.0, 2)), "blocks_target": True}
+        escape_map.update_obstacles(obstacles)
+
+        repaired = escape_map.target_distance(target)
+        fresh = _fresh_field(obstacles, target)
+        assert np.array_equal(np.isinf(repaired), np.isinf(fresh))
+        assert np.allclose(repaired[np.isfinite(fresh)], fresh[np.isfinite(fresh)])
+
+
+def test_fields_are_cached_per_target_cell():
+    escape_map = EscapeMap(grid_size=10)
+    escape_map.update_obstacles(_wall(5.0, 0.0, 8.5))
+
+    first = escape_map.target_distance([3.0, 2.0])
+    assert np.shares_memory(escape_map.target_distance([3.05, 2.05]), first)
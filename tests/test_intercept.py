@@ -0,0 +1,62 @@
+"""
+Vectorized intercept solver
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.s1_perception_control.control_module import ControlModule
+from shared.intercept import solve_intercepts
+
+
+def test_moving_target_is_met_where_it_will_be():
+    positions = np.array([[100.0, 0.0, 0.0], [0.0, 40.0, 10.0]])
+    velocities = np.array([[0.0, 5.0, 0.0], [3.0, -2.0, 1.0]])
+
+    solution = solve_intercepts([0.0, 0.0, 0.0], positions, velocities, 10.0)
+
+    assert solution.feasible.all()
+    assert np.allclose(solution.points, positions + velocities * solution.times[:, None])
+    # The drone covers exactly the distance to the intercept point at full speed
+    assert np.allclose(np.linalg.norm(solution.points, axis=1), 10.0 * solution.times)
+
+
+def test_target_outrunning_the_drone_falls_back_to_straight_line_time():
+    # Running away at twice the drone's speed: both roots are in the past
+    solution = solve_intercepts([0.0, 0.0], [[10.0, 0.0]], [[20.0, 0.0]], 10.0)
+
+    assert not solution.feasible[0]
+    assert solution.times[0] == pytest.approx(1.0)
+
+
+def test_equal_speed_falls_back_to_straight_line_time():
+    solution = solve_intercepts([0.0, 0.0], [[30.0, 40.0]], [[0.0, 10.0]], 10.0)
+
+    assert not solution.feasible[0]
+    assert solution.times[0] == pytest.approx(5.0)
+
+
+def test_speeds_broadcast_against_targets():
+    positions = np.array([[10.0, 0.0], [0.0, 20.0], [5.0, 5.0]])
+    velocities = np.array([[1.0, 0.0], [0.0, -1.0], [2.0, 2.0]])
+    speeds = np.array([[5.0], [10.0]])
+
+    solution = solve_intercepts([0.0, 0.0], positions, velocities, speeds)
+
+    assert solution.times.shape == (2, 3)
+    assert solution.points.shape == (2, 3, 2)
+    for row, speed in enumerate(speeds[:, 0]):
+        single = solve_intercepts([0.0, 0.0], positions, velocities, speed)
+        assert np.allclose(solution.times[row], single.times)
+
+
+def test_fast_path_scalar_solver_matches_the_vectorized_one():
+    rng = np.random.default_rng(0)
+    control = ControlModule()
+    offsets = rng.uniform(-50.0, 50.0, (200, 3))
+    velocities = rng.uniform(-15.0, 15.0, (200, 3))
+
+    solution = solve_intercepts(np.zeros(3), offsets, velocities, control.intercept_speed)
+    scalar = [control._intercept_time_scalar(*offset, *velocity) for offset, velocity in zip(offsets, velocities)]
+
+    assert np.allclose(scalar, solution.times)
@@ -0,0 +1,57 @@
+"""
+Multi-beam 3D LiDAR sweeps
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.s1_perception_control.sensor_models.basic_model import BasicSensorModel
+from ai_core.s1_perception_control.sensor_models.lidar_3d import MultiBeamLidar
+
+
+def test_beam_pattern_covers_channels_times_azimuth_steps():
+    lidar = MultiBeamLidar(channels=8, vertical_fov=(-20.0, 10.0), horizontal_resolution=2.0)
+
+    assert lidar.beam_count == 8 * 180
+    assert np.allclose(np.linalg.norm(lidar.directions, axis=1), 1.0)
+    elevations = np.degrees(np.arcsin(lidar.directions[:, 1]))
+    assert elevations.min() == pytest.approx(-20.0) and elevations.max() == pytest.approx(10.0)
+
+
+def test_downward_channels_hit_flat_ground_at_their_slant_range():
+    lidar = MultiBeamLidar(channels=4, vertical_fov=(-30.0, 12.0), horizontal_resolution=5.0, accuracy=0.0)
+    height = 10.0
+
+    cloud = lidar.scan((0.0, height, 0.0), [], ground_height=0.0)
+
+    expected = height / np.sin(-lidar.elevations)
+    for channel, elevation in enumerate(lidar.elevations):
+        row = cloud.ranges[channel]
+        if elevation < 0 and expected[channel] < lidar.max_range:
+            assert np.allclose(row, expected[channel], rtol=1e-5)
+        else:
+            assert np.all(row == lidar.max_range)
+    # Every returned point lies on the ground plane
+    assert np.allclose(cloud.points[:, 1], 0.0, atol=1e-4)
+    assert set(cloud.channels.tolist()) == set(np.flatnonzero((lidar.elevations < 0) & (expected < lidar.max_range)))
+
+
+def test_points_on_an_obstacle_lie_on_its_surface():
+    lidar = MultiBeamLidar(accuracy=0.0)
+    obstacle = {"position": [15.0, 10.0, 0.0], "size": [3.0, 3.0, 3.0]}
+
+    cloud = lidar.scan((0.0, 10.0, 0.0), [obstacle], ground_height=None)
+
+    assert len(cloud.points) > 0
+    distances = np.linalg.norm(cloud.points - np.array(obstacle["position"]), axis=1)
+    assert np.allclose(distances, 3.0, atol=1e-3)
+
+
+def test_sensor_model_returns_a_point_cloud_reading():
+    model = BasicSensorModel(seed=0)
+    model.failure_probabilities = {sensor: 0.0 for sensor in model.failure_probabilities}
+
+    reading = model.read_lidar_3d((0.0, 10.0, 0.0), [], ground_height=0.0)
+
+    assert reading.valid and reading.sensor_type == "lidar_3d"
+    assert reading.value.ranges.shape == (model.lidar_3d.channels, len(model.lidar_3d.azimuths))
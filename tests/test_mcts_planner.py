@@ -0,0 +1,70 @@
+"""
+MCTS pursuit planning against a simulated evader
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from ai_core.s2_planner.escape_map import EscapeMap
+from ai_core.s2_planner.mcts_planner import MCTSPlanner
+
+
+def _open_map(grid_size=20, obstacles=()):
+    escape_map = EscapeMap(grid_size=grid_size)
+    escape_map.update_obstacles(list(obstacles))
+    return escape_map
+
+
+@pytest.mark.parametrize("budget", [0.01, 0.05])
+def test_search_stops_at_the_time_budget(budget):
+    planner = MCTSPlanner(grid_size=20, seed=0)
+    escape_map = _open_map()
+
+    started = time.perf_counter()
+    plan, _ = planner.plan([3.0, 3.0], [15.0, 12.0], escape_map, time_budget=budget)
+    elapsed = time.perf_counter() - started
+
+    assert len(plan) == planner.plan_steps
+    assert planner.last_stats["iterations"] >= 1
+    # At most one rollout batch past the deadline
+    assert elapsed < budget + 0.05
+
+
+def test_iteration_cap_and_seed_make_plans_reproducible():
+    escape_map = _open_map()
+
+    def run():
+        planner = MCTSPlanner(grid_size=20, time_budget=10.0, max_iterations=20, seed=4)
+        return planner.plan([3.0, 3.0], [15.0, 12.0], escape_map), planner.last_stats
+
+    (first, value), stats = run()
+    (second, _), _ = run()
+
+    assert stats["iterations"] == 20
+    assert stats["rollouts"] == 20 * 8 * 16
+    assert first == second and 0.0 <= value <= 1.5
+
+
+def test_seeded_plan_closes_distance_within_step_limits():
+    planner = MCTSPlanner(grid_size=20, max_iterations=60, time_budget=10.0, seed=1)
+    drone, target = np.array([3.0, 4.0]), np.array([14.0, 13.0])
+    escape_map = _open_map(obstacles=[{"position": [10.0, 6.0]}, {"position": [6.0, 12.0]}])
+
+    plan, _ = planner.plan(list(drone), list(target), escape_map)
+
+    path = np.vstack([drone, plan])
+    assert np.all(np.linalg.norm(np.diff(path, axis=0), axis=1) <= planner.drone_step + 1e-9)
+    assert np.linalg.norm(path[-1] - target) < np.linalg.norm(drone - target) - 2.0
+
+
+def test_nearby_target_is_valued_above_a_distant_one():
+    escape_map = _open_map()
+
+    _, near = MCTSPlanner(grid_size=20, max_iterations=30, time_budget=10.0, seed=2).plan(
+        [10.0, 10.0], [11.5, 10.0], escape_map)
+    _, far = MCTSPlanner(grid_size=20, max_iterations=30, time_budget=10.0, seed=2).plan(
+        [2.0, 2.0], [18.0, 18.0], escape_map)
+
+    assert near > far
@@ -0,0 +1,87 @@
+"""
+LinearMPCController warm start and the MPC control mode
+"""
+
+import numpy as np
+
+from ai_core.s1_perception_control.control_module import ControlCommand, ControlMode, ControlModule
+from ai_core.s1_perception_control.mpc_controller import LinearMPCController
+from ai_core.s1_perception_control.perception_module import PerceptionState
+
+
+def _solve_once(controller: LinearMPCController, timestamp: float) -> np.ndarray:
+    ref_pos, ref_vel = controller.constant_velocity_reference((10.0, 12.0, -5.0), (1.0, 0.0, 2.0))
+    return controller.compute((0.0, 10.0, 0.0), (0.0, 0.0, 0.0), ref_pos, ref_vel, timestamp=timestamp)
+
+
+def test_warm_start_advances_by_elapsed_time():
+    controller = LinearMPCController()
+    _solve_once(controller, timestamp=1.0)
+    solution = controller.solution.copy()
+
+    # A whole step later: the classic one-step shift
+    np.testing.assert_allclose(controller._warm_start(1.0 + controller.dt)[:-1], solution[1:])
+    # One 200Hz tick later: a tenth of a step, not a whole one
+    tick = controller._warm_start(1.005)
+    np.testing.assert_allclose(tick[:-1], 0.9 * solution[:-1] + 0.1 * solution[1:])
+    np.testing.assert_allclose(controller._warm_start(1.0), solution)
+
+
+def test_reset_discards_warm_start():
+    controller = LinearMPCController()
+    _solve_once(controller, timestamp=0.0)
+    controller.reset()
+
+    assert controller.solved_at is None
+    assert not controller._warm_start(0.005).any()
+
+
+def _perception(target_velocity) -> PerceptionState:
+    return PerceptionState(
+        timestamp=0.0,
+        drone_position=(0.0, 10.0, 0.0),
+        drone_velocity=(0.0, 0.0, 0.0),
+        drone_orientation=(0.0, 0.0, 0.0),
+        target_position=(20.0, 10.0, 5.0),
+        target_velocity=target_velocity,
+        target_visible=True,
+        target_distance=20.6,
+        target_bearing=(0.0, 0.0),
+        obstacles=[],
+        immediate_threats=[],
+        safe_directions=np.zeros((0, 2)),
+        battery_level=100.0,
+        flight_envelope={}
+    )
+
+
+def _command(command_id: str, mode: ControlMode = ControlMode.MPC) -> ControlCommand:
+    return ControlCommand(
+        command_id=command_id, timestamp=0.0, mode=mode,
+        target_position=None, target_velocity=None,
+        duration_ms=1000, urgency="high", parameters={}
+    )
+
+
+def test_mpc_mode_accepts_array_target_velocity():
+    control = ControlModule()
+    command = control.execute_command(_command("mpc"), _perception(np.array([1.0, 0.0, 0.5])))
+
+    assert command.mode_flags["mpc"] and command.pitch > 0.0
+
+
+def test_new_command_resets_mpc_warm_start():
+    control = ControlModule()
+    sim_time = [0.0]
+    control.clock = lambda: sim_time[0]
+
+    for tick in range(5):
+        sim_time[0] = tick * control.update_interval
+        control.execute_command(_command("first"), _perception(None))
+    assert control.mpc_controller.solved_at == sim_time[0]
+    assert control.mpc_controller.solution.any()
+
+    # Both entry points drop the old plan when the command changes
+    control.execute_command_fast(_command("second", ControlMode.HOVER), _perception(None))
+    assert control.mpc_controller.solved_at is None
+    assert not control.mpc_controller.solution.any()
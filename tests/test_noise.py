@@ -0,0 +1,61 @@
+"""
+Seeded per-sensor noise streams
+"""
+
+import numpy as np
+
+from ai_core.s1_perception_control.sensor_models.basic_model import BasicSensorModel
+from ai_core.s1_perception_control.sensor_models.noise import NoiseStream
+
+
+def test_same_seed_and_sensor_replay_the_same_draws():
+    first = NoiseStream.for_sensor("gps", seed=7)
+    second = NoiseStream.for_sensor("gps", seed=7)
+
+    assert np.array_equal(first.normal(2.0, 100), second.normal(2.0, 100))
+    assert first.uniform() == second.uniform()
+
+
+def test_sensors_get_independent_streams():
+    gps = NoiseStream.for_sensor("gps", seed=7)
+    imu = NoiseStream.for_sensor("imu", seed=7)
+
+    assert not np.array_equal(gps.normal(1.0, 100), imu.normal(1.0, 100))
+
+
+def test_draws_ignore_the_global_random_state():
+    np.random.seed(0)
+    first = NoiseStream(seed=3).normal(1.0, 10)
+    np.random.seed(1)
+    np.random.normal(size=1000)
+    second = NoiseStream(seed=3).normal(1.0, 10)
+
+    assert np.array_equal(first, second)
+
+
+def test_draws_across_block_boundaries_continue_the_sequence():
+    chunked = NoiseStream(seed=5, block_size=64)
+    whole = NoiseStream(seed=5, block_size=64)
+
+    pieces = np.concatenate([chunked.normal(1.0, 50) for _ in range(4)] + [[chunked.normal()]])
+
+    assert np.array_equal(pieces, whole.normal(1.0, 201))
+
+
+def test_draws_have_the_requested_distribution():
+    stream = NoiseStream(seed=11)
+
+    normals = stream.normal(0.5, 20_000)
+    uniforms = stream.uniform(20_000)
+
+    assert abs(normals.mean()) < 0.02 and abs(normals.std() - 0.5) < 0.02
+    assert uniforms.min() >= 0.0 and uniforms.max() < 1.0 and abs(uniforms.mean() - 0.5) < 0.01
+
+
+def test_seeded_sensor_models_replay_identical_readings():
+    def readings(seed):
+        model = BasicSensorModel(seed=seed)
+        return [model.read_gps((1.0, 2.0, 3.0)).value for _ in range(20)]
+
+    assert readings(4) == readings(4)
+    assert readings(4) != readings(5)
@@ -0,0 +1,190 @@
+"""
+OllamaClient against the stand-in Ollama server
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from ai_core.s2_planner.ollama_client import OllamaClient
+from ai_core.s2_planner.ollama_stub import _TOKEN, DEFAULT_RESPONSE, StubOllamaServer
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_generate_returns_server_response():
+    async def scenario():
+        async with StubOllamaServer() as server:
+            client = OllamaClient(host=server.url)
+            try:
+                return await client.generate("plan please"), server.requests
+            finally:
+                await client.close()
+
+    text, requests = run(scenario())
+    assert json.loads(text) == json.loads(DEFAULT_RESPONSE)
+    assert requests == 1
+
+
+def test_generate_passes_prompt_and_model():
+    async def scenario():
+        async with StubOllamaServer(response=lambda prompt, model: f"{model}:{prompt}") as server:
+            client = OllamaClient(host=server.url, model="tiny")
+            try:
+                return await client.generate("hello"), await client.generate("again", model="other")
+            finally:
+                await client.close()
+
+    assert run(scenario()) == ("tiny:hello", "other:again")
+
+
+def test_sequential_requests_reuse_one_connection():
+    async def scenario():
+        async with StubOllamaServer() as server:
+            client = OllamaClient(host=server.url)
+            try:
+                for _ in range(5):
+                    await client.generate("plan please")
+                return server.connections, server.requests
+            finally:
+                await client.close()
+
+    assert run(scenario()) == (1, 5)
+
+
+def test_concurrency_is_bounded_by_max_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def scenario():
+        async with StubOllamaServer(latency_seconds=0.05) as server:
+            original = server._respond
+
+            async def counting_respond(*args):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    await original(*args)
+                finally:
+                    in_flight -= 1
+
+            server._respond = counting_respond
+            client = OllamaClient(host=server.url, max_concurrency=2)
+            try:
+                await asyncio.gather(*(client.generate(f"plan {i}") for i in range(6)))
+                return server.connections
+            finally:
+                await client.close()
+
+    connections = run(scenario())
+    assert peak == 2
+    assert connections <= 2
+
+
+def test_timings_record_queue_latency_and_inference():
+    async def scenario():
+        async with StubOllamaServer(latency_seconds=0.05) as server:
+            client = OllamaClient(host=server.url, max_concurrency=1)
+            try:
+                await asyncio.gather(client.generate("first"), client.generate("second"))
+                return client.recent_timings(), client.get_stats()
+            finally:
+                await client.close()
+
+    timings, stats = run(scenario())
+    assert len(timings) == 2
+    assert all(timing.ok and timing.model == "llama3" for timing in timings)
+    assert all(timing.inference_seconds >= 0.05 for timing in timings)
+    assert all(timing.latency_seconds >= timing.inference_seconds for timing in timings)
+    assert all(timing.eval_count > 0 and not timing.stopped_early for timing in timings)
+    # One slot: the second request waited for the first to finish
+    assert max(timing.queue_seconds for timing in timings) >= 0.04
+
+    assert stats["requests"] == 2 and stats["failures"] == 0
+    assert stats["mean_overhead"] >= 0.0
+
+
+def test_failed_request_is_recorded():
+    async def scenario():
+        # Nothing listens on this port once the server has stopped
+        server = StubOllamaServer()
+        await server.start()
+        url = server.url
+        await server.stop()
+
+        client = OllamaClient(host=url)
+        try:
+            with pytest.raises(Exception):
+                await client.generate("plan please")
+            return client.get_stats()
+        finally:
+            await client.close()
+
+    assert run(scenario()) == {"requests": 1, "failures": 1}
+
+
+
+def _token_count(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+
+def test_generate_json_stops_at_closing_brace():
+    trailing = " Closing diagonally keeps the target away from the northern cover." * 20
+    full = DEFAULT_RESPONSE + trailing
+
+    async def scenario():
+        async with StubOllamaServer(response=full, token_latency_seconds=0.002) as server:
+            client = OllamaClient(host=server.url)
+            try:
+                text = await client.generate_json("plan please")
+                # Let the server notice the disconnect and stop generating
+                await asyncio.sleep(0.05)
+                return text, server.tokens_sent, client.recent_timings(1)[0]
+            finally:
+                await client.close()
+
+    text, tokens_sent, timing = run(scenario())
+    assert json.loads(text) == json.loads(DEFAULT_RESPONSE)
+    assert tokens_sent < _token_count(full)
+    assert _token_count(DEFAULT_RESPONSE) <= tokens_sent < _token_count(DEFAULT_RESPONSE) + 10
+    assert timing.ok and timing.stopped_early
+
+
+def test_generate_json_reads_to_done_without_an_object():
+    async def scenario():
+        async with StubOllamaServer(response="no plan today") as server:
+            client = OllamaClient(host=server.url)
+            try:
+                text = await client.generate_json("plan please")
+                await client.generate_json("plan please")
+                return text, server.connections, client.recent_timings(1)[0]
+            finally:
+                await client.close()
+
+    text, connections, timing = run(scenario())
+    assert text == "no plan today"
+    assert not timing.stopped_early
+    # A stream read to the end leaves its connection in the pool
+    assert connections == 1
+
+
+def test_early_stop_costs_one_reconnect():
+    async def scenario():
+        async with StubOllamaServer(response=DEFAULT_RESPONSE + " and then some more words" * 10) as server:
+            client = OllamaClient(host=server.url)
+            try:
+                await client.generate_json("plan please")
+                await client.generate("plan please")
+                return server.connections, client.get_stats()
+            finally:
+                await client.close()
+
+    connections, stats = run(scenario())
+    assert connections == 2
+    assert stats["early_stops"] == 1
@@ -0,0 +1,100 @@
+"""
+ORCA velocity-obstacle avoidance and its use in AVOID mode
+"""
+
+import numpy as np
+
+from ai_core.s1_perception_control.control_module import ControlCommand, ControlMode, ControlModule
+from ai_core.s1_perception_control.perception_module import PerceptionState
+from ai_core.s1_perception_control.velocity_obstacles import ORCAAvoidance
+
+STEPS = 120
+
+
+def test_head_on_agents_pass_without_colliding():
+    orca = ORCAAvoidance()
+    positions = np.array([[-10.0, 5.0, 0.0], [10.0, 5.0, 0.0]])
+    goals = positions[::-1].copy()
+    velocities = np.zeros((2, 3))
+
+    closest = np.inf
+    for _ in range(STEPS):
+        preferred = (goals - positions) / np.linalg.norm(goals - positions, axis=1, keepdims=True) * 5.0
+        result = orca.compute_swarm_velocities(positions, velocities, preferred)
+        velocities = result.velocities
+        positions = positions + velocities * orca.time_step
+        closest = min(closest, np.linalg.norm(positions[0] - positions[1]))
+
+    assert closest >= 2 * orca.agent_radius - 0.05
+    # Both sidestepped and carried on past each other
+    assert positions[0, 0] > 0.0 and positions[1, 0] < 0.0
+
+
+def test_drone_steers_around_a_static_obstacle():
+    orca = ORCAAvoidance()
+    obstacle, radius = np.array([[10.0, 5.0, 0.0]]), np.array([2.0])
+    position, velocity = np.array([0.0, 5.0, 0.0]), np.zeros(3)
+    preferred = np.array([5.0, 0.0, 0.0])
+
+    closest = np.inf
+    for _ in range(STEPS):
+        result = orca.compute_velocity(position, velocity, preferred, obstacle, radius)
+        assert result.feasible[0]
+        velocity = result.velocities[0]
+        position = position + velocity * orca.time_step
+        closest = min(closest, np.linalg.norm(position - obstacle[0]))
+
+    assert closest >= radius[0] + orca.agent_radius - 0.05
+    assert position[0] > 12.0
+
+
+def test_no_neighbours_keeps_the_preferred_velocity():
+    orca = ORCAAvoidance()
+    result = orca.compute_velocity(np.zeros(3), np.zeros(3), [3.0, 0.0, 4.0], np.zeros((0, 3)), np.zeros(0))
+
+    assert np.allclose(result.velocities[0], [3.0, 0.0, 4.0])
+    assert result.feasible[0] and result.neighbor_counts[0] == 0
+
+
+def _perception(position, obstacles) -> PerceptionState:
+    return PerceptionState(
+        timestamp=0.0,
+        drone_position=tuple(position),
+        drone_velocity=(0.0, 0.0, 0.0),
+        drone_orientation=(0.0, 0.0, 0.0),
+        target_position=None,
+        target_velocity=None,
+        target_visible=False,
+        target_distance=None,
+        target_bearing=None,
+        obstacles=obstacles,
+        immediate_threats=[],
+        safe_directions=np.zeros((0, 2)),
+        battery_level=100.0,
+        flight_envelope={}
+    )
+
+
+def test_avoid_mode_tracks_a_setpoint_moving_at_the_orca_velocity():
+    control = ControlModule()
+    obstacles = [{"position": [8.0, 10.0, 0.0], "size": [2.0, 2.0, 2.0]}]
+    perception = _perception((0.0, 10.0, 0.0), obstacles)
+    command = ControlCommand(
+        command_id="avoid", timestamp=0.0, mode=ControlMode.AVOID,
+        target_position=(20.0, 10.0, 0.0), target_velocity=None,
+        duration_ms=10_000, urgency="high", parameters={}
+    )
+
+    drone_cmd = control.execute_command(command, perception)
+    assert drone_cmd.mode_flags.get("orca")
+    first = control._avoid_setpoint.copy()
+
+    control.execute_command(command, perception)
+    # The setpoint advances by one tick of the ORCA velocity, not a velocity error
+    step = control._avoid_setpoint - first
+    assert 0.0 < np.linalg.norm(step) <= control.orca.max_speed * control.update_interval + 1e-9
+
+    # A new command starts from the drone again
+    control.execute_command(ControlCommand(**{**command.__dict__, "command_id": "avoid-2"}), perception)
+    assert np.linalg.norm(control._avoid_setpoint - perception.drone_position) <= (
+        control.orca.max_speed * control.update_interval + 1e-9)
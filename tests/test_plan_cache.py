@@ -0,0 +1,74 @@
+"""
+Situation-keyed plan cache with TTL and LRU eviction
+"""
+
+from ai_core.s2_planner.plan_cache import PlanCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _put(cache, drone, plan=None, target_offset=(4.0, 0.0)):
+    target = [drone[0] + target_offset[0], drone[1] + target_offset[1]]
+    cache.put(drone, target, [], plan or [[drone[0] + 1.0, drone[1]]], "chase")
+
+
+def _get(cache, drone, target_offset=(4.0, 0.0)):
+    return cache.get(drone, [drone[0] + target_offset[0], drone[1] + target_offset[1]], [])
+
+
+def test_hit_is_translated_to_the_current_drone_position():
+    cache = PlanCache()
+    _put(cache, [2.0, 3.0], plan=[[3.0, 3.0], [4.0, 4.0]])
+
+    plan, reasoning = _get(cache, [10.0, 10.0])
+
+    assert plan == [[11.0, 10.0], [12.0, 11.0]] and reasoning == "chase"
+
+
+def test_situation_must_match_within_the_quantum():
+    cache = PlanCache(position_quantum=0.5)
+    _put(cache, [0.0, 0.0])
+
+    assert _get(cache, [0.0, 0.0], target_offset=(4.1, 0.0)) is not None
+    assert _get(cache, [0.0, 0.0], target_offset=(6.0, 0.0)) is None
+    # A nearby obstacle changes the situation, a distant one does not
+    assert cache.get([0.0, 0.0], [4.0, 0.0], [[1.0, 1.0]]) is None
+    assert cache.get([0.0, 0.0], [4.0, 0.0], [[10.0, 10.0]]) is not None
+    assert cache.get([0.0, 0.0], [4.0, 0.0], [], emergency_mode=True) is None
+
+
+def test_entries_expire_after_the_ttl():
+    clock = _Clock()
+    cache = PlanCache(ttl_seconds=5.0, clock=clock)
+    _put(cache, [0.0, 0.0])
+
+    clock.now = 4.9
+    assert _get(cache, [0.0, 0.0]) is not None
+    clock.now = 5.1
+    assert _get(cache, [0.0, 0.0]) is None
+
+    metrics = cache.get_metrics()
+    assert metrics["expired"] == 1 and metrics["size"] == 0
+    assert metrics["hits"] == 1 and metrics["misses"] == 1 and metrics["hit_rate"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PlanCache(max_entries=2)
+    offsets = [(2.0, 0.0), (0.0, 2.0), (-2.0, 0.0)]
+    _put(cache, [0.0, 0.0], target_offset=offsets[0])
+    _put(cache, [0.0, 0.0], target_offset=offsets[1])
+    # Touching the first entry makes the second the oldest
+    assert _get(cache, [0.0, 0.0], target_offset=offsets[0]) is not None
+
+    _put(cache, [0.0, 0.0], target_offset=offsets[2])
+
+    assert _get(cache, [0.0, 0.0], target_offset=offsets[1]) is None
+    assert _get(cache, [0.0, 0.0], target_offset=offsets[0]) is not None
+    assert _get(cache, [0.0, 0.0], target_offset=offsets[2]) is not None
+    assert cache.get_metrics()["evictions"] == 1
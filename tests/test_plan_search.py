@@ -0,0 +1,70 @@
+"""
+CandidatePlanSearch scoring
+"""
+
+import numpy as np
+
+from ai_core.s2_planner.plan_search import CandidatePlanSearch
+
+
+def test_plans_near_a_coincident_target_are_not_penalized():
+    search = CandidatePlanSearch(grid_size=10, plan_steps=3, seed=0)
+    target = [5.0, 5.0]
+    step_targets = np.array([target] * 3)
+    # Holding within optimal range of a target the drone is already over
+    plans = np.array([
+        [[5.0, 5.0], [5.5, 5.0], [6.0, 5.0]],
+        [[5.0, 5.0], [5.0, 5.0], [5.0, 5.0]],
+        [[6.0, 6.0], [7.0, 7.0], [8.0, 8.0]]
+    ])
+
+    scores = search.score(plans, [5.0, 5.0], target, step_targets, np.zeros((0, 2)))
+
+    assert scores[0] < 1e3 and scores[1] < 1e3
+    assert scores[2] >= 1e3
+
+
+def test_search_from_the_target_position_finds_an_unpenalized_plan():
+    search = CandidatePlanSearch(grid_size=10, plan_steps=3, seed=0)
+    result = search.search([5.0, 5.0], [5.0, 5.0], [],
+                           predict=lambda times: [[5.0 + 0.3 * t, 5.0] for t in times])
+
+    assert result.score < 1e3
+
+
+def _greedy_plan(drone, target, steps=3, max_step=1.0):
+    drone, target = np.asarray(drone, dtype=float), np.asarray(target, dtype=float)
+    offset = target - drone
+    unit = offset / max(np.linalg.norm(offset), 1e-9)
+    return [list(drone + unit * min(max_step * (k + 1), np.linalg.norm(offset))) for k in range(steps)]
+
+
+def test_search_is_never_worse_than_its_baseline():
+    rng = np.random.default_rng(3)
+    search = CandidatePlanSearch(grid_size=20, plan_steps=3, seed=1)
+
+    for _ in range(25):
+        drone, target = rng.uniform(1.0, 19.0, 2), rng.uniform(1.0, 19.0, 2)
+        velocity = rng.normal(0.0, 1.0, 2)
+        obstacles = [{"position": list(rng.uniform(0.0, 20.0, 2)), "blocks_drone": bool(rng.random() < 0.5)}
+                     for _ in range(8)]
+        baseline = _greedy_plan(drone, target)
+
+        result = search.search(list(drone), list(target), obstacles,
+                               predict=lambda times: [list(target + velocity * t) for t in times],
+                               baseline=baseline)
+
+        assert result.score <= result.baseline_score
+        assert result.candidates == len(search.aim_times) * len(search.step_scales) + search.num_random + 1
+
+
+def test_best_plan_closes_distance_and_keeps_clear_of_blocking_obstacles():
+    search = CandidatePlanSearch(grid_size=20, plan_steps=3, seed=0)
+    drone, target = np.array([4.0, 10.0]), np.array([12.0, 10.0])
+    # Directly on the straight line to the target
+    obstacles = [{"position": [5.0, 10.0], "blocks_drone": True}, {"position": [6.0, 10.0], "blocks_drone": False}]
+
+    result = search.search(list(drone), list(target), obstacles, predict=lambda times: [list(target)] * len(times))
+
+    assert np.linalg.norm(result.plan[-1] - target) < np.linalg.norm(drone - target) - 1.5
+    assert np.linalg.norm(result.plan - [5.0, 10.0], axis=1).min() >= search.safety_margin
@@ -0,0 +1,97 @@
+"""
+DronePlanner anytime mode: algorithmic plan now, LLM plan when it lands
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from ai_core.s2_planner.backend_pool import LLMBackend
+from ai_core.s2_planner.ollama_stub import DEFAULT_RESPONSE
+from ai_core.s2_planner.planner import DronePlanner
+
+LLM_REASONING = json.loads(DEFAULT_RESPONSE)["reasoning"]
+
+
+class SlowClient:
+    """Stands in for OllamaClient: answers after latency seconds"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.started = 0
+
+    async def generate_json(self, prompt: str, model: str = "llama3") -> str:
+        self.started += 1
+        await asyncio.sleep(self.latency)
+        return DEFAULT_RESPONSE
+
+    async def close(self):
+        pass
+
+
+def _planner(latency: float, llm_deadline: float = 2.0):
+    client = SlowClient(latency)
+    return DronePlanner(anytime=True, llm_deadline=llm_deadline, backends=[LLMBackend("slow", client)]), client
+
+
+def test_answers_immediately_then_upgrades_to_the_llm_plan():
+    planner, client = _planner(latency=0.2)
+
+    async def scenario():
+        started = time.monotonic()
+        first = await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        first_elapsed = time.monotonic() - started
+        # Further decisions while the query runs do not start another one
+        await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        await asyncio.sleep(0.3)
+        upgraded = await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        return first, first_elapsed, upgraded
+
+    (_, first_reasoning), first_elapsed, (plan, reasoning) = asyncio.run(scenario())
+
+    assert first_elapsed < 0.1 and first_reasoning != LLM_REASONING
+    assert reasoning == LLM_REASONING and plan == json.loads(DEFAULT_RESPONSE)["plan"]
+    assert client.started == 1
+    assert planner.anytime_stats == {"launched": 1, "upgrades": 1, "invalid": 0}
+    assert planner.plan_cache.get_metrics()["stores"] == 1
+
+
+def test_answer_past_the_llm_deadline_is_dropped():
+    planner, client = _planner(latency=5.0, llm_deadline=0.1)
+
+    async def scenario():
+        await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        await asyncio.sleep(0.15)
+        plan, reasoning = await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        # The overdue query was cancelled; the next decision launches a fresh one
+        await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        await asyncio.sleep(0.05)
+        planner._llm_task.cancel()
+        return plan, reasoning
+
+    plan, reasoning = asyncio.run(scenario())
+
+    assert reasoning != LLM_REASONING and len(plan) == planner.plan_steps
+    assert planner.llm_stats["timed_out"] == 1
+    assert planner.anytime_stats["launched"] == 2 and client.started == 2
+
+
+def test_plan_stale_for_the_current_state_is_not_used():
+    planner, _ = _planner(latency=0.05)
+
+    async def scenario():
+        await planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {})
+        await asyncio.sleep(0.1)
+        # The drone has since overtaken the plan's end point
+        return await planner.create_interception_plan([8.0, 8.0], [9.0, 9.0], [], {})
+
+    _, reasoning = asyncio.run(scenario())
+
+    assert reasoning != LLM_REASONING
+    assert planner.anytime_stats["upgrades"] == 0 and planner.anytime_stats["invalid"] == 1
+    # Still valid for the situation it was planned for, so it is cached
+    assert planner.plan_cache.get_metrics()["stores"] == 1
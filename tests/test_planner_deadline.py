@@ -0,0 +1,105 @@
+"""
+DronePlanner LLM queries bounded by a decision deadline
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from ai_core.s2_planner.backend_pool import LLMBackend
+from ai_core.s2_planner.ollama_stub import DEFAULT_RESPONSE
+from ai_core.s2_planner.planner import DronePlanner
+
+LLM_REASONING = json.loads(DEFAULT_RESPONSE)["reasoning"]
+
+
+class SlowClient:
+    """Stands in for OllamaClient: answers after latency seconds, records cancellation"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.started = 0
+        self.cancelled = 0
+
+    async def generate_json(self, prompt: str, model: str = "llama3") -> str:
+        self.started += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return DEFAULT_RESPONSE
+
+    async def close(self):
+        pass
+
+
+def _plan(planner: DronePlanner, deadline_in: float = None):
+    async def scenario():
+        deadline = None if deadline_in is None else time.monotonic() + deadline_in
+        started = time.monotonic()
+        plan, reasoning = await planner.create_interception_plan(
+            [2.0, 2.0], [8.0, 8.0], [], {}, deadline=deadline
+        )
+        # Let the cancelled attempt unwind
+        await asyncio.sleep(0.01)
+        return plan, reasoning, time.monotonic() - started
+
+    return asyncio.run(scenario())
+
+
+def test_query_past_the_deadline_is_cancelled_and_falls_back():
+    client = SlowClient(latency=5.0)
+    planner = DronePlanner(backends=[LLMBackend("slow", client)])
+
+    plan, reasoning, elapsed = _plan(planner, deadline_in=0.1)
+
+    assert elapsed < 1.0
+    assert reasoning != LLM_REASONING and len(plan) == planner.plan_steps
+    assert client.started == 1 and client.cancelled == 1
+    assert planner.llm_stats["timed_out"] == 1 and planner.llm_stats["completed"] == 0
+
+
+def test_query_within_the_deadline_is_used():
+    client = SlowClient(latency=0.02)
+    planner = DronePlanner(backends=[LLMBackend("fast", client)])
+
+    _, reasoning, _ = _plan(planner, deadline_in=1.0)
+
+    assert reasoning == LLM_REASONING
+    assert client.cancelled == 0
+    assert planner.llm_stats["completed"] == 1
+
+
+def test_no_deadline_waits_for_the_llm():
+    client = SlowClient(latency=0.3)
+    planner = DronePlanner(backends=[LLMBackend("slow", client)])
+
+    _, reasoning, elapsed = _plan(planner)
+
+    assert reasoning == LLM_REASONING
+    assert elapsed >= 0.3
+    assert planner.llm_stats["timed_out"] == 0
+
+
+def test_newer_decision_supersedes_a_query_in_flight():
+    client = SlowClient(latency=5.0)
+    planner = DronePlanner(backends=[LLMBackend("slow", client)])
+
+    async def scenario():
+        first = asyncio.create_task(planner.create_interception_plan([2.0, 2.0], [8.0, 8.0], [], {}))
+        await asyncio.sleep(0.05)
+        # A newer situation arrives while the first query is still running
+        await planner.create_interception_plan([3.0, 3.0], [8.0, 8.0], [], {},
+                                               deadline=time.monotonic() + 0.05)
+        return await first
+
+    _, reasoning = asyncio.run(scenario())
+
+    assert reasoning != LLM_REASONING
+    assert planner.llm_stats["superseded"] == 1
+    assert client.cancelled == 2
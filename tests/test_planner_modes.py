@@ -0,0 +1,23 @@
+"""
+DronePlanner search modes, which must work without the LLM stack
+"""
+
+import asyncio
+import sys
+
+
+def test_planner_imports_without_httpx(monkeypatch):
+    # Only the LLM path needs httpx; the search modes must not pull it in
+    for name in list(sys.modules):
+        if name == "httpx" or name.startswith(("httpx.", "ai_core.s2_planner")):
+            monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setitem(sys.modules, "httpx", None)
+
+    from ai_core.s2_planner.planner import DronePlanner
+
+    planner = DronePlanner(mcts_budget=0.01)
+    plan, _ = asyncio.run(planner.create_interception_plan([2.0, 2.0], [6.0, 6.0], [], {}))
+    assert len(plan) == planner.plan_steps
+    assert planner.backend_pool is None
+    assert planner.get_planning_metrics()["backends"] == {}
+    assert "ai_core.s2_planner.ollama_client" not in sys.modules
@@ -0,0 +1,72 @@
+"""
+Token-budgeted planning prompts
+"""
+
+from ai_core.s2_planner.prompt_builder import PlanningPromptBuilder, estimate_tokens
+
+SKILLS = {"intercept": "Cut off the target", "pursue": "Follow the target"}
+
+
+def _builder(**kwargs):
+    return PlanningPromptBuilder(grid_size=20, plan_steps=3, max_speed=50.0, max_acceleration=20.0,
+                                 skills=SKILLS, **kwargs)
+
+
+def _corridor_obstacles(count):
+    """Obstacles spread along the y=0 drone-target segment, alternating blocking"""
+    return [{"position": [1.0 + 0.1 * k, 0.5 + 0.01 * k], "type": "tree", "blocks_target": k % 2 == 0}
+            for k in range(count)]
+
+
+def test_corridor_obstacles_are_listed_nearest_first():
+    builder = _builder()
+    obstacles = [{"position": [5.0, 2.0], "type": "rock"},
+                 {"position": [3.0, 0.5], "type": "tree"},
+                 {"position": [5.0, 9.0], "type": "house"},
+                 [14.0, 0.0]]
+
+    prompt = builder.build([0.0, 0.0], [10.0, 0.0], obstacles, "No memory", "east")
+
+    assert prompt.index("[3.0, 0.5] tree") < prompt.index("[5.0, 2.0] rock")
+    assert "house" not in prompt and "[14.0, 0.0]" not in prompt
+    assert "2 other obstacles (2 block target), by bearing from target: E 1, NW 1" in prompt
+    assert builder.last_stats["obstacles_listed"] == 2 and builder.last_stats["obstacles_summarized"] == 2
+
+
+def test_prompt_stays_within_the_token_budget():
+    generous = _builder(token_budget=10_000, max_obstacles=50)
+    generous.build([0.0, 0.0], [10.0, 0.0], _corridor_obstacles(40), "No memory", "east")
+    budget = generous.last_stats["prompt_tokens"] - 150
+
+    builder = _builder(token_budget=budget, max_obstacles=50)
+    prompt = builder.build([0.0, 0.0], [10.0, 0.0], _corridor_obstacles(40), "No memory", "east")
+
+    assert estimate_tokens(prompt) <= budget
+    assert builder.last_stats["prompt_tokens"] == estimate_tokens(prompt)
+    assert 0 < builder.last_stats["obstacles_listed"] < 40
+    assert builder.last_stats["obstacles_summarized"] == 40 - builder.last_stats["obstacles_listed"]
+
+
+def test_memory_is_trimmed_once_no_obstacles_are_left():
+    memory = "\n".join(f"Episode {k}: intercepted near the river bend" for k in range(40))
+    prefix_tokens = _builder().static_prefix()[1]
+    builder = _builder(token_budget=prefix_tokens + 250)
+
+    prompt = builder.build([0.0, 0.0], [10.0, 0.0], _corridor_obstacles(5), memory, "east")
+
+    assert estimate_tokens(prompt) <= builder.token_budget
+    assert builder.last_stats["obstacles_listed"] == 0
+    assert "Episode 0:" in prompt and "Episode 39:" not in prompt
+
+
+def test_static_prefix_is_shared_and_rebuilt_on_change():
+    builder = _builder()
+    first = builder.build([0.0, 0.0], [10.0, 0.0], [], "No memory", "east")
+    second = builder.build([3.0, 4.0], [1.0, 2.0], _corridor_obstacles(3), "Other", "west")
+    prefix, _ = builder.static_prefix()
+
+    assert first.startswith(prefix) and second.startswith(prefix)
+    assert builder.static_prefix()[0] is prefix
+
+    builder.skills = {**SKILLS, "ambush": "Wait behind cover"}
+    assert "ambush" in builder.static_prefix()[0]
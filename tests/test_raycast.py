@@ -0,0 +1,83 @@
+"""
+Batched ray/sphere casting and the 2D LiDAR built on it
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from ai_core.s1_perception_control.sensor_models.basic_model import BasicSensorModel
+from ai_core.s1_perception_control.sensor_models.raycast import batched_ray_sphere_ranges, ray_sphere_ranges
+
+MAX_RANGE = 50.0
+
+
+def _brute_force_ranges(origin, directions, centers, radii, max_range):
+    ranges = np.full(len(directions), max_range)
+    for k, direction in enumerate(directions):
+        for center, radius in zip(centers, radii):
+            offset = np.asarray(origin) - center
+            b = direction @ offset
+            disc = b * b - (offset @ offset - radius * radius)
+            if disc >= 0:
+                entry = -b - math.sqrt(disc)
+                if entry > 0:
+                    ranges[k] = min(ranges[k], entry)
+    return ranges
+
+
+def _random_scene(rng, spheres=25):
+    centers = rng.uniform(-30.0, 30.0, (spheres, 3))
+    radii = rng.uniform(0.5, 4.0, spheres)
+    directions = rng.normal(size=(300, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return directions, centers, radii
+
+
+def test_ranges_match_a_per_ray_per_sphere_solution():
+    rng = np.random.default_rng(0)
+    directions, centers, radii = _random_scene(rng)
+    origin = np.array([1.0, -2.0, 0.5])
+
+    ranges = ray_sphere_ranges(origin, directions, centers, radii, MAX_RANGE)
+
+    expected = _brute_force_ranges(origin, directions, centers, radii, MAX_RANGE)
+    assert (expected < MAX_RANGE).any() and (expected == MAX_RANGE).any()
+    assert np.allclose(ranges, expected, atol=1e-3)
+
+
+def test_spheres_behind_the_origin_are_ignored():
+    directions = np.array([[1.0, 0.0, 0.0], [-1.0, 0.0, 0.0]])
+    ranges = ray_sphere_ranges(np.zeros(3), directions, np.array([[-10.0, 0.0, 0.0]]), np.array([2.0]), MAX_RANGE)
+
+    assert ranges[0] == MAX_RANGE
+    assert ranges[1] == pytest.approx(8.0)
+
+
+def test_batched_ranges_match_one_origin_at_a_time():
+    rng = np.random.default_rng(1)
+    directions, centers, radii = _random_scene(rng)
+    origins = rng.uniform(-5.0, 5.0, (7, 3))
+
+    # A tiny working-set limit forces one origin per chunk
+    ranges = batched_ray_sphere_ranges(origins, directions, centers, radii, MAX_RANGE, max_pairs=100)
+
+    assert ranges.shape == (7, len(directions))
+    for origin, row in zip(origins, ranges):
+        assert np.allclose(row, ray_sphere_ranges(origin, directions, centers, radii, MAX_RANGE))
+
+
+def test_lidar_scan_sees_an_obstacle_at_its_distance():
+    model = BasicSensorModel(seed=0)
+    model.failure_probabilities = {sensor: 0.0 for sensor in model.failure_probabilities}
+    obstacles = [{"position": [20.0, 10.0, 0.0], "size": [2.0, 2.0, 2.0]}]
+
+    scan = model.read_lidar((0.0, 10.0, 0.0), obstacles).value
+
+    accuracy = model.config["lidar"]["accuracy"]
+    assert scan.distances[0] == pytest.approx(18.0, abs=5 * accuracy)  # ray along +x
+    assert scan.valid[0]
+    # Rays well clear of the sphere see nothing
+    sideways = np.abs(scan.angles - 90.0) < 30.0
+    assert not scan.valid[sideways].any()
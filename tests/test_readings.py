@@ -0,0 +1,41 @@
+"""
+Array-backed sensor payloads and their legacy dict views
+"""
+
+import numpy as np
+
+from ai_core.s1_perception_control.sensor_models.readings import (
+    DETECTION_DTYPE, DETECTION_TYPES, CameraDetections, LidarScan, detection_type_codes
+)
+
+
+def test_detection_dicts_keep_values_exactly():
+    obstacles = np.zeros(2, dtype=DETECTION_DTYPE)
+    obstacles["position"] = [[1.1, 2.2, 3.3], [4.4, 5.5, 6.6]]
+    obstacles["size"] = [[0.3, 0.3, 0.3], [1.0, 2.0, 0.7]]
+    obstacles["pixel"] = [[320.1, 240.7], [12.3, 45.6]]
+    obstacles["confidence"] = [0.8, 0.55]
+    obstacles["distance"] = [12.34, 0.1]
+    obstacles["type"] = detection_type_codes(["rock", "hangar door"])
+
+    first, second = CameraDetections(obstacles=obstacles)["obstacles_detected"]
+
+    assert first == {"position": (1.1, 2.2, 3.3), "size": [0.3, 0.3, 0.3], "pixel": (320.1, 240.7),
+                     "confidence": 0.8, "distance": 12.34, "type": "rock"}
+    assert second["confidence"] == 0.55 and second["type"] == "hangar door"
+
+
+def test_type_codes_are_stable_and_register_new_names():
+    codes = detection_type_codes(["tree", "a type never seen before", "tree", "a type never seen before"])
+
+    assert codes.dtype == np.int16
+    assert codes[0] == codes[2] and codes[1] == codes[3]
+    assert [DETECTION_TYPES[code] for code in codes[:2]] == ["tree", "a type never seen before"]
+    assert detection_type_codes(["a type never seen before"])[0] == codes[1]
+
+
+def test_lidar_points_keep_values_exactly():
+    scan = LidarScan(np.array([0.1, 359.9]), np.array([0.8, 12.345]), np.array([True, False]))
+
+    assert scan[0] == {"angle": 0.1, "distance": 0.8, "valid": True}
+    assert scan.to_dicts()[1] == {"angle": 359.9, "distance": 12.345, "valid": False}
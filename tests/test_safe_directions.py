@@ -0,0 +1,62 @@
+"""
+Safe-direction search in PerceptionModule and selection in ControlModule
+"""
+
+import math
+
+import numpy as np
+
+from ai_core.s1_perception_control.control_module import ControlModule
+from ai_core.s1_perception_control.perception_module import PerceptionModule
+
+
+def _brute_force_safe(perception: PerceptionModule, drone_pos, obstacles):
+    safe = []
+    for (azimuth, elevation), direction in zip(perception.direction_samples, perception.direction_vectors):
+        point = np.asarray(drone_pos) + direction * perception.safe_direction_check_distance
+        if all(np.linalg.norm(point - obstacle["position"]) >= max(obstacle["size"]) + perception.min_safe_distance
+               for obstacle in obstacles):
+            safe.append((azimuth, elevation))
+    return np.array(safe).reshape(-1, 2)
+
+
+def test_safe_directions_match_a_per_direction_check():
+    rng = np.random.default_rng(0)
+    perception = PerceptionModule()
+    drone_pos = (0.0, 10.0, 0.0)
+    obstacles = [{"position": rng.uniform(-15.0, 15.0, 3) + [0.0, 10.0, 0.0], "size": rng.uniform(0.5, 3.0, 3)}
+                 for _ in range(12)]
+
+    safe = perception._calculate_safe_directions(drone_pos, obstacles, [])
+
+    assert 0 < len(safe) < len(perception.direction_samples)
+    assert np.array_equal(safe, _brute_force_safe(perception, drone_pos, obstacles))
+
+
+def test_direction_into_an_obstacle_is_unsafe():
+    perception = PerceptionModule()
+    obstacles = [{"position": [10.0, 10.0, 0.0], "size": [2.0, 2.0, 2.0]}]
+
+    safe = perception._calculate_safe_directions((0.0, 10.0, 0.0), obstacles, [])
+
+    toward = np.cos(safe[:, 1]) * np.cos(safe[:, 0])  # x component of each direction
+    assert toward.max() < 0.9   # nothing straight at it (+x)
+    assert toward.min() < -0.9  # but straight away is fine
+
+
+def test_closest_safe_direction_is_chosen():
+    control = ControlModule()
+    directions = PerceptionModule().direction_samples
+    rng = np.random.default_rng(1)
+
+    for desired in rng.normal(size=(20, 3)):
+        azimuth, elevation = control._choose_best_safe_direction(desired, directions)
+        chosen = np.array([math.cos(elevation) * math.cos(azimuth), math.sin(elevation),
+                           math.cos(elevation) * math.sin(azimuth)])
+        unit = desired / np.linalg.norm(desired)
+        # Nothing in the grid is much better aligned than the chosen direction
+        best = max(np.cos(e) * np.cos(a) * unit[0] + np.sin(e) * unit[1] + np.cos(e) * np.sin(a) * unit[2]
+                   for a, e in directions)
+        assert chosen @ unit >= best - 0.15
+
+    assert control._choose_best_safe_direction(np.ones(3), np.zeros((0, 2))) == (0.0, 0.0)
@@ -0,0 +1,50 @@
+"""
+Multi-rate sensor scheduling
+"""
+
+from ai_core.s1_perception_control.sensor_models.scheduler import SensorScheduler
+
+
+def _count_due(scheduler, sensor, duration, step):
+    ticks = round(duration / step)
+    return sum(scheduler.is_due(sensor, k * step) for k in range(ticks))
+
+
+def test_each_sensor_keeps_its_own_rate():
+    rates = {"imu": 100.0, "gps": 10.0, "camera": 30.0}
+
+    counts = {sensor: _count_due(SensorScheduler(rates), sensor, 2.0, 0.001) for sensor in rates}
+
+    assert counts == {"imu": 200, "gps": 20, "camera": 60}
+
+
+def test_zero_rate_is_due_every_call_and_unknown_never():
+    scheduler = SensorScheduler({"altimeter": 0.0})
+
+    assert all(scheduler.is_due("altimeter", 0.0) for _ in range(5))
+    assert not any(scheduler.is_due("radar", t) for t in range(5))
+
+
+def test_falling_behind_does_not_burst():
+    scheduler = SensorScheduler({"gps": 10.0})
+    assert scheduler.is_due("gps", 0.0)
+
+    # A long stall yields one reading, then the normal period resumes
+    assert scheduler.is_due("gps", 5.0)
+    assert not scheduler.is_due("gps", 5.05)
+    assert scheduler.is_due("gps", 5.1)
+
+
+def test_timeline_and_reset():
+    scheduler = SensorScheduler({"imu": 100.0, "gps": 10.0}, max_events=5)
+    for k in range(20):
+        scheduler.is_due("imu", k * 0.01)
+        scheduler.is_due("gps", k * 0.01)
+
+    assert scheduler.reading_counts == {"imu": 20, "gps": 2}
+    assert len(scheduler.get_timeline()) == 5
+    assert all(sensor == "imu" for _, sensor in scheduler.get_timeline("imu"))
+
+    scheduler.reset()
+    assert scheduler.get_timeline() == [] and scheduler.reading_counts == {"imu": 0, "gps": 0}
+    assert scheduler.is_due("gps", 0.05)
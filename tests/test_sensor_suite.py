@@ -0,0 +1,86 @@
+"""
+BasicSensorModel.simulate_sensor_suite sensor selection and scheduling
+"""
+
+import numpy as np
+
+from ai_core.s1_perception_control.sensor_models.basic_model import BasicSensorModel
+from ai_core.s1_perception_control.sensor_models.batched_model import BatchedSensorModel
+from ai_core.s1_perception_control.sensor_models.scheduler import SensorScheduler
+
+OBSTACLES = [{"position": [10.0, 10.0, 0.0], "size": [2.0, 2.0, 2.0], "type": "building"}]
+
+
+def _true_state():
+    return {
+        "position": (0.0, 10.0, 0.0),
+        "acceleration": (0.0, 0.0, 0.0),
+        "angular_velocity": (0.0, 0.0, 0.0),
+        "altitude": 10.0,
+        "target_position": (0.0, 10.0, 20.0),
+        "obstacles": OBSTACLES
+    }
+
+
+def test_sensor_missing_from_config_is_not_read():
+    # A config written before lidar_3d existed
+    config = BasicSensorModel._default_config()
+    del config["lidar_3d"]
+    model = BasicSensorModel(sensor_config=config, seed=0)
+
+    for step in range(5):
+        readings = model.simulate_sensor_suite(_true_state(), timestamp=step * 0.1)
+        assert "lidar_3d" not in readings
+        assert "lidar_3d" not in model.last_updated
+
+
+def test_sensor_without_enabled_flag_is_read():
+    config = BasicSensorModel._default_config()
+    del config["gps"]["enabled"]
+    config["imu"]["enabled"] = False
+    model = BasicSensorModel(sensor_config=config, seed=0)
+
+    readings = model.simulate_sensor_suite(_true_state(), timestamp=0.0)
+
+    assert "gps" in readings
+    assert "accelerometer" not in readings and "gyroscope" not in readings
+
+
+def test_scheduled_sensors_follow_their_rates():
+    model = BasicSensorModel(seed=0)
+
+    counts = {}
+    for step in range(200):
+        model.simulate_sensor_suite(_true_state(), timestamp=step * 0.005)
+        for key in model.last_updated:
+            counts[key] = counts.get(key, 0) + 1
+
+    # One second of simulated time at 200Hz
+    assert counts["gyroscope"] == 200
+    assert counts["altimeter"] == 50
+    assert counts["gps"] == 10
+
+
+def test_scheduler_never_releases_unknown_sensors():
+    scheduler = SensorScheduler({"gps": 10.0, "imu": 0.0})
+
+    assert not scheduler.is_due("lidar_3d", 0.0)
+    assert scheduler.is_due("imu", 0.0) and scheduler.is_due("imu", 0.0)
+    assert scheduler.is_due("gps", 0.0)
+    assert not scheduler.is_due("gps", 0.05)
+    assert scheduler.is_due("gps", 0.1)
+
+
+def test_batched_model_skips_sensors_missing_from_config():
+    config = BasicSensorModel._default_config()
+    del config["lidar"]
+    del config["camera"]
+    model = BatchedSensorModel(3, sensor_config=config, seed=0)
+
+    positions = np.array([[0.0, 10.0, 0.0], [5.0, 10.0, 0.0], [10.0, 10.0, 5.0]])
+    readings = model.simulate({"position": positions, "target_position": positions + 5.0,
+                               "altitude": positions[:, 1]}, OBSTACLES)
+
+    assert "lidar" not in readings and "camera" not in readings
+    assert readings["gps"]["values"].shape == (3, 3)
+    assert "altimeter" in readings
@@ -0,0 +1,70 @@
+"""
+Error-state EKF fusion of GPS, IMU and altimeter
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.s1_perception_control.state_estimator import ErrorStateEKF, benchmark_state_estimator
+
+
+def _fly_straight(ekf, rng, steps=2000, dt=0.01, gps_every=10, gps_std=0.5, altimeter_bias=0.0):
+    """Constant-velocity flight; returns (fused, raw GPS) position errors after settling"""
+    velocity = np.array([3.0, 0.5, -2.0])
+    fused_errors, gps_errors = [], []
+    for step in range(steps):
+        t = step * dt
+        truth = np.array([0.0, 10.0, 0.0]) + velocity * t
+        ekf.update_imu((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), t)
+        if step % gps_every == 0:
+            fix = truth + rng.normal(0.0, gps_std, 3)
+            ekf.update_gps(tuple(fix), t)
+            ekf.update_altimeter(truth[1] + altimeter_bias + rng.normal(0.0, 0.1), t)
+            if step > steps // 2:
+                fused_errors.append(np.linalg.norm(ekf.position - truth))
+                gps_errors.append(np.linalg.norm(fix - truth))
+    return np.array(fused_errors), np.array(gps_errors)
+
+
+def test_fused_position_beats_raw_gps():
+    ekf = ErrorStateEKF()
+
+    fused, gps = _fly_straight(ekf, np.random.default_rng(0))
+
+    assert np.sqrt(np.mean(fused**2)) < 0.6 * np.sqrt(np.mean(gps**2))
+    assert np.allclose(ekf.velocity, [3.0, 0.5, -2.0], atol=0.2)
+
+
+def test_altimeter_bias_is_estimated():
+    ekf = ErrorStateEKF()
+
+    _fly_straight(ekf, np.random.default_rng(1), altimeter_bias=2.0)
+
+    assert ekf.altimeter_bias == pytest.approx(2.0, abs=0.3)
+
+
+def test_gps_outlier_is_gated():
+    ekf = ErrorStateEKF()
+    _fly_straight(ekf, np.random.default_rng(2), steps=500)
+    before = ekf.position.copy()
+
+    accepted = ekf.update_gps(tuple(before + [40.0, 0.0, 0.0]), ekf.time)
+
+    assert not accepted and ekf.counts["rejected"] == 1
+    assert np.allclose(ekf.position, before)
+
+
+def test_covariance_stays_symmetric_positive_definite():
+    ekf = ErrorStateEKF()
+    _fly_straight(ekf, np.random.default_rng(3))
+
+    assert np.allclose(ekf.P, ekf.P.T)
+    assert np.linalg.eigvalsh(ekf.P).min() > 0.0
+    assert (ekf.position_std < 0.5).all()
+
+
+def test_benchmark_reports_fused_error_below_gps():
+    stats = benchmark_state_estimator(duration_s=3.0)
+
+    assert stats["fused_rmse_m"] < stats["gps_rmse_m"]
+    assert stats["max_rate_hz"] > 0.0
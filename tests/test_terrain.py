@@ -0,0 +1,91 @@
+"""
+Terrain heightfield queries and ray casting
+"""
+
+import numpy as np
+import pytest
+
+from shared.terrain import Heightfield
+
+CONFIG = {
+    "generation": {"seed": 3, "size": [200, 160], "resolution": 2.0},
+    "elevation": {"min_height": 0.0, "max_height": 30.0, "noise_scale": 0.02, "octaves": 3}
+}
+
+
+def _brute_force_range(terrain, origin, direction, max_range, step=0.01):
+    """March the ray in small steps, then bisect the first crossing below the surface"""
+    ts = np.arange(0.0, max_range + step, step)
+    points = origin + ts[:, np.newaxis] * direction
+    inside = ((points[:, 0] >= terrain.x_min) & (points[:, 0] <= terrain.x_max)
+              & (points[:, 2] >= terrain.z_min) & (points[:, 2] <= terrain.z_max))
+    below = inside & (points[:, 1] <= terrain.heights_at(points))
+    if not below.any():
+        return max_range
+    k = int(np.argmax(below))
+    if k == 0:
+        return 0.0
+    low, high = ts[k - 1], ts[k]
+    for _ in range(40):
+        mid = 0.5 * (low + high)
+        point = origin + mid * direction
+        low, high = (low, mid) if point[1] <= terrain.heights_at(point) else (mid, high)
+    return high
+
+
+@pytest.fixture(scope="module")
+def terrain(tmp_path_factory):
+    return Heightfield.from_config(CONFIG, cache_dir=tmp_path_factory.mktemp("terrain"))
+
+
+def test_heights_interpolate_the_grid(terrain):
+    i, j = 10, 20
+    x = terrain.x_min + i * terrain.resolution
+    z = terrain.z_min + j * terrain.resolution
+
+    assert terrain.height_at(x, z) == pytest.approx(terrain.heights[i, j])
+    midpoint = terrain.height_at(x + 0.5 * terrain.resolution, z)
+    assert midpoint == pytest.approx(0.5 * (terrain.heights[i, j] + terrain.heights[i + 1, j]))
+    assert terrain.altitude_above_ground((x, 50.0, z)) == pytest.approx(50.0 - terrain.heights[i, j])
+    assert np.allclose(terrain.heights_at(np.array([[x, 0.0, z]] * 3)), terrain.heights[i, j])
+
+
+def test_cached_grid_is_reused(terrain, tmp_path):
+    again = Heightfield.from_config(CONFIG, cache_dir=tmp_path)
+
+    assert np.array_equal(again.heights, terrain.heights)
+    assert again.shape == (101, 81)
+
+
+def test_raycast_matches_a_brute_force_march(terrain):
+    rng = np.random.default_rng(0)
+    max_range = 80.0
+    origins = np.column_stack([rng.uniform(-60.0, 60.0, 150), rng.uniform(15.0, 40.0, 150),
+                               rng.uniform(-50.0, 50.0, 150)])
+    directions = rng.normal(size=(150, 3))
+    directions[:, 1] = -np.abs(directions[:, 1]) * rng.uniform(0.0, 1.5, 150)
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    origins[:, 1] += terrain.heights_at(origins)
+
+    ranges = terrain.raycast(origins, directions, max_range)
+
+    expected = np.array([_brute_force_range(terrain, o, d, max_range) for o, d in zip(origins, directions)])
+    assert (expected < max_range).sum() > 50 and (expected == max_range).any()
+    assert np.allclose(ranges, expected, atol=0.02)
+
+
+def test_rays_from_above_the_terrain_or_outside_it_miss(terrain):
+    up = np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]])
+    origin = np.array([0.0, terrain.max_height + 1.0, 0.0])
+
+    assert np.all(terrain.raycast(origin, up, 100.0) == 100.0)
+    # Straight down from far outside the footprint
+    assert terrain.raycast(np.array([1000.0, 50.0, 0.0]), np.array([[0.0, -1.0, 0.0]]), 100.0)[0] == 100.0
+
+
+def test_straight_down_ray_measures_altitude(terrain):
+    origin = np.array([12.3, 60.0, -7.9])
+
+    ranges = terrain.raycast(origin, np.array([[0.0, -1.0, 0.0]]), 100.0)
+
+    assert ranges[0] == pytest.approx(terrain.altitude_above_ground(origin), abs=1e-6)
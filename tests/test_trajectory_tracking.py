@@ -0,0 +1,16 @@
+"""
+Closed-loop tracking of a circling target: reference trajectories and MPC
+"""
+
+from ai_core.s1_perception_control.mpc_controller import benchmark_mpc_against_pid
+
+
+def test_reference_trajectory_and_mpc_improve_tracking():
+    results = benchmark_mpc_against_pid()
+    direct, intercept, mpc = results["intercept_direct"], results["intercept"], results["mpc"]
+
+    # Tracking a reference beats steering the PID straight at the intercept point
+    assert intercept["steady_state_distance"] < 0.75 * direct["steady_state_distance"]
+    assert intercept["final_distance"] < direct["final_distance"]
+    # and the MPC beats both
+    assert mpc["steady_state_distance"] < intercept["steady_state_distance"]